@@ -1,8 +1,3 @@
-import os
-import sys
-
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from .nodes.json_corrector_node import NODE_CLASS_MAPPINGS as CORRECTOR_NODE_MAPPINGS
 from .nodes.json_corrector_node import NODE_DISPLAY_NAME_MAPPINGS as CORRECTOR_DISPLAY_MAPPINGS
 
@@ -0,0 +1,81 @@
+"""插件加载耗时基准
+
+在全新的解释器中加载插件 (相当于ComfyUI启动时导入custom_nodes)，用 -X importtime
+统计总耗时与最慢的模块，并检查较慢的可选依赖是否被提前导入。
+
+用法: python benchmarks/bench_import_time.py [--repeat 5] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import PACKAGE_NAME  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 只应在对应修复方法/功能第一次使用时导入的模块
+LAZY_MODULES = ("jsoncomment", "demjson3", "chardet", "multiprocessing", "concurrent.futures")
+
+_LOAD_CODE = f"""
+import sys
+sys.path.insert(0, {BENCH_DIR!r})
+import common
+common.load_package()
+print(",".join(m for m in {LAZY_MODULES!r} if m in sys.modules))
+"""
+
+
+def measure_once():
+    """在子进程中加载一次插件
+
+    Returns:
+        插件加载耗时 (微秒), {模块: 累计耗时微秒}, 被提前导入的模块列表
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", _LOAD_CODE],
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # 表头
+        modules[parts[2].strip()] = cumulative
+    total = sum(us for name, us in modules.items()
+                if name.startswith(PACKAGE_NAME + ".nodes.") or name == PACKAGE_NAME)
+    eager = [m for m in result.stdout.strip().split(",") if m]
+    return total, modules, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals = []
+    modules = {}
+    eager = []
+    for _ in range(args.repeat):
+        total, modules, eager = measure_once()
+        totals.append(total)
+
+    print(f"插件加载耗时 (中位数, {args.repeat} 次): {statistics.median(totals) / 1000:.1f}ms "
+          f"(最小 {min(totals) / 1000:.1f}ms)")
+    print("最慢的模块 (累计耗时, 最后一次):")
+    for name, us in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+    if eager:
+        print(f"警告: 以下模块在加载时被提前导入: {', '.join(eager)}")
+    else:
+        print("可选依赖均未在加载时导入")
+
+
+if __name__ == "__main__":
+    main()
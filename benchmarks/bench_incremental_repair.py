@@ -0,0 +1,55 @@
+"""流式LLM输出的增量修复基准
+
+模拟逐块到达的LLM输出，对比每个块之后重新修复整个前缀与增量修复会话的总耗时。
+
+用法: python benchmarks/bench_incremental_repair.py [--sizes 10240,102400] [--chunk 64]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import load_package, format_size  # noqa: E402
+from bench_repair_engine import build_document, MOSTLY_VALID_RECORD  # noqa: E402
+
+load_package()
+
+from pip_json_pro.utils.json_lexer import IncrementalRepairSession, lexer_repair_text  # noqa: E402
+
+
+def run_full(text: str, chunk: int) -> float:
+    start = time.perf_counter()
+    for end in range(chunk, len(text) + chunk, chunk):
+        lexer_repair_text(text[:end])
+    return time.perf_counter() - start
+
+
+def run_incremental(text: str, chunk: int) -> float:
+    start = time.perf_counter()
+    session = IncrementalRepairSession()
+    for pos in range(0, len(text), chunk):
+        session.feed(text[pos:pos + chunk])
+    session.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10240,102400")
+    parser.add_argument("--chunk", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'chunks':>7} {'full(ms)':>10} {'incremental(ms)':>16} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        text = build_document(size, MOSTLY_VALID_RECORD)
+        full_time = run_full(text, args.chunk)
+        incremental_time = run_incremental(text, args.chunk)
+        chunks = (len(text) + args.chunk - 1) // args.chunk
+        print(f"{format_size(len(text)):>8} {chunks:>7} {full_time * 1000:>10.1f} "
+              f"{incremental_time * 1000:>16.1f} {full_time / incremental_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""高速JSON后端与标准库 json 的对比基准
+
+分别测量解析、indent=2 序列化以及 JSONProcessor.process 处理合法JSON (直接解析 + 美化输出) 的耗时。
+对照组在同一代码路径上临时停用高速库，相当于只安装了标准库的环境。
+
+用法: python benchmarks/bench_json_backend.py [--sizes 1024,1048576,10485760] [--repeat 5]
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import load_package, time_call, format_size  # noqa: E402
+from bench_repair_engine import build_document, MOSTLY_VALID_RECORD  # noqa: E402
+
+load_package()
+
+from pip_json_pro.core.json_processor import JSONProcessor  # noqa: E402
+from pip_json_pro.utils import json_backend  # noqa: E402
+from pip_json_pro.utils.json_lexer import lexer_repair_text  # noqa: E402
+
+
+def build_valid_document(target_size: int) -> str:
+    """构造接近目标大小的合法JSON文档"""
+    return json.dumps(json.loads(lexer_repair_text(build_document(target_size, MOSTLY_VALID_RECORD))),
+                      ensure_ascii=False)
+
+
+@contextlib.contextmanager
+def stdlib_only():
+    """临时停用高速库"""
+    saved = json_backend._fast_loads, json_backend._orjson
+    json_backend._fast_loads = json_backend._orjson = None
+    try:
+        yield
+    finally:
+        json_backend._fast_loads, json_backend._orjson = saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1024,1048576,10485760")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"后端: {json_backend.BACKEND}")
+    print(f"{'size':>8} {'op':>8} {'json(ms)':>10} {'backend(ms)':>12} {'speedup':>8}")
+    processor = JSONProcessor(use_cache=False)
+    for size in (int(s) for s in args.sizes.split(",")):
+        text = build_valid_document(size)
+        data, native = json_backend.loads_native(text)
+        cases = [
+            ("loads", lambda: json_backend.loads(text)),
+            ("dumps", lambda: json_backend.dumps(data, 2, native=native)),
+            ("process", lambda: processor.process(text, repair_level=1)),
+        ]
+        for op, func in cases:
+            with stdlib_only():
+                base_time = min(time_call(func, args.repeat))
+            new_time = min(time_call(func, args.repeat))
+            print(f"{format_size(len(text)):>8} {op:>8} {base_time * 1000:>10.2f} {new_time * 1000:>12.2f} "
+                  f"{base_time / new_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""词法器修复引擎与正则级联修复的对比基准
+
+用法: python benchmarks/bench_repair_engine.py [--sizes 1024,1048576] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import load_package, time_call, format_size  # noqa: E402
+
+load_package()
+
+from pip_json_pro.utils.json_utils import normalize_json  # noqa: E402
+from pip_json_pro.utils.json_lexer import repair_json_lexer  # noqa: E402
+
+
+# 每条记录都带有多种格式问题
+DIRTY_RECORD = """  {
+    id: %d,  // 记录编号
+    'name': 'item_%d',
+    "tags": ['a', 'b', 'c',],
+    "score": %d.5,
+    "ratio": NaN,
+    /* 描述 */
+    "description": "LLM generated text with a url http://example.com/%d",
+  },
+"""
+
+# 典型LLM输出：大部分内容合法，只在少数位置出现尾逗号和注释
+MOSTLY_VALID_RECORD = """  {
+    "id": %d,
+    "name": "item_%d",
+    "tags": ["a", "b", "c"],
+    "score": %d.5,
+    "active": true,
+    "description": "LLM generated text number %d",
+  },
+"""
+
+CORPORA = {
+    "dirty": DIRTY_RECORD,
+    "mostly_valid": MOSTLY_VALID_RECORD,
+}
+
+
+def build_document(target_size: int, record_template: str = DIRTY_RECORD) -> str:
+    """构造接近目标大小的伪JSON文档"""
+    parts = ["{results: ["]
+    size = 0
+    index = 0
+    while size < target_size:
+        record = record_template % (index, index, index, index)
+        parts.append(record)
+        size += len(record)
+        index += 1
+    parts.append("],}")
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1024,102400,1048576,5242880")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'corpus':>12} {'size':>8} {'regex(ms)':>10} {'ok':>3} {'lexer(ms)':>10} {'ok':>3} {'speedup':>8}")
+    for name, template in CORPORA.items():
+        for size in (int(s) for s in args.sizes.split(",")):
+            text = build_document(size, template)
+            regex_ok = normalize_json(text, repair_level=3)[1]
+            lexer_ok = repair_json_lexer(text)[1]
+            regex_time = min(time_call(lambda: normalize_json(text, repair_level=3), args.repeat))
+            lexer_time = min(time_call(lambda: repair_json_lexer(text), args.repeat))
+            print(f"{name:>12} {format_size(len(text)):>8} {regex_time * 1000:>10.1f} {'Y' if regex_ok else 'N':>3} "
+                  f"{lexer_time * 1000:>10.1f} {'Y' if lexer_ok else 'N':>3} {regex_time / lexer_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""综合基准：修复、提取与路径构建的延迟、吞吐量与内存峰值
+
+对 corpus.py 生成的语料测量：
+  * JSONProcessor.process (每种语料类型，以及每个修复方法的单次尝试)
+  * extract_from_json 精确路径与模糊搜索
+  * PIP_JSON_Path_Builder 的每种展示模式
+报告 p50/p99 延迟、吞吐量 (按p50计算) 与 tracemalloc 内存峰值。结果可以保存为基线JSON，
+之后用 --baseline 对比，p50或内存峰值超出容差的用例标记为回归并以非零状态退出。
+
+用法:
+  python benchmarks/bench_suite.py --sizes 1KB,100KB --save baseline.json
+  python benchmarks/bench_suite.py --sizes 1KB,100KB --baseline baseline.json [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import load_package, format_size  # noqa: E402
+import corpus  # noqa: E402
+
+load_package()
+
+from pip_json_pro.core.json_processor import JSONProcessor  # noqa: E402
+from pip_json_pro.nodes.json_extractor_node import PIP_JSON_Path_Builder  # noqa: E402
+from pip_json_pro.utils import json_backend  # noqa: E402
+from pip_json_pro.utils.json_extractor import DOCUMENT_CACHE, extract_from_json  # noqa: E402
+
+PATH_BUILDER_MODES = ("层级树", "路径列表", "推荐路径")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法百分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def clear_caches():
+    """清空进程内的文档、键索引与结构索引缓存，测量冷启动开销 (索引随文档一并删除)"""
+    DOCUMENT_CACHE.clear()
+
+
+class Suite:
+    """收集各用例的延迟样本与内存峰值"""
+
+    def __init__(self, iterations: int, measure_memory: bool, warm: bool):
+        self.iterations = iterations
+        self.measure_memory = measure_memory
+        self.warm = warm
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.sizes: Dict[str, int] = {}
+        self.peaks: Dict[str, int] = {}
+
+    def iterations_for(self, size: int) -> int:
+        # 大文档减少次数，单个用例的总数据量约20MB
+        return max(3, min(self.iterations, (20 * 1024 * 1024) // max(size, 1)))
+
+    def run(self, key: str, size: int, func: Callable[[], Any],
+            on_result: Optional[Callable[[Any], None]] = None):
+        """多次执行 func 记录延迟，on_result 可以从返回值中收集子阶段的耗时"""
+        self.sizes[key] = size
+        for _ in range(self.iterations_for(size)):
+            if not self.warm:
+                clear_caches()
+            start = time.perf_counter()
+            result = func()
+            self.samples[key].append(time.perf_counter() - start)
+            if on_result is not None:
+                on_result(result)
+
+        if self.measure_memory:
+            if not self.warm:
+                clear_caches()
+            tracemalloc.start()
+            try:
+                func()
+                self.peaks[key] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    def add_sample(self, key: str, size: int, seconds: float):
+        self.sizes[key] = size
+        self.samples[key].append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for key, samples in self.samples.items():
+            p50 = percentile(samples, 50)
+            entry = {
+                "size": self.sizes[key],
+                "iterations": len(samples),
+                "p50_ms": round(p50 * 1000, 4),
+                "p99_ms": round(percentile(samples, 99) * 1000, 4),
+                "mb_per_s": round(self.sizes[key] / (1024 * 1024) / p50, 3) if p50 > 0 else None,
+            }
+            if key in self.peaks:
+                entry["peak_kb"] = round(self.peaks[key] / 1024, 1)
+            results[key] = entry
+        return results
+
+
+def bench_process(suite: Suite, size_name: str, size: int, flavors: List[str], repair_level: int):
+    """修复：每种语料的整体耗时与各修复方法的单次尝试耗时"""
+    processor = JSONProcessor(use_cache=False, tier_order="fixed")
+    for flavor in flavors:
+        text = corpus.generate(size, corpus.FLAVORS[flavor])
+        key = f"process/{flavor}@{size_name}"
+
+        def collect_tiers(result, flavor=flavor, length=len(text)):
+            for tier in result[2].get("tiers", []):
+                if "ms" in tier:
+                    suite.add_sample(f"process/{flavor}/tier/{tier['tier']}@{size_name}", length,
+                                     tier["ms"] / 1000)
+
+        suite.run(key, len(text), lambda: processor.process(text, repair_level=repair_level),
+                  collect_tiers)
+
+
+def bench_extract(suite: Suite, size_name: str, size: int):
+    """提取：精确路径与模糊搜索 (每次都重新解析文档)"""
+    text = corpus.generate_valid(size)
+    suite.run(f"extract/exact@{size_name}", len(text),
+              lambda: extract_from_json(text, ["results[-1]", "analysis", "score"]))
+    suite.run(f"extract/fuzzy@{size_name}", len(text),
+              lambda: extract_from_json(text, ["sentimnt"], fuzzy_mode=True))
+
+
+def bench_path_builder(suite: Suite, size_name: str, size: int):
+    """路径构建：每种展示模式"""
+    text = corpus.generate_valid(size)
+    node = PIP_JSON_Path_Builder()
+    for mode in PATH_BUILDER_MODES:
+        suite.run(f"path_builder/{mode}@{size_name}", len(text),
+                  lambda mode=mode: node.build_path_info(text, mode))
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> Dict[str, List[str]]:
+    """与基线对比，返回 {用例: [回归说明, ...]}"""
+    regressions = {}
+    for key, entry in results.items():
+        old = baseline.get(key)
+        if not old:
+            continue
+        notes = []
+        if old.get("p50_ms") and entry["p50_ms"] > old["p50_ms"] * (1 + tolerance):
+            notes.append(f"p50 {old['p50_ms']:.2f} → {entry['p50_ms']:.2f}ms")
+        if old.get("peak_kb") and entry.get("peak_kb") and entry["peak_kb"] > old["peak_kb"] * (1 + tolerance):
+            notes.append(f"内存峰值 {old['peak_kb']:.0f} → {entry['peak_kb']:.0f}KB")
+        if notes:
+            regressions[key] = notes
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                regressions: Dict[str, List[str]]):
+    print(f"{'case':<52} {'size':>8} {'n':>4} {'p50(ms)':>10} {'p99(ms)':>10} {'MB/s':>8} {'peak(KB)':>10} "
+          f"{'vs基线':>8}")
+    for key, entry in results.items():
+        old = baseline.get(key, {})
+        delta = ""
+        if old.get("p50_ms"):
+            delta = f"{(entry['p50_ms'] / old['p50_ms'] - 1) * 100:+.0f}%"
+        if key in regressions:
+            delta += " ✗"
+        peak = f"{entry['peak_kb']:.0f}" if "peak_kb" in entry else "-"
+        throughput = f"{entry['mb_per_s']:.2f}" if entry["mb_per_s"] is not None else "-"
+        print(f"{key:<52} {format_size(entry['size']):>8} {entry['iterations']:>4} {entry['p50_ms']:>10.3f} "
+              f"{entry['p99_ms']:>10.3f} {throughput:>8} {peak:>10} {delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1KB,100KB", help="语料大小，如 1KB,100KB,1MB,10MB,100MB")
+    parser.add_argument("--flavors", default=",".join(corpus.FLAVORS), help="修复用例的语料类型")
+    parser.add_argument("--groups", default="process,extract,path_builder")
+    parser.add_argument("--repair-level", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=30, help="每个用例的最多执行次数")
+    parser.add_argument("--warm", action="store_true", help="保留文档缓存 (默认每次清空，测量冷启动)")
+    parser.add_argument("--no-memory", action="store_true", help="不测量内存峰值")
+    parser.add_argument("--save", help="把结果保存为基线JSON")
+    parser.add_argument("--baseline", help="与已保存的基线JSON对比")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的相对退化 (默认20%%)")
+    args = parser.parse_args()
+
+    suite = Suite(args.iterations, not args.no_memory, args.warm)
+    groups = set(args.groups.split(","))
+    flavors = args.flavors.split(",")
+    for size_name in args.sizes.split(","):
+        size = corpus.parse_size(size_name)
+        if "process" in groups:
+            bench_process(suite, size_name, size, flavors, args.repair_level)
+        if "extract" in groups:
+            bench_extract(suite, size_name, size)
+        if "path_builder" in groups:
+            bench_path_builder(suite, size_name, size)
+
+    results = suite.summary()
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+
+    print(f"JSON后端: {json_backend.BACKEND}, Python {platform.python_version()}")
+    print_table(results, baseline, regressions)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {"python": platform.python_version(), "backend": json_backend.BACKEND,
+                         "created": time.strftime("%Y-%m-%d %H:%M:%S")},
+                "results": results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存: {args.save}")
+
+    if regressions:
+        print(f"\n{len(regressions)} 个用例超出容差 ({args.tolerance:.0%}):")
+        for key, notes in regressions.items():
+            print(f"  ✗ {key}: {'; '.join(notes)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""紧凑磁带与 json.loads 的内存/耗时对比基准
+
+对同一文档分别用 json.loads 构建完整对象树、用磁带 (utils/json_tape) 构建条目数组，
+再按几条确定路径取值，用 tracemalloc 统计各自的峰值内存 (不含原文本本身)。
+
+用法: python benchmarks/bench_tape.py [--sizes 1MB,10485760] [--paths "results[0].title,results[-1].analysis.score"]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import load_package, format_size  # noqa: E402
+from corpus import generate_valid, parse_size  # noqa: E402
+
+load_package()
+
+from pip_json_pro.utils.json_path import compile_path, get_by_steps  # noqa: E402
+from pip_json_pro.utils.json_tape import build_tape, to_python  # noqa: E402
+
+DEFAULT_PATHS = "model,results[0].title,results[-1].analysis.score,results[-1].analysis.keywords"
+
+
+def measure(func):
+    """调用func并返回 (结果, 耗时秒, 峰值内存字节)
+
+    tracemalloc 会明显拖慢分配，耗时与峰值内存分两次调用测量。
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def lookup(root, paths):
+    return [to_python(get_by_steps(root, compile_path(path))) for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1MB,10485760")
+    parser.add_argument("--paths", default=DEFAULT_PATHS)
+    args = parser.parse_args()
+
+    paths = args.paths.split(",")
+    print(f"{'size':>8} {'mode':>6} {'time(ms)':>10} {'peak':>10} {'ratio':>7}")
+    for size in (parse_size(s) for s in args.sizes.split(",")):
+        text = generate_valid(size)
+        expected, loads_time, loads_peak = measure(lambda: lookup(json.loads(text), paths))
+        values, tape_time, tape_peak = measure(lambda: lookup(build_tape(text).root(), paths))
+        assert values == expected, "磁带取值与 json.loads 不一致"
+        print(f"{format_size(len(text)):>8} {'loads':>6} {loads_time * 1000:10.1f} {format_size(loads_peak):>10}")
+        print(f"{'':>8} {'tape':>6} {tape_time * 1000:10.1f} {format_size(tape_peak):>10} "
+              f"{tape_peak / loads_peak:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
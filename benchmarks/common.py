@@ -0,0 +1,47 @@
+"""基准测试公共工具
+
+插件目录名 (如 PIP-JSON-PRO) 不是合法的Python包名，这里以固定名称加载整个包，
+使基准脚本可以直接用 `python benchmarks/xxx.py` 运行。
+"""
+import importlib.util
+import os
+import sys
+import time
+from typing import Callable, List
+
+PACKAGE_NAME = "pip_json_pro"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_package():
+    """以 PACKAGE_NAME 加载仓库根目录对应的包"""
+    if PACKAGE_NAME in sys.modules:
+        return sys.modules[PACKAGE_NAME]
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME,
+        os.path.join(REPO_ROOT, "__init__.py"),
+        submodule_search_locations=[REPO_ROOT],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> List[float]:
+    """多次调用并返回每次耗时 (秒)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def format_size(size: int) -> str:
+    """格式化字节数"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}MB"
@@ -0,0 +1,165 @@
+"""LLM输出风格的伪JSON语料生成器
+
+生成带有常见格式问题的模型输出：Markdown代码块、注释、单引号、尾逗号、Python字面量 (True/None)
+与截断，大小从1KB到100MB。相同参数与随机种子总是生成相同的文本，可用于对比不同版本。
+
+用法: python benchmarks/corpus.py --out corpus_dir [--sizes 1KB,1MB] [--flavors mixed,valid]
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, Iterable, List
+
+# 格式问题
+FENCE = "fence"
+COMMENTS = "comments"
+SINGLE_QUOTES = "single_quotes"
+TRAILING_COMMAS = "trailing_commas"
+PYTHON_LITERALS = "python_literals"
+TRUNCATION = "truncation"
+
+FEATURES = (FENCE, COMMENTS, SINGLE_QUOTES, TRAILING_COMMAS, PYTHON_LITERALS, TRUNCATION)
+
+# 语料类型：合法JSON、所有问题混合、以及只含单一问题的语料
+FLAVORS: Dict[str, tuple] = {"valid": (), "mixed": FEATURES}
+FLAVORS.update({feature: (feature,) for feature in FEATURES})
+
+SIZES = {
+    "1KB": 1024,
+    "100KB": 100 * 1024,
+    "1MB": 1024 * 1024,
+    "10MB": 10 * 1024 * 1024,
+    "100MB": 100 * 1024 * 1024,
+}
+
+_WORDS = ("model", "prompt", "image", "style", "light", "camera", "scene", "color", "portrait",
+          "landscape", "detail", "cinematic", "soft", "vivid", "night", "forest", "city", "ocean")
+_SENTIMENTS = ("positive", "neutral", "negative")
+
+_PREAMBLE = "好的，下面是按照要求生成的JSON结果：\n\n"
+_EPILOGUE = "\n\n以上结果包含全部条目，如需调整请告诉我。"
+
+
+def parse_size(text: str) -> int:
+    """解析 1KB / 10MB / 4096 之类的大小"""
+    text = text.strip()
+    if text.upper() in SIZES:
+        return SIZES[text.upper()]
+    return int(text)
+
+
+class _Writer:
+    """按语料类型写出JSON片段"""
+
+    def __init__(self, features: Iterable[str]):
+        features = set(features)
+        self.single_quotes = SINGLE_QUOTES in features
+        self.python_literals = PYTHON_LITERALS in features
+        self.comments = COMMENTS in features
+        self.trailing_commas = TRAILING_COMMAS in features
+
+    def string(self, value: str) -> str:
+        if self.single_quotes:
+            return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+        return json.dumps(value, ensure_ascii=False)
+
+    def literal(self, value) -> str:
+        if self.python_literals:
+            return repr(value)
+        return json.dumps(value)
+
+    def members(self, items: List[str], indent: str) -> str:
+        body = (",\n" + indent).join(items)
+        if self.trailing_commas:
+            body += ","
+        return body
+
+
+def _record(writer: _Writer, rng: random.Random, index: int) -> str:
+    """生成一条记录"""
+    words = rng.sample(_WORDS, 4)
+    keywords = ", ".join(writer.string(w) for w in words[:3])
+    if writer.trailing_commas:
+        keywords += ","
+    members = [
+        f'{writer.string("id")}: {index}',
+        f'{writer.string("title")}: {writer.string(" ".join(words) + f" #{index}")}',
+        f'{writer.string("prompt")}: {writer.string("A " + words[0] + " of a " + words[1] + ", it is " + words[2])}',
+        (f'{writer.string("analysis")}: {{{writer.string("sentiment")}: '
+         f'{writer.string(rng.choice(_SENTIMENTS))}, {writer.string("score")}: {rng.random():.3f}, '
+         f'{writer.string("keywords")}: [{keywords}]}}'),
+        f'{writer.string("approved")}: {writer.literal(rng.random() > 0.3)}',
+        f'{writer.string("notes")}: {writer.literal(None)}',
+    ]
+    if writer.comments:
+        members[1] = f"// 第 {index} 条\n      " + members[1]
+    body = writer.members(members, "      ")
+    return "    {\n      " + body + "\n    }"
+
+
+def generate(size: int, features: Iterable[str] = FEATURES, seed: int = 0) -> str:
+    """生成接近目标大小的模型输出
+
+    Args:
+        size: 目标大小 (字符)
+        features: 包含的格式问题，空集合生成合法JSON
+        seed: 随机种子
+    """
+    features = tuple(features)
+    writer = _Writer(features)
+    rng = random.Random(seed)
+
+    header = "{\n  " + writer.string("model") + ": " + writer.string("llm-benchmark") + ",\n"
+    if COMMENTS in features:
+        header += "  /* 自动生成的结果 */\n"
+    header += "  " + writer.string("results") + ": [\n"
+    footer = "\n  ]" + ("," if TRAILING_COMMAS in features else "") + "\n}"
+
+    fence = FENCE in features
+    overhead = len(header) + len(footer) + (len(_PREAMBLE) + len(_EPILOGUE) + 12 if fence else 0)
+    records: List[str] = []
+    total = overhead
+    index = 0
+    while total < size or not records:
+        record = _record(writer, rng, index)
+        records.append(record)
+        total += len(record) + 2
+        index += 1
+
+    separator = ",\n"
+    body = header + separator.join(records) + footer
+    if TRUNCATION in features:
+        # LLM输出在最后一条记录中间被截断
+        body = body[:len(body) - len(records[-1]) // 2 - len(footer)]
+    if fence:
+        body = _PREAMBLE + "```json\n" + body + ("\n" if TRUNCATION in features else "\n```" + _EPILOGUE)
+    return body
+
+
+def generate_valid(size: int, seed: int = 0) -> str:
+    """生成接近目标大小的合法JSON (用于提取与路径构建)"""
+    return generate(size, (), seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", required=True, help="输出目录")
+    parser.add_argument("--sizes", default="1KB,100KB,1MB")
+    parser.add_argument("--flavors", default=",".join(FLAVORS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for size_name in args.sizes.split(","):
+        size = parse_size(size_name)
+        for flavor in args.flavors.split(","):
+            text = generate(size, FLAVORS[flavor], args.seed)
+            path = os.path.join(args.out, f"{flavor}_{size_name}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            print(f"{path}: {len(text)} 字符")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import atexit
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .json_processor import JSONProcessor
+from .json_extractor_processor import JSONExtractorProcessor
+from ..utils.process_utils import mp_context, package_bootstrap
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+# 子进程启动时以相同包名加载插件并预加载处理器
+_BOOTSTRAP = package_bootstrap(f"importlib.import_module({__name__!r})._init_worker()")
+
+# 默认进程数：保留一个核心给ComfyUI主进程
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+DEFAULT_CHUNK_SIZE = 32
+
+# 子进程内预加载的处理器
+_worker_processors: Dict[str, Any] = {}
+
+_pool: Optional["ProcessPoolExecutor"] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """子进程初始化：创建处理器，之后的每个任务块直接复用"""
+    _worker_processors["correct"] = JSONProcessor()
+    _worker_processors["extract"] = JSONExtractorProcessor()
+
+
+def get_pool(workers: int) -> "ProcessPoolExecutor":
+    """获取常驻进程池，进程数变化时重建"""
+    # 进程池模块只在第一次批量执行时导入，不拖慢插件加载
+    from concurrent.futures import ProcessPoolExecutor
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=mp_context(),
+                                        initializer=exec,
+                                        initargs=(_BOOTSTRAP,))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    """关闭常驻进程池"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(shutdown_pool)
+
+
+def _correct_one(processor: JSONProcessor, text: str, params: Dict[str, Any]) -> Tuple[str, bool, Dict]:
+    return processor.process(input_text=text, **params)
+
+
+def _extract_one(processor: JSONExtractorProcessor, json_str: str, params: Dict[str, Any]) -> Tuple[str, bool, Dict]:
+    try:
+        result, success, debug = processor.extract(json_str=json_str, **params)
+    except Exception as e:
+        return f"错误: {str(e)}", False, {"error": str(e)}
+    return result, success, debug
+
+
+_TASKS = {
+    "correct": _correct_one,
+    "extract": _extract_one,
+}
+
+
+def _run_chunk(task: str, chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, bool, Dict]]:
+    """在子进程 (或回退时在当前进程) 中处理一个任务块，单个条目出错不影响其他条目"""
+    if task not in _worker_processors:
+        _init_worker()
+    processor = _worker_processors[task]
+    func = _TASKS[task]
+    results = []
+    for item, params in chunk:
+        try:
+            results.append(func(processor, item, params))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            results.append((f"错误: {error}", False, {"error": error}))
+    return results
+
+
+def broadcast(values: List[Any], count: int) -> List[Any]:
+    """INPUT_IS_LIST 节点的参数对齐：单个值广播到所有条目，列表按位置对应 (不足时重复最后一个)"""
+    if not values:
+        return [None] * count
+    if len(values) >= count:
+        return list(values[:count])
+    return list(values) + [values[-1]] * (count - len(values))
+
+
+def format_batch_info(info: Dict[str, Any], results: List[Tuple[str, bool, Dict]]) -> str:
+    """格式化批量执行信息"""
+    succeeded = sum(1 for _, success, _ in results if success)
+    mode = "进程池" if info["mode"] == "pool" else "当前进程"
+    lines = [
+        f"条目: {info['items']} (成功 {succeeded})",
+        f"执行: {mode}, {info['workers']} 个进程, {info['chunks']} 个任务块",
+    ]
+    if "pool_error" in info:
+        lines.append(f"进程池异常，{info['pool_chunks']} 个任务块已完成，其余回退到当前进程: {info['pool_error']}")
+    for index, (_, success, debug) in enumerate(results):
+        if not success and "error" in debug:
+            lines.append(f"  ✗ 第 {index + 1} 条: {debug['error']}")
+    return "\n".join(lines)
+
+
+def run_batch(task: str,
+              items: List[Tuple[str, Dict[str, Any]]],
+              workers: int = DEFAULT_WORKERS,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[List[Tuple[str, bool, Dict]], Dict[str, Any]]:
+    """按块把任务分发到常驻进程池，结果顺序与输入一致
+
+    Args:
+        task: 任务类型 ("correct" / "extract")
+        items: [(输入文本, 参数字典), ...]
+        workers: 进程数，1表示在当前进程内执行
+        chunk_size: 每个任务块包含的条目数
+
+    Returns:
+        [(结果, 是否成功, 调试信息), ...], 执行信息
+    """
+    chunk_size = max(1, chunk_size)
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    info = {"items": len(items), "chunks": len(chunks), "workers": 1, "mode": "inline"}
+    results = []
+    done = 0
+
+    # 数据量不足一个块时，进程间传输的开销大于收益
+    if workers > 1 and len(chunks) > 1:
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            pool = get_pool(workers)
+            for chunk_results in pool.map(_run_chunk, [task] * len(chunks), chunks):
+                results.extend(chunk_results)
+                done += 1
+            info.update(workers=min(workers, len(chunks)), mode="pool")
+            return results, info
+        except Exception as e:
+            # 子进程异常退出、任务或结果无法序列化、进程无法启动等：
+            # 已完成的任务块保留，其余回退到当前进程逐条执行
+            if isinstance(e, BrokenProcessPool):
+                shutdown_pool()
+            info["pool_error"] = f"{type(e).__name__}: {e}"[:200]
+            info["pool_chunks"] = done
+
+    for chunk in chunks[done:]:
+        results.extend(_run_chunk(task, chunk))
+    return results, info
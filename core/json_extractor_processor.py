@@ -1,100 +1,235 @@
-import sys
-import os
-import json
-from typing import Any, Dict, List, Tuple, Union, Optional
-
-# 确保能正确导入utils模块
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from ..utils.json_extractor import extract_from_json
-
-
-class JSONExtractorProcessor:
-    """JSON提取处理器核心类"""
-    
-    def __init__(self):
-        self.debug_info = {}
-    
-    def extract(self, 
-               json_str: str, 
-               path_keys: List[str], 
-               fuzzy_mode: bool = False,
-               min_similarity: float = 0.6) -> Tuple[str, bool, Dict]:
-        """
-        从JSON字符串中提取值
-        
-        Args:
-            json_str: JSON字符串
-            path_keys: 路径键列表 [一级键, 二级键, 三级键, ...]
-            fuzzy_mode: 是否启用模糊搜索
-            min_similarity: 最小相似度阈值
-            
-        Returns:
-            提取的值, 是否成功, 调试信息
-        """
-        if not json_str or not json_str.strip():
-            return "", False, {"error": "JSON字符串为空"}
-            
-        # 过滤空路径    
-        clean_path = [p for p in path_keys if p and p.strip()]
-        
-        if not clean_path:
-            return json_str, True, {"message": "未提供路径，返回完整JSON"}
-        
-        # 调用通用提取函数
-        result, success, debug = extract_from_json(
-            json_str=json_str,
-            path=clean_path,
-            fuzzy_mode=fuzzy_mode,
-            min_similarity=min_similarity
-        )
-        
-        self.debug_info = debug
-        
-        if success:
-            # 确保结果是字符串
-            if isinstance(result, (dict, list)):
-                result = json.dumps(result, ensure_ascii=False)
-        else:
-            if "error" in debug:
-                result = f"提取失败: {debug['error']}"
-            else:
-                result = "未找到匹配项"
-        
-        return result, success, debug
-    
-    def format_debug_info(self) -> str:
-        """格式化调试信息为可读文本"""
-        if not self.debug_info:
-            return "无调试信息"
-            
-        lines = []
-        
-        # 路径信息
-        if "path" in self.debug_info:
-            path_str = "->" .join([p for p in self.debug_info["path"] if p])
-            lines.append(f"查询路径: {path_str}")
-        
-        # 模式信息
-        if "fuzzy_mode" in self.debug_info:
-            mode = "模糊搜索" if self.debug_info["fuzzy_mode"] else "精确路径"
-            lines.append(f"搜索模式: {mode}")
-        
-        # 匹配结果
-        if "matches" in self.debug_info and self.debug_info["matches"]:
-            lines.append("匹配结果:")
-            for i, match in enumerate(self.debug_info["matches"]):
-                if "exact" in match:
-                    lines.append(f"  ✓ 精确匹配: {match['path']}")
-                elif "path" in match and "similarity" in match:
-                    lines.append(f"  {i+1}. 路径: {match['path']} (相似度: {match['similarity']})")
-                elif "partial_key" in match:
-                    lines.append(f"  - 部分匹配: '{match['partial_key']}' → '{match['matched_to']}'")
-                elif "final_path" in match:
-                    lines.append(f"  最终路径: {match['final_path']}")
-        
-        # 错误信息
-        if "error" in self.debug_info:
-            lines.append(f"错误: {self.debug_info['error']}")
-        
-        return "\n".join(lines)
+from typing import Any, Dict, List, Tuple, Union, Optional
+
+from ..utils.json_extractor import (
+    extract_from_json,
+    extract_from_file,
+    extract_by_expression,
+    extract_by_expression_from_file,
+    extract_many_by_expression,
+    DOCUMENT_CACHE
+)
+from ..utils.json_file import read_json_file
+from ..utils.json_path import compile_path, KEY, DESCEND
+from ..utils.json_backend import BACKEND, dumps
+from ..utils.metrics import format_timings
+
+# 调试信息中各处理阶段的名称
+STAGE_NAMES = {"stream": "流式定位", "read": "读取文件", "parse": "解析", "traverse": "遍历", "key_index": "键索引",
+               "fuzzy_score": "相似度计算", "total": "总计"}
+
+
+class JSONExtractorProcessor:
+    """JSON提取处理器核心类"""
+    
+    def __init__(self):
+        self.debug_info = {}
+    
+    def extract(self, 
+               json_str: str, 
+               path_keys: List[str], 
+               fuzzy_mode: bool = False,
+               min_similarity: float = 0.6,
+               path_expression: str = "",
+               json_file: str = "") -> Tuple[str, bool, Dict]:
+        """
+        从JSON字符串中提取值
+        
+        Args:
+            json_str: JSON字符串
+            path_keys: 路径键列表 [一级键, 二级键, 三级键, ...]
+            fuzzy_mode: 是否启用模糊搜索
+            min_similarity: 最小相似度阈值
+            path_expression: 路径表达式 (非空时优先于path_keys)，如 "a.b[0]", "items[*].name"
+            json_file: JSON文件路径 (非空时代替json_str，文件以内存映射方式读取)
+            
+        Returns:
+            提取的值, 是否成功, 调试信息
+        """
+        file_path = json_file.strip() if json_file else ""
+        if not file_path and (not json_str or not json_str.strip()):
+            return "", False, {"error": "JSON字符串为空"}
+        
+        if path_expression and path_expression.strip():
+            return self._extract_expression(json_str, path_expression.strip(), fuzzy_mode, min_similarity, file_path)
+            
+        # 过滤空路径    
+        clean_path = [p for p in path_keys if p and p.strip()]
+        
+        if not clean_path:
+            if file_path:
+                try:
+                    return read_json_file(file_path), True, {"message": "未提供路径，返回完整JSON", "file": file_path}
+                except (OSError, ValueError) as e:
+                    self.debug_info = {"error": str(e), "file": file_path}
+                    return f"提取失败: {str(e)}", False, self.debug_info
+            return json_str, True, {"message": "未提供路径，返回完整JSON"}
+        
+        # 调用通用提取函数
+        if file_path:
+            result, success, debug = extract_from_file(
+                file_path=file_path,
+                path=clean_path,
+                fuzzy_mode=fuzzy_mode,
+                min_similarity=min_similarity
+            )
+        else:
+            result, success, debug = extract_from_json(
+                json_str=json_str,
+                path=clean_path,
+                fuzzy_mode=fuzzy_mode,
+                min_similarity=min_similarity
+            )
+        
+        self.debug_info = debug
+        
+        if success:
+            # 确保结果是字符串
+            if isinstance(result, (dict, list)):
+                result = dumps(result)
+        else:
+            if "error" in debug:
+                result = f"提取失败: {debug['error']}"
+            else:
+                result = "未找到匹配项"
+        
+        return result, success, debug
+    
+    def _extract_expression(self,
+                            json_str: str,
+                            expression: str,
+                            fuzzy_mode: bool,
+                            min_similarity: float,
+                            file_path: str = "") -> Tuple[str, bool, Dict]:
+        """按路径表达式提取 (file_path非空时从文件提取)"""
+        if fuzzy_mode:
+            # 模糊搜索使用表达式中最后一个键名作为搜索目标
+            try:
+                names = [arg for kind, arg in compile_path(expression) if kind in (KEY, DESCEND) and arg]
+            except ValueError as e:
+                self.debug_info = {"error": str(e)}
+                return f"提取失败: {str(e)}", False, self.debug_info
+            return self.extract(json_str, names[-1:], fuzzy_mode=True, min_similarity=min_similarity,
+                                json_file=file_path)
+        
+        if file_path:
+            value, success, debug = extract_by_expression_from_file(file_path, expression)
+        else:
+            value, success, debug = extract_by_expression(json_str, expression)
+        self.debug_info = debug
+        
+        if success:
+            result = self._format_value(value)
+        elif "error" in debug:
+            result = f"提取失败: {debug['error']}"
+        else:
+            result = "未找到匹配项"
+        
+        return result, success, debug
+    
+    def extract_many(self,
+                     json_str: str,
+                     paths: List[str],
+                     as_object: bool = False) -> Tuple[str, bool, Dict]:
+        """一次遍历从JSON中提取多条路径
+        
+        Args:
+            json_str: JSON字符串
+            paths: 路径表达式列表
+            as_object: True时输出以路径为键的JSON对象，否则输出按路径顺序排列的JSON数组
+            
+        Returns:
+            提取结果JSON字符串 (未匹配的路径为null), 是否全部成功, 调试信息
+        """
+        clean_paths = [p.strip() for p in paths if p and p.strip()]
+        
+        if not json_str or not json_str.strip():
+            self.debug_info = {"error": "JSON字符串为空"}
+            return "", False, self.debug_info
+        if not clean_paths:
+            self.debug_info = {"error": "未提供有效路径"}
+            return "", False, self.debug_info
+        
+        values, debug = extract_many_by_expression(json_str, clean_paths)
+        self.debug_info = debug
+        
+        if "error" in debug:
+            return f"提取失败: {debug['error']}", False, debug
+        
+        if as_object:
+            output = {path: value for path, (value, _) in zip(clean_paths, values)}
+        else:
+            output = [value for value, _ in values]
+        
+        all_success = all(success for _, success in values)
+        return dumps(output), all_success, debug
+    
+    @staticmethod
+    def _format_value(value: Any) -> str:
+        """将提取结果转为字符串：字符串原样输出，其余输出为JSON"""
+        if isinstance(value, str):
+            return value
+        return dumps(value)
+    
+    def format_debug_info(self) -> str:
+        """格式化调试信息为可读文本"""
+        if not self.debug_info:
+            return "无调试信息"
+            
+        lines = []
+        
+        # 路径信息
+        if "path" in self.debug_info:
+            path_str = "->" .join([p for p in self.debug_info["path"] if p])
+            lines.append(f"查询路径: {path_str}")
+        
+        # 模式信息
+        if "fuzzy_mode" in self.debug_info:
+            mode = "模糊搜索" if self.debug_info["fuzzy_mode"] else "精确路径"
+            lines.append(f"搜索模式: {mode}")
+        
+        # 匹配结果
+        if "matches" in self.debug_info and self.debug_info["matches"]:
+            lines.append("匹配结果:")
+            for i, match in enumerate(self.debug_info["matches"]):
+                if "exact" in match:
+                    lines.append(f"  ✓ 精确匹配: {match['path']}")
+                elif "path" in match and "similarity" in match:
+                    lines.append(f"  {i+1}. 路径: {match['path']} (相似度: {match['similarity']})")
+                elif "partial_key" in match:
+                    lines.append(f"  - 部分匹配: '{match['partial_key']}' → '{match['matched_to']}'")
+                elif "final_path" in match:
+                    lines.append(f"  最终路径: {match['final_path']}")
+            if "match_count" in self.debug_info:
+                lines.append(f"  ... 共 {self.debug_info['match_count']} 个匹配")
+        
+        # 批量提取结果
+        if self.debug_info.get("batch"):
+            results = self.debug_info.get("results", [])
+            succeeded = sum(1 for r in results if r["success"])
+            lines.append(f"批量提取: {succeeded}/{len(results)} 条路径成功")
+            for r in results:
+                mark = "✓" if r["success"] else "✗"
+                suffix = f" ({r['error']})" if "error" in r else ""
+                lines.append(f"  {mark} {r['path']}{suffix}")
+        
+        if self.debug_info.get("file"):
+            lines.append(f"输入文件: {self.debug_info['file']}")
+        
+        # 大文本流式定位
+        if self.debug_info.get("streaming"):
+            lines.append("解析方式: 流式定位 (未构建完整文档)")
+        else:
+            lines.append(f"JSON后端: {BACKEND}")
+        
+        if self.debug_info.get("timings"):
+            lines.append(f"阶段耗时: {format_timings(self.debug_info['timings'], STAGE_NAMES)}")
+        
+        # 共享文档缓存
+        cache = DOCUMENT_CACHE.stats()
+        lines.append(f"文档缓存: 命中 {cache['hits']} / 未命中 {cache['misses']} / 淘汰 {cache['evictions']}")
+        
+        # 错误信息
+        if "error" in self.debug_info:
+            lines.append(f"错误: {self.debug_info['error']}")
+        
+        return "\n".join(lines)
@@ -1,29 +1,164 @@
-import json
 import ast
-import re
-import demjson3
-from jsoncomment import JsonComment
-from typing import Tuple, Dict, Any, Optional, Union
+import sys
+import time
+from typing import Tuple, Dict, Any, List, Optional, Union
 from ..utils.json_utils import (
-    normalize_json, 
-    apply_format_style,
-    detect_encoding
+    apply_normalize_rules,
+    decode_bytes
 )
+from ..utils.json_lexer import lexer_repair_text
+from ..utils.json_guided_repair import GuidedRepair
+from ..utils.json_backend import BACKEND, dumps, loads, loads_native
+from ..utils.json_locator import FIRST, find_candidates, find_documents, select_candidate
+from ..utils.cache_utils import BoundedLRUCache, content_hash
+from ..utils.metrics import REGISTRY, TIER_ATTEMPTS, TIER_SECONDS, StageTimer
+from .tier_worker import TierTimeout, TierWorker
+from .repair_dispatcher import ADAPTIVE, RepairDispatcher
+
+
+# 各修复方法的默认预算
+#   timeout: 时间预算 (秒)，设置后在可终止的子进程中执行；None表示在当前进程内直接执行
+#   worker_min_size: 输入达到该大小 (字符) 才使用时间预算，更小的输入在当前进程内直接执行，
+#                    省去向子进程传送文本的开销；None表示总是使用
+#   max_size: 输入大小上限 (字符)，超出时跳过该方法；None表示不限
+DEFAULT_TIER_BUDGETS = {
+    "direct_parse": {"timeout": None, "worker_min_size": None, "max_size": None},
+    "guided_repair": {"timeout": None, "worker_min_size": None, "max_size": None},
+    "lexer_repair": {"timeout": None, "worker_min_size": None, "max_size": None},
+    "normalize": {"timeout": None, "worker_min_size": None, "max_size": None},
+    "jsoncomment": {"timeout": 5.0, "worker_min_size": 64 * 1024, "max_size": 16 * 1024 * 1024},
+    "demjson": {"timeout": 5.0, "worker_min_size": 16 * 1024, "max_size": 1024 * 1024},
+    "ast_eval": {"timeout": 5.0, "worker_min_size": 64 * 1024, "max_size": 1024 * 1024},
+}
+
+# jsoncomment 与 demjson3 导入较慢，第一次用到对应修复方法时才加载；解析器对象全进程共享
+_jsoncomment_parser = None
+
+
+def get_jsoncomment_parser():
+    """共享的JsonComment解析器 (首次调用时创建)"""
+    global _jsoncomment_parser
+    if _jsoncomment_parser is None:
+        from jsoncomment import JsonComment
+        _jsoncomment_parser = JsonComment()
+    return _jsoncomment_parser
+
+
+def _jsoncomment_loads(text: str) -> Any:
+    """模块级解析函数，可以发送到修复子进程执行"""
+    return get_jsoncomment_parser().loads(text)
+
+
+def _demjson_decode(text: str) -> Any:
+    """模块级解析函数，可以发送到修复子进程执行"""
+    import demjson3
+    return demjson3.decode(text)
+
+
+class _JSONDocument:
+    """处理过程中的内部文档句柄
+    
+    修复方法只负责把文本解析为对象并保存在句柄中，格式化与排序在最后对该对象
+    统一序列化一次，同时记录解析与序列化的次数。
+    """
+    
+    def __init__(self, worker: Optional[TierWorker] = None):
+        self.data = None
+        # 解析结果来自高速JSON库 (可以用高速库序列化)
+        self.native = False
+        self.parse_count = 0
+        self.serialize_count = 0
+        # 当前修复方法的时间预算，设置后解析在可终止的子进程中执行
+        self.timeout: Optional[float] = None
+        self.worker = worker
+    
+    def parse(self, loader, text: str) -> Any:
+        """使用指定解析器解析文本并保存结果
+        
+        Raises:
+            TierTimeout: 超出当前修复方法的时间预算
+        """
+        self.parse_count += 1
+        self.native = False
+        if self.timeout is not None and self.worker is not None:
+            self.data = self.worker.call(loader, text, self.timeout)
+        elif loader is loads:
+            self.data, self.native = loads_native(text)
+        else:
+            self.data = loader(text)
+        return self.data
+    
+    def serialize(self, indent: Optional[int] = None, sort_keys: bool = False) -> str:
+        """将解析结果序列化为JSON字符串"""
+        self.serialize_count += 1
+        return dumps(self.data, indent, sort_keys, native=self.native)
 
 
 class JSONProcessor:
     """处理各类伪JSON格式的核心处理器类"""
     
-    def __init__(self):
-        self.parser = JsonComment()
+    # 进程内共享的结果缓存 (ComfyUI会反复执行相同的工作流)
+    result_cache = BoundedLRUCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+    
+    # 进程内共享的修复子进程，执行设置了时间预算的修复方法
+    tier_worker = TierWorker()
+    
+    # 进程内共享的修复方法调度器，按输入特征累积各方法的成功率与耗时
+    dispatcher = RepairDispatcher()
+    
+    def __init__(self,
+                 use_cache: bool = True,
+                 tier_budgets: Optional[Dict[str, Dict[str, Any]]] = None,
+                 tier_order: str = ADAPTIVE):
+        """
+        Args:
+            use_cache: 是否使用结果缓存
+            tier_budgets: 覆盖部分修复方法的预算，如 {"demjson": {"timeout": 2.0, "max_size": 65536}}，
+                          未指定的方法与字段使用 DEFAULT_TIER_BUDGETS
+            tier_order: 修复方法的尝试顺序 ("adaptive"=按输入特征与运行统计, "fixed"=固定顺序，结果可复现)
+        """
+        self.use_cache = use_cache
+        self.tier_order = tier_order
+        self.tier_budgets = {tier: dict(budget) for tier, budget in DEFAULT_TIER_BUDGETS.items()}
+        for tier, budget in (tier_budgets or {}).items():
+            self.tier_budgets.setdefault(tier, {}).update(budget)
+        # 预算影响修复结果 (跳过或超时的方法)，作为结果缓存键的一部分
+        self._budget_key = tuple(sorted((tier, tuple(sorted(budget.items())))
+                                        for tier, budget in self.tier_budgets.items()))
         self.debug_info = {}
+    
+    @property
+    def parser(self):
+        """共享的JsonComment解析器"""
+        return get_jsoncomment_parser()
+    
+    @staticmethod
+    def cache_key(input_text: str,
+                  repair_level: int,
+                  indent: Optional[int],
+                  pretty_print: bool,
+                  sort_keys: bool,
+                  repair_engine: str = "lexer",
+                  locate_strategy: str = FIRST,
+                  tier_order: str = ADAPTIVE,
+                  tier_budgets: Tuple = ()) -> Tuple:
+        """生成结果缓存键：输入内容哈希 + 影响输出的处理参数 (包括修复预算)"""
+        return (content_hash(input_text), repair_level, indent, pretty_print, sort_keys, repair_engine,
+                locate_strategy, tier_order, tier_budgets)
+    
+    @classmethod
+    def tier_stats(cls) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """各输入特征组合下修复方法的运行统计"""
+        return cls.dispatcher.stats()
         
     def process(self, 
                input_text: str, 
                repair_level: int = 2,
                indent: int = 2,
                pretty_print: bool = True,
-               sort_keys: bool = False) -> Tuple[str, bool, Dict[str, Any]]:
+               sort_keys: bool = False,
+               repair_engine: str = "lexer",
+               locate_strategy: str = FIRST) -> Tuple[str, bool, Dict[str, Any]]:
         """处理JSON文本
         
         Args:
@@ -32,152 +167,354 @@ class JSONProcessor:
             indent: 缩进空格数
             pretty_print: 是否美化输出
             sort_keys: 是否按键排序
+            repair_engine: 规范化修复引擎 ("lexer"=单次扫描词法器, "regex"=正则级联)
+            locate_strategy: 文本中有多个候选JSON块时的选择策略 (first/largest/last/first_valid)
             
         Returns:
             处理后的JSON字符串, 是否成功, 调试信息
         """
-        if not input_text or not input_text.strip():
+        if not input_text or input_text.isspace():
             return "", False, {"error": "空输入"}
+        
+        timer = StageTimer("processor")
+        
+        # 查询结果缓存
+        key = None
+        if self.use_cache:
+            with timer.stage("cache_lookup"):
+                key = self.cache_key(input_text, repair_level, indent, pretty_print, sort_keys, repair_engine,
+                                     locate_strategy, self.tier_order, self._budget_key)
+                cached = self.result_cache.get(key)
+            if cached is not None:
+                result, success, debug = cached
+                self.debug_info = dict(debug)
+                self.debug_info.update({
+                    "parse_count": 0,
+                    "serialize_count": 0,
+                    "cache": dict(self.result_cache.stats(), status="hit"),
+                    "timings": timer.finish("cache_hit")
+                })
+                return result, success, self.debug_info
             
         # 记录原始输入
         self.debug_info = {
             "original_length": len(input_text),
             "original_preview": input_text[:100] + ("..." if len(input_text) > 100 else ""),
-            "repair_methods": []
+            "repair_methods": [],
+            "json_backend": BACKEND
         }
         
         # 首先尝试提取JSON内容
-        extracted_text = self._extract_json_content(input_text)
+        with timer.stage("locate"):
+            extracted_text = self._extract_json_content(input_text, locate_strategy)
         if extracted_text != input_text:
             self.debug_info["repair_methods"].append("json_extraction")
         
-        # 尝试各种修复方法
-        result, success = self._try_repair_methods(extracted_text, repair_level)
+        # 尝试各种修复方法，得到解析后的文档
+        with timer.stage("repair"):
+            document, success = self._try_repair_methods(extracted_text, repair_level, repair_engine)
         
-        # 美化格式化
-        if success and pretty_print:
-            result = apply_format_style(result, indent, sort_keys)
+        # 对解析结果只序列化一次 (美化与排序在此完成)
+        result = extracted_text
+        if success:
+            with timer.stage("format"):
+                try:
+                    result = document.serialize(indent if pretty_print else None, sort_keys)
+                except (TypeError, ValueError) as e:
+                    success = False
+                    self.debug_info["error"] = f"序列化失败: {str(e)}"
             
         # 记录结果信息
         self.debug_info.update({
+            "parse_count": document.parse_count,
+            "serialize_count": document.serialize_count,
             "success": success,
             "final_length": len(result),
-            "final_preview": result[:100] + ("..." if len(result) > 100 else "")
+            "final_preview": result[:100] + ("..." if len(result) > 100 else ""),
+            "timings": timer.finish("success" if success else "failure")
         })
         
+        # 写入结果缓存
+        if key is not None:
+            self.result_cache.put(key, (result, success, dict(self.debug_info)), sys.getsizeof(result))
+            self.debug_info["cache"] = dict(self.result_cache.stats(), status="miss")
+        
         return result, success, self.debug_info
     
-    def _extract_json_content(self, text: str) -> str:
-        """从文本中提取JSON内容"""
-        # 方法1: 提取markdown代码块中的JSON
-        json_from_markdown = self._extract_from_markdown(text)
-        if json_from_markdown:
-            return json_from_markdown
-        
-        # 方法2: 查找第一个完整的JSON对象或数组
-        json_from_braces = self._extract_from_braces(text)
-        if json_from_braces:
-            return json_from_braces
-        
-        # 方法3: 如果都没找到，返回原文本
-        return text.strip()
-    
-    def _extract_from_markdown(self, text: str) -> Optional[str]:
-        """从markdown代码块中提取JSON"""
-        # 匹配 ```json ... ``` 格式
-        json_pattern = r'```(?:json)?\s*\n?(.*?)\n?```'
-        matches = re.findall(json_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if matches:
-            # 返回第一个匹配的内容
-            return matches[0].strip()
-        
-        return None
-    
-    def _extract_from_braces(self, text: str) -> Optional[str]:
-        """通过大括号或方括号提取JSON内容"""
-        text = text.strip()
-        
-        # 查找对象 {...}
-        if '{' in text:
-            start_idx = text.find('{')
-            if start_idx != -1:
-                brace_count = 0
-                for i, char in enumerate(text[start_idx:], start_idx):
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            return text[start_idx:i+1]
-        
-        # 查找数组 [...]
-        if '[' in text:
-            start_idx = text.find('[')
-            if start_idx != -1:
-                bracket_count = 0
-                for i, char in enumerate(text[start_idx:], start_idx):
-                    if char == '[':
-                        bracket_count += 1
-                    elif char == ']':
-                        bracket_count -= 1
-                        if bracket_count == 0:
-                            return text[start_idx:i+1]
-        
-        return None
-    
-    def _try_repair_methods(self, text: str, repair_level: int) -> Tuple[str, bool]:
-        """按照顺序尝试各种修复方法"""
+    def process_many(self,
+                     input_text: str,
+                     repair_level: int = 2,
+                     indent: int = 2,
+                     pretty_print: bool = True,
+                     sort_keys: bool = False,
+                     repair_engine: str = "lexer") -> Tuple[List[str], str, bool, Dict[str, Any]]:
+        """多文档模式：一次扫描找出所有JSON文档并分别修复
+        
+        支持JSONL、多个代码块以及连续或夹杂在说明文字中的多个JSON值。
+        
+        Args:
+            与 process 相同
+            
+        Returns:
+            各文档的处理结果列表 (失败的文档保留原文), 成功文档合并成的JSON数组,
+            是否全部成功, 调试信息
+        """
+        if not input_text or input_text.isspace():
+            return [], "[]", False, {"error": "空输入"}
+        
+        timer = StageTimer("processor_many")
+        
+        key = None
+        if self.use_cache:
+            with timer.stage("cache_lookup"):
+                key = self.cache_key(input_text, repair_level, indent, pretty_print, sort_keys, repair_engine,
+                                     "many", self.tier_order, self._budget_key)
+                cached = self.result_cache.get(key)
+            if cached is not None:
+                results, merged, success, debug = cached
+                self.debug_info = dict(debug)
+                self.debug_info.update({
+                    "parse_count": 0,
+                    "serialize_count": 0,
+                    "cache": dict(self.result_cache.stats(), status="hit"),
+                    "timings": timer.finish("cache_hit")
+                })
+                return list(results), merged, success, self.debug_info
+        
+        self.debug_info = {
+            "original_length": len(input_text),
+            "original_preview": input_text[:100] + ("..." if len(input_text) > 100 else ""),
+            "repair_methods": [],
+            "json_backend": BACKEND
+        }
+        
+        with timer.stage("locate"):
+            doc_format, spans = find_documents(input_text)
+        if not spans:
+            # 没有找到任何块时把整段文本当作一个文档
+            spans = [None]
+        
+        output_indent = indent if pretty_print else None
+        results: List[str] = []
+        values: List[Any] = []
+        # 所有文档都由高速库解析时，合并数组也可以用高速库序列化
+        native = True
+        documents_info = []
+        parse_count = 0
+        serialize_count = 0
+        for span in spans:
+            text = input_text.strip() if span is None else span.text(input_text)
+            self.debug_info["repair_methods"] = []
+            with timer.stage("repair"):
+                document, success = self._try_repair_methods(text, repair_level, repair_engine)
+            parse_count += document.parse_count
+            result = text
+            if success:
+                with timer.stage("format"):
+                    try:
+                        result = document.serialize(output_indent, sort_keys)
+                        values.append(document.data)
+                        native = native and document.native
+                    except (TypeError, ValueError):
+                        success = False
+            serialize_count += document.serialize_count
+            results.append(result)
+            info = {"success": success, "methods": self.debug_info["repair_methods"],
+                    "tiers": self.debug_info.pop("tiers", []),
+                    "features": self.debug_info.pop("features", []),
+                    "guided_fixes": self.debug_info.pop("guided_fixes", [])}
+            self.debug_info.pop("tier_order", None)
+            if span is not None:
+                info.update({"kind": span.kind, "start": span.start, "end": span.end})
+            documents_info.append(info)
+        
+        # 合并数组直接序列化已解析的对象，不再重新解析各文档的结果
+        with timer.stage("format"):
+            merged = dumps(values, output_indent, sort_keys, native=native)
+        serialize_count += 1
+        success = all(info["success"] for info in documents_info)
+        
+        self.debug_info.update({
+            "repair_methods": [],
+            "multi_document": True,
+            "document_format": doc_format,
+            "documents": documents_info,
+            "parse_count": parse_count,
+            "serialize_count": serialize_count,
+            "success": success,
+            "final_length": len(merged),
+            "final_preview": merged[:100] + ("..." if len(merged) > 100 else ""),
+            "timings": timer.finish("success" if success else "failure")
+        })
+        
+        if key is not None:
+            size = sys.getsizeof(merged) + sum(sys.getsizeof(r) for r in results)
+            self.result_cache.put(key, (tuple(results), merged, success, dict(self.debug_info)), size)
+            self.debug_info["cache"] = dict(self.result_cache.stats(), status="miss")
+        
+        return results, merged, success, self.debug_info
+    
+    def process_bytes(self, input_bytes: Union[bytes, bytearray, memoryview], **options) -> Tuple[str, bool, Dict[str, Any]]:
+        """处理字节输入 (文件内容、网络响应等)
+        
+        先识别编码并解码 (BOM -> 严格UTF-8 -> 对有限样本做统计检测，合法的UTF-8输入不会调用chardet)，
+        其余与 process 相同，调试信息中记录使用的编码。
+        
+        Args:
+            input_bytes: 输入字节
+            options: process 的其余参数
+        """
+        text, encoding = decode_bytes(input_bytes)
+        result, success, debug = self.process(text, **options)
+        debug["encoding"] = encoding
+        return result, success, debug
+    
+    def process_many_bytes(self,
+                           input_bytes: Union[bytes, bytearray, memoryview],
+                           **options) -> Tuple[List[str], str, bool, Dict[str, Any]]:
+        """多文档模式处理字节输入，解码方式与 process_bytes 相同"""
+        text, encoding = decode_bytes(input_bytes)
+        results, merged, success, debug = self.process_many(text, **options)
+        debug["encoding"] = encoding
+        return results, merged, success, debug
+    
+    def _extract_json_content(self, text: str, locate_strategy: str = FIRST) -> str:
+        """从文本中提取JSON内容
+        
+        单次扫描找出所有代码块与平衡的对象/数组，按策略选出一个；都没找到时返回原文本。
+        """
+        candidates = find_candidates(text)
+        candidate = select_candidate(text, candidates, locate_strategy)
+        self.debug_info["candidate_count"] = len(candidates)
+        if candidate is None:
+            return text.strip()
+        self.debug_info["located"] = {"kind": candidate.kind, "start": candidate.start, "end": candidate.end}
+        return candidate.text(text)
+    
+    def _try_repair_methods(self, text: str, repair_level: int, repair_engine: str = "lexer") -> Tuple[_JSONDocument, bool]:
+        """按照顺序尝试各种修复方法，返回持有解析结果的文档句柄"""
         methods = [
             self._try_direct_parse,
-            self._try_normalize,
+            self._try_guided_repair,
+            self._try_normalize if repair_engine == "regex" else self._try_lexer_repair,
             self._try_jsoncomment,
             self._try_demjson,
             self._try_ast_eval
         ]
         
-        # 根据修复级别选择尝试的方法
-        methods_to_try = methods[:1 + repair_level]  # 至少尝试直接解析
+        # 根据修复级别选择尝试的方法 (至少尝试直接解析与按错误位置修复)
+        methods_to_try = {method.__name__[len("_try_"):]: method
+                          for method in methods[:2 + repair_level]}
+        
+        document = _JSONDocument(self.tier_worker)
+        tiers = []
+        self.debug_info["tiers"] = tiers
+        
+        # 直接解析最便宜，总是先尝试；失败后才扫描输入特征并决定其余方法的顺序，合法输入不做特征扫描
+        order = ["direct_parse"]
+        self.debug_info["features"] = []
+        self.debug_info["tier_order"] = order
+        status, elapsed = self._run_tier("direct_parse", methods_to_try["direct_parse"], text, document, tiers)
+        if status == "succeeded":
+            self.dispatcher.record((), "direct_parse", True, elapsed, len(text))
+            return document, True
         
-        for method in methods_to_try:
-            try:
-                result, success = method(text)
-                if success:
-                    self.debug_info["repair_methods"].append(method.__name__)
-                    return result, True
-            except Exception as e:
-                # 记录异常信息
-                pass
+        features = self.dispatcher.scan(text)
+        self.dispatcher.record(features, "direct_parse", False, elapsed, len(text))
+        order.extend(self.dispatcher.order(features, [tier for tier in methods_to_try if tier != "direct_parse"],
+                                           self.tier_order))
+        self.debug_info["features"] = list(features)
+        
+        for tier in order[1:]:
+            status, elapsed = self._run_tier(tier, methods_to_try[tier], text, document, tiers)
+            if status == "skipped":
+                continue
+            self.dispatcher.record(features, tier, status == "succeeded", elapsed, len(text))
+            if status == "succeeded":
+                return document, True
         
         # 所有方法都尝试失败
-        return text, False
+        return document, False
     
-    def _try_direct_parse(self, text: str) -> Tuple[str, bool]:
-        """尝试直接解析JSON"""
+    def _run_tier(self, tier: str, method, text: str, document: _JSONDocument, tiers: List[Dict[str, Any]]) -> Tuple[str, float]:
+        """在预算内尝试一种修复方法，记录到调试信息与指标注册表
+        
+        Returns:
+            结果 (succeeded/failed/timeout/skipped), 耗时 (毫秒)
+        """
+        budget = self.tier_budgets.get(tier, {})
+        
+        # 超出大小上限的输入直接跳过该方法
+        max_size = budget.get("max_size")
+        if max_size is not None and len(text) > max_size:
+            tiers.append({"tier": tier, "status": "skipped"})
+            REGISTRY.inc(TIER_ATTEMPTS, {"tier": tier, "status": "skipped"})
+            return "skipped", 0.0
+        
+        # 小输入在当前进程内直接执行，不经过修复子进程
+        worker_min_size = budget.get("worker_min_size")
+        if worker_min_size is None or len(text) >= worker_min_size:
+            document.timeout = budget.get("timeout")
+        isolated = document.timeout is not None
+        start = time.perf_counter()
+        status = "failed"
+        error = None
         try:
-            parsed = json.loads(text)
-            return json.dumps(parsed, ensure_ascii=False), True
-        except:
-            raise Exception("Direct parse failed")
-    
-    def _try_normalize(self, text: str) -> Tuple[str, bool]:
-        """尝试使用normalize_json修复JSON"""
-        normalized, success = normalize_json(text, repair_level=3)
-        if not success:
-            raise Exception("Normalize failed")
-        return normalized, True
-    
-    def _try_jsoncomment(self, text: str) -> Tuple[str, bool]:
+            _, success = method(text, document)
+            if success:
+                status = "succeeded"
+        except TierTimeout:
+            status = "timeout"
+        except Exception as e:
+            # 记录失败原因，调试信息中可以看到每个方法为什么失败
+            error = f"{type(e).__name__}: {e}"[:200]
+        finally:
+            document.timeout = None
+        seconds = time.perf_counter() - start
+        elapsed = seconds * 1000
+        entry = {"tier": tier, "status": status, "ms": round(elapsed, 2)}
+        if isolated:
+            entry["worker"] = True
+        if error is not None:
+            entry["error"] = error
+        tiers.append(entry)
+        REGISTRY.inc(TIER_ATTEMPTS, {"tier": tier, "status": status})
+        REGISTRY.observe(TIER_SECONDS, seconds, {"tier": tier})
+        
+        if status == "succeeded":
+            self.debug_info["repair_methods"].append(method.__name__)
+        return status, elapsed
+    
+    def _try_direct_parse(self, text: str, document: _JSONDocument) -> Tuple[Any, bool]:
+        """尝试直接解析JSON"""
+        return document.parse(loads, text), True
+    
+    def _try_guided_repair(self, text: str, document: _JSONDocument) -> Tuple[Any, bool]:
+        """尝试根据解析错误的位置逐处修复JSON"""
+        repair = GuidedRepair()
+        data = document.parse(repair.loads, text)
+        self.debug_info["guided_fixes"] = repair.fixes
+        return data, True
+    
+    def _try_normalize(self, text: str, document: _JSONDocument) -> Tuple[Any, bool]:
+        """尝试使用正则级联规则修复JSON"""
+        normalized = apply_normalize_rules(text, repair_level=3)
+        return document.parse(loads, normalized), True
+    
+    def _try_lexer_repair(self, text: str, document: _JSONDocument) -> Tuple[Any, bool]:
+        """尝试使用单次扫描词法器修复JSON"""
+        repaired = lexer_repair_text(text)
+        return document.parse(loads, repaired), True
+    
+    def _try_jsoncomment(self, text: str, document: _JSONDocument) -> Tuple[Any, bool]:
         """尝试使用JsonComment解析JSON"""
-        parsed = self.parser.loads(text)
-        return json.dumps(parsed, ensure_ascii=False), True
+        return document.parse(_jsoncomment_loads, text), True
     
-    def _try_demjson(self, text: str) -> Tuple[str, bool]:
+    def _try_demjson(self, text: str, document: _JSONDocument) -> Tuple[Any, bool]:
         """尝试使用demjson解析JSON"""
-        parsed = demjson3.decode(text)
-        return json.dumps(parsed, ensure_ascii=False), True
+        return document.parse(_demjson_decode, text), True
     
-    def _try_ast_eval(self, text: str) -> Tuple[str, bool]:
+    def _try_ast_eval(self, text: str, document: _JSONDocument) -> Tuple[Any, bool]:
         """尝试使用Python AST解析JSON"""
         # 尝试添加外层大括号
         if not text.strip().startswith('{') and not text.strip().startswith('['):
@@ -187,5 +524,4 @@ class JSONProcessor:
         text = text.replace("'", '"')
         
         # 尝试使用ast.literal_eval解析
-        parsed = ast.literal_eval(text)
-        return json.dumps(parsed, ensure_ascii=False), True
+        return document.parse(ast.literal_eval, text), True
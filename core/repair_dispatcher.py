@@ -0,0 +1,139 @@
+import threading
+from typing import Dict, List, Tuple
+
+from ..utils.json_features import (
+    COMMENTS,
+    PYTHON_LITERALS,
+    SINGLE_QUOTES,
+    TRUNCATED,
+    UNQUOTED_KEYS,
+    scan_features
+)
+
+
+# 尝试顺序
+ADAPTIVE = "adaptive"   # 按输入特征与运行统计排序
+FIXED = "fixed"         # 始终按修复级别的默认顺序，结果可复现
+
+# 各修复方法能够处理的输入特征；输入含有其他特征时该方法大概率失败
+_HANDLED_FEATURES = {
+    "direct_parse": frozenset(),
+    # 逐处修复，特征很多时会达到次数上限；截断只需补全末尾
+    "guided_repair": frozenset((TRUNCATED,)),
+    "lexer_repair": frozenset((COMMENTS, SINGLE_QUOTES, UNQUOTED_KEYS, PYTHON_LITERALS, TRUNCATED)),
+    "normalize": frozenset((COMMENTS, SINGLE_QUOTES, UNQUOTED_KEYS, TRUNCATED)),
+    "jsoncomment": frozenset((COMMENTS,)),
+    "demjson": frozenset((COMMENTS, SINGLE_QUOTES, UNQUOTED_KEYS)),
+    "ast_eval": frozenset((SINGLE_QUOTES, PYTHON_LITERALS)),
+}
+
+# 先验耗时 (毫秒/KB)，设置了时间预算的方法包含子进程通信开销
+_PRIOR_COST = {
+    "direct_parse": 0.01,
+    "guided_repair": 0.05,
+    "lexer_repair": 0.5,
+    "normalize": 0.3,
+    "jsoncomment": 1.0,
+    "demjson": 20.0,
+    "ast_eval": 2.0,
+}
+
+# 可以互相调换顺序的修复方法：两者都能修复时得到相同的文档，尝试顺序只影响耗时不影响结果。
+# 其他方法 (jsoncomment/demjson/ast_eval/正则级联) 对同一输入可能得到不同的文档，保持默认位置
+_INTERCHANGEABLE = frozenset(("guided_repair", "lexer_repair"))
+
+_PRIOR_SUCCESS = 0.9     # 输入特征都能处理时的先验成功率
+_PRIOR_FAILURE = 0.05    # 含有无法处理的特征时的先验成功率
+_PRIOR_WEIGHT = 2.0      # 先验相当于的观测次数
+
+
+class RepairDispatcher:
+    """按输入特征选择修复方法的尝试顺序
+
+    对每种特征组合分别统计各修复方法的尝试次数、成功次数与耗时，与先验混合后
+    估计成功率 p 与耗时 c，按 c / p 从小到大排序 (逐个尝试直到成功时期望耗时最小的顺序)。
+    只改变顺序，不改变修复级别允许的方法集合；只在输出相同的方法之间调换顺序 (_INTERCHANGEABLE)，
+    因此修复结果与固定顺序相同，不随运行统计变化。
+    """
+
+    def __init__(self):
+        # {特征组合: {修复方法: [尝试次数, 成功次数, 总耗时ms, 总输入KB]}}
+        self._stats: Dict[Tuple[str, ...], Dict[str, List[float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def scan(text: str) -> Tuple[str, ...]:
+        """扫描输入特征"""
+        return scan_features(text)
+
+    def _estimate(self, features: Tuple[str, ...], tier: str) -> Tuple[float, float]:
+        """返回 (估计成功率, 估计耗时 ms/KB)"""
+        handled = _HANDLED_FEATURES.get(tier)
+        if handled is None:
+            prior_success = 0.5
+        elif handled.issuperset(features):
+            prior_success = _PRIOR_SUCCESS
+        else:
+            prior_success = _PRIOR_FAILURE
+        prior_cost = _PRIOR_COST.get(tier, 1.0)
+
+        attempts, successes, total_ms, total_kb = self._stats.get(features, {}).get(tier, (0, 0, 0.0, 0.0))
+        success_rate = (successes + prior_success * _PRIOR_WEIGHT) / (attempts + _PRIOR_WEIGHT)
+        cost = (total_ms + prior_cost * _PRIOR_WEIGHT) / (total_kb + _PRIOR_WEIGHT)
+        return success_rate, cost
+
+    def order(self, features: Tuple[str, ...], tiers: List[str], mode: str = ADAPTIVE) -> List[str]:
+        """返回修复方法的尝试顺序
+
+        Args:
+            features: scan 的结果
+            tiers: 修复级别允许的方法 (默认顺序)
+            mode: adaptive=按估计排序, fixed=保持默认顺序
+        """
+        movable = [tier for tier in tiers if tier in _INTERCHANGEABLE]
+        if mode == FIXED or len(movable) < 2:
+            return list(tiers)
+        with self._lock:
+            scores = {}
+            for tier in movable:
+                success_rate, cost = self._estimate(features, tier)
+                scores[tier] = cost / max(success_rate, 1e-6)
+        # 稳定排序：估计相同的方法保持默认顺序；排序后的方法依次填回它们在默认顺序中的位置
+        ranked = iter(sorted(movable, key=scores.__getitem__))
+        return [next(ranked) if tier in _INTERCHANGEABLE else tier for tier in tiers]
+
+    def record(self, features: Tuple[str, ...], tier: str, success: bool, ms: float, size: int):
+        """记录一次尝试的结果"""
+        with self._lock:
+            entry = self._stats.setdefault(features, {}).setdefault(tier, [0, 0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += 1 if success else 0
+            entry[2] += ms
+            # 小输入按1KB计，避免固定开销被放大为极高的单位耗时
+            entry[3] += max(size / 1024, 1.0)
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """运行统计快照
+
+        Returns:
+            {特征组合 (逗号分隔, 无特征为 "plain"): {修复方法: {attempts, successes, success_rate, ms_per_kb}}}
+        """
+        with self._lock:
+            snapshot = {}
+            for features, tiers in self._stats.items():
+                name = ",".join(features) or "plain"
+                snapshot[name] = {
+                    tier: {
+                        "attempts": int(attempts),
+                        "successes": int(successes),
+                        "success_rate": round(successes / attempts, 3) if attempts else 0.0,
+                        "ms_per_kb": round(total_ms / total_kb, 3) if total_kb else 0.0,
+                    }
+                    for tier, (attempts, successes, total_ms, total_kb) in tiers.items()
+                }
+            return snapshot
+
+    def reset(self):
+        """清空运行统计"""
+        with self._lock:
+            self._stats.clear()
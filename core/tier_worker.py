@@ -0,0 +1,113 @@
+import os
+import threading
+from typing import Any, Callable, Optional
+
+from ..utils.process_utils import mp_context, package_bootstrap
+
+
+# 等待子进程启动并加载本包的最长时间 (秒)
+STARTUP_TIMEOUT = 60.0
+
+
+class TierTimeout(Exception):
+    """修复方法超出时间预算"""
+
+
+class TierWorker:
+    """可被终止的常驻子进程，用于执行可能耗时很长的修复方法
+
+    每次调用把 (解析函数, 文本) 发送给子进程并等待结果；超时后直接终止子进程，
+    下一次调用时重新启动。解析函数必须可以按名称序列化 (模块级函数)。
+    """
+
+    def __init__(self):
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        # 创建子进程的进程ID；以fork方式启动的进程 (如批量进程池) 继承的句柄不属于自己
+        self._owner_pid = None
+
+    def _start(self):
+        """启动子进程并等待其加载完成
+
+        spawn / forkserver 方式启动的子进程需要先加载本包，等到子进程就绪后才开始计时，
+        启动耗时不计入修复方法的时间预算。
+
+        Raises:
+            RuntimeError: 子进程未能在 STARTUP_TIMEOUT 内就绪
+        """
+        context = mp_context()
+        parent_conn, child_conn = context.Pipe()
+        code = package_bootstrap(f"importlib.import_module({__name__!r})._serve(conn)")
+        self._process = context.Process(target=exec, args=(code, {"conn": child_conn}), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._owner_pid = os.getpid()
+        try:
+            ready = parent_conn.poll(STARTUP_TIMEOUT) and parent_conn.recv()
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.stop()
+            raise RuntimeError("修复进程启动失败")
+
+    def stop(self):
+        """终止子进程"""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(1)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def call(self, func: Callable[[str], Any], text: str, timeout: Optional[float]) -> Any:
+        """在子进程中执行 func(text)
+
+        Raises:
+            TierTimeout: 超出时间预算 (子进程已被终止)
+            RuntimeError: 解析失败或子进程异常退出
+        """
+        with self._lock:
+            if self._owner_pid != os.getpid():
+                self._process = None
+                self._conn = None
+            if self._process is None or not self._process.is_alive():
+                self.stop()
+                self._start()
+            try:
+                self._conn.send((func, text))
+                if not self._conn.poll(timeout):
+                    self.stop()
+                    raise TierTimeout(f"超过 {timeout} 秒")
+                ok, value = self._conn.recv()
+            except (EOFError, OSError) as e:
+                self.stop()
+                raise RuntimeError(f"修复进程异常退出: {e}")
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+
+def _serve(conn):
+    """子进程主循环"""
+    # 通知父进程已就绪
+    conn.send(True)
+    while True:
+        try:
+            func, text = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = (True, func(text))
+        except Exception as e:
+            result = (False, f"{type(e).__name__}: {e}")
+        try:
+            conn.send(result)
+        except Exception as e:
+            # 结果无法序列化
+            conn.send((False, f"{type(e).__name__}: {e}"))
@@ -1,12 +1,21 @@
-import os
-import sys
-import json
 from typing import Dict, Any, Tuple, List, Optional
 
-# 确保模块能被正确导入
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from ..core.json_processor import JSONProcessor
+from ..core.batch_executor import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_WORKERS,
+    broadcast,
+    format_batch_info,
+    run_batch
+)
+from ..utils.cache_utils import input_fingerprint
+from ..utils.json_file import read_json_file, read_selected_json, with_file_stamp
+from ..utils.json_preview import DEFAULT_MAX_BYTES, DEFAULT_MAX_LINES, stream_format, stream_summary
+from ..utils.json_stream import JSONStreamError
+from ..utils.metrics import format_timings, maybe_export
+
+# 调试信息中各处理阶段的名称
+STAGE_NAMES = {"cache_lookup": "查缓存", "locate": "定位", "repair": "修复", "format": "格式化", "total": "总计"}
 
 class PIP_JSON_Corrector_Pro:
     """PIP-JSON修正-Pro节点，用于修复各类LLM模型生成的伪JSON格式"""
@@ -23,6 +32,12 @@ class PIP_JSON_Corrector_Pro:
                 "indent_size": (["2", "4", "无缩进"], {"default": "2"}),
                 "sort_keys": ("BOOLEAN", {"default": False}),
                 "show_debug": ("BOOLEAN", {"default": False}),
+                "repair_engine": (["词法扫描", "正则级联"], {"default": "词法扫描"}),
+                "locate_strategy": (["首个", "最大", "最后", "首个有效"], {"default": "首个"}),
+                "multi_document": ("BOOLEAN", {"default": False}),
+                "tier_order": (["自适应", "固定"], {"default": "自适应"}),
+                "json_file": ("STRING", {"default": "", "tooltip": "文件路径，非空时代替输入文本。单文档模式只解码定位策略选中的JSON块；"
+                                                                   "多文档模式需要找出文件中的所有文档，会解码整个文件"}),
             }
         }
     
@@ -33,6 +48,11 @@ class PIP_JSON_Corrector_Pro:
     
     def __init__(self):
         self.processor = JSONProcessor()
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """输入内容与参数 (以及输入文件的大小与修改时间) 不变时返回相同指纹，执行器可直接复用上次结果"""
+        return input_fingerprint(with_file_stamp(kwargs))
         
     def correct_json(self, 
                     input_text: str, 
@@ -40,7 +60,12 @@ class PIP_JSON_Corrector_Pro:
                     pretty_print: bool = True,
                     indent_size: str = "2",
                     sort_keys: bool = False,
-                    show_debug: bool = False) -> Tuple[str, bool, str]:
+                    show_debug: bool = False,
+                    repair_engine: str = "词法扫描",
+                    locate_strategy: str = "首个",
+                    multi_document: bool = False,
+                    tier_order: str = "自适应",
+                    json_file: str = "") -> Tuple[str, bool, str]:
         """修正JSON格式
         
         Args:
@@ -50,6 +75,11 @@ class PIP_JSON_Corrector_Pro:
             indent_size: 缩进大小
             sort_keys: 是否对键进行排序
             show_debug: 是否显示调试信息
+            repair_engine: 修复引擎 (词法扫描/正则级联)
+            locate_strategy: 文本中有多个JSON块时的选择策略 (首个/最大/最后/首个有效)
+            multi_document: 多文档模式，修复所有JSON块/JSONL记录并合并为一个JSON数组输出
+            tier_order: 修复方法的尝试顺序 (自适应=按输入特征与运行统计优先尝试最可能成功的方法, 固定=结果可复现)
+            json_file: 输入文件路径 (非空时代替input_text，文件以内存映射方式读取，单文档模式只解码选中的JSON块)
             
         Returns:
             修正后的JSON, 是否有效, 调试信息
@@ -65,17 +95,58 @@ class PIP_JSON_Corrector_Pro:
         # 设置缩进
         indent = None if indent_size == "无缩进" else int(indent_size)
         
+        # 选择修复引擎
+        engine = "regex" if repair_engine == "正则级联" else "lexer"
+        
+        # 选择定位策略
+        strategy_map = {
+            "首个": "first",
+            "最大": "largest",
+            "最后": "last",
+            "首个有效": "first_valid"
+        }
+        strategy = strategy_map.get(locate_strategy, "first")
+        
+        self.processor.tier_order = "fixed" if tier_order == "固定" else "adaptive"
+        
+        # 文件输入：单文档模式在映射的字节上按定位策略选出JSON块，只解码该块；
+        # 多文档模式需要在整个文件中查找各个文档，解码整个文件
+        if json_file and json_file.strip():
+            try:
+                if multi_document:
+                    input_text = read_json_file(json_file, whole=True)
+                else:
+                    input_text = read_selected_json(json_file, strategy)
+            except (OSError, ValueError) as e:
+                return "", False, f"读取文件失败: {str(e)}"
+        
+        if multi_document:
+            _, corrected, is_valid, debug = self.processor.process_many(
+                input_text=input_text,
+                repair_level=repair_level,
+                indent=indent,
+                pretty_print=pretty_print,
+                sort_keys=sort_keys,
+                repair_engine=engine
+            )
+            debug_str = self._format_debug_info(debug) if show_debug else ""
+            maybe_export()
+            return corrected, is_valid, debug_str
+        
         # 处理JSON
         corrected, is_valid, debug = self.processor.process(
             input_text=input_text,
             repair_level=repair_level,
             indent=indent,
             pretty_print=pretty_print,
-            sort_keys=sort_keys
+            sort_keys=sort_keys,
+            repair_engine=engine,
+            locate_strategy=strategy
         )
         
         # 生成调试信息
         debug_str = self._format_debug_info(debug) if show_debug else ""
+        maybe_export()
         
         return corrected, is_valid, debug_str
     
@@ -97,15 +168,201 @@ class PIP_JSON_Corrector_Pro:
             f"状态: {status}",
             f"原长度: {original_len} 字符",
             f"结果长度: {final_len} 字符",
-            f"使用方法: {method_str}"
+            f"使用方法: {method_str}",
+            f"解析/序列化次数: {debug_info.get('parse_count', 0)} / {debug_info.get('serialize_count', 0)}"
         ]
         
+        if "json_backend" in debug_info:
+            lines.append(f"JSON后端: {debug_info['json_backend']}")
+        
+        if debug_info.get("timings"):
+            lines.append(f"阶段耗时: {format_timings(debug_info['timings'], STAGE_NAMES)}")
+        
+        features = debug_info.get("features")
+        if features is not None:
+            feature_names = {"comments": "注释", "single_quotes": "单引号", "unquoted_keys": "无引号键",
+                             "python_literals": "Python字面量", "truncated": "截断"}
+            lines.append(f"输入特征: {', '.join(feature_names.get(f, f) for f in features) or '无'}")
+        if debug_info.get("tier_order"):
+            lines.append(f"尝试顺序: {' → '.join(debug_info['tier_order'])}")
+        
+        tiers = debug_info.get("tiers")
+        if tiers:
+            status_names = {"succeeded": "成功", "failed": "失败", "skipped": "跳过(超出大小上限)",
+                            "timeout": "超时"}
+            lines.append("修复方法耗时:")
+            for tier in tiers:
+                elapsed = f" {tier['ms']}ms" if "ms" in tier else ""
+                reason = f" ({tier['error']})" if "error" in tier else ""
+                lines.append(f"  {tier['tier']}: {status_names.get(tier['status'], tier['status'])}{elapsed}{reason}")
+        
+        guided_fixes = debug_info.get("guided_fixes")
+        if guided_fixes:
+            lines.append(f"按错误位置修复: {len(guided_fixes)} 处")
+            for fix in guided_fixes[:20]:
+                lines.append(f"  位置 {fix['pos']}: {fix['fix']}")
+            if len(guided_fixes) > 20:
+                lines.append(f"  ... 等{len(guided_fixes)}处")
+        
+        located = debug_info.get("located")
+        if located:
+            kind_names = {"fence": "代码块", "object": "对象", "array": "数组", "partial": "未闭合块"}
+            lines.append(f"定位: {debug_info.get('candidate_count', 0)} 个候选, 选中{kind_names[located['kind']]} "
+                         f"[{located['start']}:{located['end']}]")
+        
+        if debug_info.get("multi_document"):
+            documents = debug_info.get("documents", [])
+            format_names = {"jsonl": "JSONL", "fences": "代码块", "values": "JSON值"}
+            succeeded = sum(1 for d in documents if d["success"])
+            lines.append(f"多文档: {format_names.get(debug_info.get('document_format'), '')} "
+                         f"{succeeded}/{len(documents)} 个文档修复成功")
+            for i, d in enumerate(documents):
+                if not d["success"]:
+                    position = f" [{d['start']}:{d['end']}]" if "start" in d else ""
+                    lines.append(f"  ✗ 第 {i + 1} 个文档{position}")
+        
+        cache = debug_info.get("cache")
+        if cache:
+            status = "命中" if cache["status"] == "hit" else "未命中"
+            lines.append(f"结果缓存: {status} (命中 {cache['hits']} / 未命中 {cache['misses']} / "
+                         f"淘汰 {cache['evictions']}, {cache['entries']} 条)")
+        
         if "error" in debug_info:
             lines.append(f"错误: {debug_info['error']}")
             
         return "\n".join(lines)
 
 
+class PIP_JSON_Multi_Corrector(PIP_JSON_Corrector_Pro):
+    """多文档修正节点：修复文本中的所有JSON块/JSONL记录，按列表逐个输出"""
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "input_text": ("STRING", {"multiline": True, "default": ""}),
+                "repair_mode": (["标准", "宽松", "极限修复"], {"default": "标准"}),
+            },
+            "optional": {
+                "pretty_print": ("BOOLEAN", {"default": True}),
+                "indent_size": (["2", "4", "无缩进"], {"default": "2"}),
+                "sort_keys": ("BOOLEAN", {"default": False}),
+                "show_debug": ("BOOLEAN", {"default": False}),
+                "repair_engine": (["词法扫描", "正则级联"], {"default": "词法扫描"}),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "STRING", "BOOLEAN", "INT", "STRING")
+    RETURN_NAMES = ("documents", "merged_json", "all_valid", "count", "debug_info")
+    OUTPUT_IS_LIST = (True, False, False, False, False)
+    FUNCTION = "correct_documents"
+    
+    def correct_documents(self,
+                          input_text: str,
+                          repair_mode: str,
+                          pretty_print: bool = True,
+                          indent_size: str = "2",
+                          sort_keys: bool = False,
+                          show_debug: bool = False,
+                          repair_engine: str = "词法扫描") -> Tuple[List[str], str, bool, int, str]:
+        """修正文本中的所有JSON文档
+        
+        Returns:
+            各文档的修正结果列表, 合并后的JSON数组, 是否全部有效, 文档数量, 调试信息
+        """
+        repair_level = {"标准": 1, "宽松": 2, "极限修复": 3}.get(repair_mode, 2)
+        indent = None if indent_size == "无缩进" else int(indent_size)
+        engine = "regex" if repair_engine == "正则级联" else "lexer"
+        
+        documents, merged, all_valid, debug = self.processor.process_many(
+            input_text=input_text,
+            repair_level=repair_level,
+            indent=indent,
+            pretty_print=pretty_print,
+            sort_keys=sort_keys,
+            repair_engine=engine
+        )
+        
+        debug_str = self._format_debug_info(debug) if show_debug else ""
+        maybe_export()
+        return documents, merged, all_valid, len(documents), debug_str
+
+
+class PIP_JSON_List_Corrector:
+    """列表修正节点：一次接收整个列表，分块分发到常驻进程池并行修正，输出顺序与输入一致"""
+    
+    INPUT_IS_LIST = True
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "input_text": ("STRING", {"multiline": True, "default": ""}),
+                "repair_mode": (["标准", "宽松", "极限修复"], {"default": "标准"}),
+            },
+            "optional": {
+                "pretty_print": ("BOOLEAN", {"default": True}),
+                "indent_size": (["2", "4", "无缩进"], {"default": "2"}),
+                "sort_keys": ("BOOLEAN", {"default": False}),
+                "show_debug": ("BOOLEAN", {"default": False}),
+                "repair_engine": (["词法扫描", "正则级联"], {"default": "词法扫描"}),
+                "workers": ("INT", {"default": DEFAULT_WORKERS, "min": 1, "max": 64}),
+                "chunk_size": ("INT", {"default": DEFAULT_CHUNK_SIZE, "min": 1, "max": 4096}),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "BOOLEAN", "STRING")
+    RETURN_NAMES = ("corrected_json", "is_valid", "debug_info")
+    OUTPUT_IS_LIST = (True, True, False)
+    FUNCTION = "correct_json_list"
+    CATEGORY = "PIP/JSON"
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """输入内容与参数不变时返回相同指纹"""
+        return input_fingerprint(kwargs)
+    
+    def correct_json_list(self,
+                          input_text: List[str],
+                          repair_mode: List[str],
+                          pretty_print: List[bool] = (True,),
+                          indent_size: List[str] = ("2",),
+                          sort_keys: List[bool] = (False,),
+                          show_debug: List[bool] = (False,),
+                          repair_engine: List[str] = ("词法扫描",),
+                          workers: List[int] = (DEFAULT_WORKERS,),
+                          chunk_size: List[int] = (DEFAULT_CHUNK_SIZE,)) -> Tuple[List[str], List[bool], str]:
+        """批量修正JSON
+        
+        所有参数都是列表：长度为1时作用于全部条目，否则按位置与input_text对应。
+        
+        Returns:
+            修正后的JSON列表, 是否有效列表, 调试信息
+        """
+        count = len(input_text)
+        repair_level_map = {"标准": 1, "宽松": 2, "极限修复": 3}
+        items = []
+        for text, mode, pretty, size, sort, engine in zip(
+                input_text,
+                broadcast(repair_mode, count),
+                broadcast(pretty_print, count),
+                broadcast(indent_size, count),
+                broadcast(sort_keys, count),
+                broadcast(repair_engine, count)):
+            items.append((text, {
+                "repair_level": repair_level_map.get(mode, 2),
+                "indent": None if size == "无缩进" else int(size),
+                "pretty_print": pretty,
+                "sort_keys": sort,
+                "repair_engine": "regex" if engine == "正则级联" else "lexer",
+            }))
+        
+        results, info = run_batch("correct", items, workers[0], chunk_size[0])
+        
+        debug_str = format_batch_info(info, results) if show_debug[0] else ""
+        return [r[0] for r in results], [r[1] for r in results], debug_str
+
+
 class PIP_JSON_Preview:
     """JSON预览节点"""
     
@@ -115,6 +372,10 @@ class PIP_JSON_Preview:
             "required": {
                 "json_text": ("STRING", {"multiline": True}),
                 "display_mode": (["完整", "紧凑", "摘要"], {"default": "完整"}),
+            },
+            "optional": {
+                "max_lines": ("INT", {"default": DEFAULT_MAX_LINES, "min": 0, "max": 1000000}),
+                "max_bytes": ("INT", {"default": DEFAULT_MAX_BYTES, "min": 0, "max": 256 * 1024 * 1024}),
             }
         }
     
@@ -123,75 +384,55 @@ class PIP_JSON_Preview:
     FUNCTION = "preview_json"
     CATEGORY = "PIP/JSON"
     
-    def preview_json(self, json_text: str, display_mode: str) -> Tuple[str]:
-        """预览JSON内容"""
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """输入不变时返回相同指纹"""
+        return input_fingerprint(kwargs)
+    
+    def preview_json(self,
+                     json_text: str,
+                     display_mode: str,
+                     max_lines: int = DEFAULT_MAX_LINES,
+                     max_bytes: int = DEFAULT_MAX_BYTES) -> Tuple[str]:
+        """预览JSON内容
+        
+        完整与紧凑模式边解析边输出，达到行数或字节数预算 (0表示不限) 时停止并附带截断说明；
+        摘要模式只抽样大数组的前几项。耗时与内存取决于预算而不是文档大小。
+        """
         if not json_text:
             return ("无内容可预览",)
             
         try:
-            # 尝试解析JSON
-            data = json.loads(json_text)
-            
             if display_mode == "完整":
                 # 完整模式：返回格式化后的JSON
-                return (json.dumps(data, indent=2, ensure_ascii=False),)
+                return (stream_format(json_text, 2, max_lines, max_bytes)[0],)
                 
             elif display_mode == "紧凑":
                 # 紧凑模式：无换行和缩进
-                return (json.dumps(data, ensure_ascii=False),)
+                return (stream_format(json_text, None, max_lines, max_bytes)[0],)
                 
             elif display_mode == "摘要":
                 # 摘要模式：显示结构摘要
-                return (self._generate_summary(data),)
+                return (stream_summary(json_text),)
                 
-        except json.JSONDecodeError:
+        except JSONStreamError:
             return (f"无效JSON内容: {json_text[:100]}...",)
         
         return (json_text,)
-    
-    def _generate_summary(self, data: Any) -> str:
-        """生成JSON摘要"""
-        if isinstance(data, dict):
-            keys = list(data.keys())
-            key_count = len(keys)
-            preview = ", ".join(keys[:5])
-            if key_count > 5:
-                preview += f"... 等{key_count}个键"
-            return f"对象 {{{preview}}}"
-            
-        elif isinstance(data, list):
-            item_count = len(data)
-            preview_items = [self._preview_value(item) for item in data[:3]]
-            preview = ", ".join(preview_items)
-            if item_count > 3:
-                preview += f"... 等{item_count}项"
-            return f"数组 [{preview}]"
-            
-        else:
-            return self._preview_value(data)
-    
-    def _preview_value(self, value: Any) -> str:
-        """预览单个值"""
-        if isinstance(value, dict):
-            return f"对象 {{{len(value)}个键}}"
-        elif isinstance(value, list):
-            return f"数组 [{len(value)}项]"
-        elif isinstance(value, str):
-            if len(value) > 30:
-                return f'"{value[:27]}..."'
-            return f'"{value}"'
-        else:
-            return str(value)
 
 
 # 节点映射
 NODE_CLASS_MAPPINGS = {
     "PIP_JSON_Corrector_Pro": PIP_JSON_Corrector_Pro,
+    "PIP_JSON_Multi_Corrector": PIP_JSON_Multi_Corrector,
+    "PIP_JSON_List_Corrector": PIP_JSON_List_Corrector,
     "PIP_JSON_Preview": PIP_JSON_Preview,
 }
 
 # 显示名称映射
 NODE_DISPLAY_NAME_MAPPINGS = {
     "PIP_JSON_Corrector_Pro": "PIP JSON修正-Pro",
+    "PIP_JSON_Multi_Corrector": "PIP JSON多文档修正",
+    "PIP_JSON_List_Corrector": "PIP JSON列表修正",
     "PIP_JSON_Preview": "PIP JSON预览",
 }
@@ -1,12 +1,21 @@
-import os
-import sys
+import heapq
 import json
 from typing import Dict, Any, Tuple, List, Optional
 
-# 确定模块能被正确导入
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from ..core.json_extractor_processor import JSONExtractorProcessor
+from ..core.batch_executor import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_WORKERS,
+    broadcast,
+    format_batch_info,
+    run_batch
+)
+from ..utils.cache_utils import input_fingerprint
+from ..utils.json_extractor import parse_json_cached
+from ..utils.json_file import read_json_file, with_file_stamp
+from ..utils.metrics import maybe_export
+from ..utils.shape_index import ShapeIndex, ShapeNode, format_path, get_shape_index
+from ..utils.schema_inference import SchemaNode, infer_schema, to_json_schema
 
 class PIP_JSON_Extractor_Pro:
     """PIP-JSON提取-Pro节点，用于从复杂JSON中提取特定数据"""
@@ -26,6 +35,8 @@ class PIP_JSON_Extractor_Pro:
                 "key_level_5": ("STRING", {"default": ""}),
                 "similarity_threshold": (["0.5", "0.6", "0.7", "0.8", "0.9"], {"default": "0.6"}),
                 "show_debug": ("BOOLEAN", {"default": False}),
+                "json_path": ("STRING", {"default": ""}),
+                "json_file": ("STRING", {"default": ""}),
             }
         }
     
@@ -36,6 +47,11 @@ class PIP_JSON_Extractor_Pro:
     
     def __init__(self):
         self.processor = JSONExtractorProcessor()
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """输入内容与参数 (以及输入文件的大小与修改时间) 不变时返回相同指纹，执行器可直接复用上次结果"""
+        return input_fingerprint(with_file_stamp(kwargs))
         
     def extract_json_value(self, 
                         json_text: str, 
@@ -46,7 +62,9 @@ class PIP_JSON_Extractor_Pro:
                         key_level_4: str = "",
                         key_level_5: str = "",
                         similarity_threshold: str = "0.6",
-                        show_debug: bool = False) -> Tuple[str, bool, str]:
+                        show_debug: bool = False,
+                        json_path: str = "",
+                        json_file: str = "") -> Tuple[str, bool, str]:
         """从JSON中提取值
         
         Args:
@@ -55,6 +73,8 @@ class PIP_JSON_Extractor_Pro:
             key_level_1-5: 1-5级路径键
             similarity_threshold: 相似度阈值
             show_debug: 是否显示调试信息
+            json_path: 路径表达式 (非空时代替1-5级路径键，层级不受限制)
+            json_file: JSON文件路径 (非空时代替json_text，文件以内存映射方式读取，精确路径只解码读到的部分)
             
         Returns:
             提取的值, 是否成功, 调试信息
@@ -74,11 +94,14 @@ class PIP_JSON_Extractor_Pro:
                 json_str=json_text,
                 path_keys=path_keys,
                 fuzzy_mode=fuzzy_mode,
-                min_similarity=min_similarity
+                min_similarity=min_similarity,
+                path_expression=json_path,
+                json_file=json_file
             )
             
             # 生成调试信息
             debug_str = self.processor.format_debug_info() if show_debug else ""
+            maybe_export()
             
             return result, success, debug_str
             
@@ -86,6 +109,148 @@ class PIP_JSON_Extractor_Pro:
             return f"错误: {str(e)}", False, f"处理异常: {str(e)}"
 
 
+class PIP_JSON_Batch_Extractor:
+    """JSON批量提取节点，一次遍历提取多条路径"""
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "json_text": ("STRING", {"multiline": True, "default": ""}),
+                "paths": ("STRING", {"multiline": True, "default": ""}),
+                "output_format": (["列表", "JSON对象"], {"default": "列表"}),
+            },
+            "optional": {
+                "show_debug": ("BOOLEAN", {"default": False}),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "BOOLEAN", "STRING", "STRING")
+    RETURN_NAMES = ("extracted_values", "all_success", "path_status", "debug_info")
+    FUNCTION = "extract_json_values"
+    CATEGORY = "PIP/JSON"
+    
+    def __init__(self):
+        self.processor = JSONExtractorProcessor()
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """输入不变时返回相同指纹"""
+        return input_fingerprint(kwargs)
+    
+    def extract_json_values(self,
+                            json_text: str,
+                            paths: str,
+                            output_format: str,
+                            show_debug: bool = False) -> Tuple[str, bool, str, str]:
+        """从JSON中批量提取值
+        
+        Args:
+            json_text: JSON字符串
+            paths: 路径表达式，每行一条
+            output_format: 输出格式 (列表/JSON对象)
+            show_debug: 是否显示调试信息
+            
+        Returns:
+            提取结果, 是否全部成功, 各路径成功状态, 调试信息
+        """
+        try:
+            result, success, debug = self.processor.extract_many(
+                json_str=json_text,
+                paths=paths.splitlines(),
+                as_object=output_format == "JSON对象"
+            )
+            
+            status = {r["path"]: r["success"] for r in debug.get("results", [])}
+            debug_str = self.processor.format_debug_info() if show_debug else ""
+            maybe_export()
+            
+            return result, success, json.dumps(status, ensure_ascii=False), debug_str
+            
+        except Exception as e:
+            return f"错误: {str(e)}", False, "{}", f"处理异常: {str(e)}"
+
+
+class PIP_JSON_List_Extractor:
+    """列表提取节点：一次接收整个列表，分块分发到常驻进程池并行提取，输出顺序与输入一致"""
+    
+    INPUT_IS_LIST = True
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "json_text": ("STRING", {"multiline": True, "default": ""}),
+                "search_mode": (["精确路径", "模糊搜索"], {"default": "精确路径"}),
+            },
+            "optional": {
+                "key_level_1": ("STRING", {"default": ""}),
+                "key_level_2": ("STRING", {"default": ""}),
+                "key_level_3": ("STRING", {"default": ""}),
+                "key_level_4": ("STRING", {"default": ""}),
+                "key_level_5": ("STRING", {"default": ""}),
+                "similarity_threshold": (["0.5", "0.6", "0.7", "0.8", "0.9"], {"default": "0.6"}),
+                "show_debug": ("BOOLEAN", {"default": False}),
+                "json_path": ("STRING", {"default": ""}),
+                "workers": ("INT", {"default": DEFAULT_WORKERS, "min": 1, "max": 64}),
+                "chunk_size": ("INT", {"default": DEFAULT_CHUNK_SIZE, "min": 1, "max": 4096}),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "BOOLEAN", "STRING")
+    RETURN_NAMES = ("extracted_value", "success", "debug_info")
+    OUTPUT_IS_LIST = (True, True, False)
+    FUNCTION = "extract_json_value_list"
+    CATEGORY = "PIP/JSON"
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """输入内容与参数不变时返回相同指纹"""
+        return input_fingerprint(kwargs)
+    
+    def extract_json_value_list(self,
+                                json_text: List[str],
+                                search_mode: List[str],
+                                key_level_1: List[str] = ("",),
+                                key_level_2: List[str] = ("",),
+                                key_level_3: List[str] = ("",),
+                                key_level_4: List[str] = ("",),
+                                key_level_5: List[str] = ("",),
+                                similarity_threshold: List[str] = ("0.6",),
+                                show_debug: List[bool] = (False,),
+                                json_path: List[str] = ("",),
+                                workers: List[int] = (DEFAULT_WORKERS,),
+                                chunk_size: List[int] = (DEFAULT_CHUNK_SIZE,)) -> Tuple[List[str], List[bool], str]:
+        """批量从JSON中提取值
+        
+        所有参数都是列表：长度为1时作用于全部条目，否则按位置与json_text对应。
+        
+        Returns:
+            提取的值列表, 是否成功列表, 调试信息
+        """
+        count = len(json_text)
+        columns = zip(
+            json_text,
+            broadcast(search_mode, count),
+            zip(*(broadcast(keys, count) for keys in (key_level_1, key_level_2, key_level_3,
+                                                      key_level_4, key_level_5))),
+            broadcast(similarity_threshold, count),
+            broadcast(json_path, count))
+        items = []
+        for text, mode, path_keys, threshold, path in columns:
+            items.append((text, {
+                "path_keys": list(path_keys),
+                "fuzzy_mode": mode == "模糊搜索",
+                "min_similarity": float(threshold),
+                "path_expression": path,
+            }))
+        
+        results, info = run_batch("extract", items, workers[0], chunk_size[0])
+        
+        debug_str = format_batch_info(info, results) if show_debug[0] else ""
+        return [r[0] for r in results], [r[1] for r in results], debug_str
+
+
 class PIP_JSON_Path_Builder:
     """JSON路径构建器节点"""
     
@@ -94,11 +259,13 @@ class PIP_JSON_Path_Builder:
         return {
             "required": {
                 "json_text": ("STRING", {"multiline": True, "default": ""}),
-                "display_mode": (["层级树", "路径列表", "推荐路径"], {"default": "层级树"}),
+                "display_mode": (["层级树", "路径列表", "推荐路径", "合并结构", "JSON Schema"], {"default": "层级树"}),
             },
             "optional": {
                 "max_depth": (["1", "2", "3", "4", "5", "全部"], {"default": "3"}),
                 "filter_pattern": ("STRING", {"default": ""}),
+                "sample_rate": ("FLOAT", {"default": 1.0, "min": 0.001, "max": 1.0, "step": 0.01}),
+                "json_file": ("STRING", {"default": ""}),
             }
         }
     
@@ -107,6 +274,11 @@ class PIP_JSON_Path_Builder:
     FUNCTION = "build_path_info"
     CATEGORY = "PIP/JSON"
     
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """输入 (以及输入文件的大小与修改时间) 不变时返回相同指纹"""
+        return input_fingerprint(with_file_stamp(kwargs))
+    
     def __init__(self):
         pass
         
@@ -114,7 +286,9 @@ class PIP_JSON_Path_Builder:
                       json_text: str, 
                       display_mode: str,
                       max_depth: str = "3",
-                      filter_pattern: str = "") -> Tuple[str]:
+                      filter_pattern: str = "",
+                      sample_rate: float = 1.0,
+                      json_file: str = "") -> Tuple[str]:
         """构建JSON路径信息
         
         Args:
@@ -122,199 +296,193 @@ class PIP_JSON_Path_Builder:
             display_mode: 展示模式
             max_depth: 最大层级深度
             filter_pattern: 过滤模式
+            sample_rate: 合并结构/JSON Schema 模式中大数组元素的抽样率 (1表示检查全部元素)
+            json_file: JSON文件路径 (非空时代替json_text，只解码文件中定位到的JSON内容)
             
         Returns:
             路径信息字符串
         """
         try:
-            # 解析JSON
+            # 解析JSON (与提取节点共享解析结果)
             try:
-                data = json.loads(json_text)
-            except json.JSONDecodeError as e:
-                return (f"无效JSON格式: {str(e)}",)
+                if json_file and json_file.strip():
+                    json_text = read_json_file(json_file)
+                data = parse_json_cached(json_text)
+            except ValueError as e:
+                return (str(e),)
             
             # 设置最大深度
             depth_limit = int(max_depth) if max_depth != "全部" else 999
             
+            # 结构推断：数组元素合并为一个结构，统计键的出现情况与类型分布
+            if display_mode in ("合并结构", "JSON Schema"):
+                schema = infer_schema(data, sample_rate)
+                if display_mode == "JSON Schema":
+                    return (json.dumps(to_json_schema(schema), ensure_ascii=False, indent=2),)
+                return (self._build_schema_view(schema, depth_limit, filter_pattern, sample_rate),)
+            
+            # 一次遍历构建的结构索引 (同一文档只构建一次)，三种展示模式都从索引生成
+            index = get_shape_index(data)
+            
             # 收集路径
             if display_mode == "层级树":
-                result = self._build_tree_view(data, depth_limit, filter_pattern)
+                result = self._build_tree_view(index, depth_limit, filter_pattern)
             elif display_mode == "路径列表":
-                result = self._build_path_list(data, depth_limit, filter_pattern)
+                result = self._build_path_list(index, depth_limit, filter_pattern)
             else:  # 推荐路径
-                result = self._suggest_paths(data, depth_limit, filter_pattern)
+                result = self._suggest_paths(index, depth_limit, filter_pattern)
             
             return (result,)
             
         except Exception as e:
             return (f"错误: {str(e)}",)
     
-    def _build_tree_view(self, data: Any, depth_limit: int, filter_pattern: str, prefix: str = "", depth: int = 0) -> str:
-        """构建树状图结构"""
-        if depth >= depth_limit:
-            return ""
-            
+    @staticmethod
+    def _array_note(node: ShapeNode) -> str:
+        """数组长度与抽样说明"""
+        if node.types.get("list", 0) == 1:
+            note = f"共{node.total_length}项"
+        else:
+            note = f"长度 {node.min_length}-{node.max_length}"
+        if node.sampled < node.total_length:
+            note += f", 抽样{node.sampled}项"
+        return note
+    
+    def _build_tree_view(self, index: ShapeIndex, depth_limit: int, filter_pattern: str) -> str:
+        """构建树状图结构 (数组元素合并显示为 [*])"""
         lines = []
-        indent = "  " * depth
+        pattern = filter_pattern.lower()
         
-        if isinstance(data, dict):
-            for key, value in data.items():
+        def render(node: ShapeNode, depth: int):
+            if depth >= depth_limit:
+                return
+            indent = "  " * depth
+            
+            entries = []
+            for key, child in node.children.items():
                 # 过滤模式
-                if filter_pattern and filter_pattern.lower() not in key.lower():
+                if pattern and pattern not in key.lower():
                     continue
-                    
-                if isinstance(value, (dict, list)):
-                    if isinstance(value, dict):
-                        lines.append(f"{indent}└─ {key}: {{")  # 对象开始
-                    else:
-                        lines.append(f"{indent}└─ {key}: [")  # 数组开始
-                        
-                    next_prefix = f"{prefix}.{key}" if prefix else key
-                    sub_tree = self._build_tree_view(value, depth_limit, filter_pattern, next_prefix, depth + 1)
-                    if sub_tree:
-                        lines.append(sub_tree)
-                        
-                    if isinstance(value, dict):
-                        lines.append(f"{indent}  }}")  # 对象结束
-                    else:
-                        lines.append(f"{indent}  ]]")  # 数组结束
+                entries.append((f"{indent}└─ {key}", child))
+            if node.element is not None:
+                entries.append((f"{indent}[*]", node.element))
+            
+            for label, child in entries:
+                if "dict" in child.types:
+                    lines.append(f"{label}: {{" if child.key is not None else f"{label}: {child.type_name}")
+                    render(child, depth + 1)
+                    if child.key is not None:
+                        lines.append(f"{indent}  }}")
+                elif "list" in child.types:
+                    lines.append(f"{label}: [ ({self._array_note(child)})")
+                    render(child, depth + 1)
+                    lines.append(f"{indent}  ]")
                 else:
                     # 显示简单值的类型和概述
-                    value_preview = str(value)
-                    if len(value_preview) > 30:
-                        value_preview = value_preview[:27] + "..."
-                    lines.append(f"{indent}└─ {key}: {value_preview} ({type(value).__name__})")
-        
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                if i >= 3 and len(data) > 4:  # 仅显示前3项和最后1项
-                    if i == 3:
-                        lines.append(f"{indent}│ ... ({len(data)-4} more items) ...")
-                    if i < len(data) - 1:
-                        continue
-                        
-                if isinstance(item, (dict, list)):
-                    lines.append(f"{indent}[{i}]: {type(item).__name__}")
-                    next_prefix = f"{prefix}[{i}]"
-                    sub_tree = self._build_tree_view(item, depth_limit, filter_pattern, next_prefix, depth + 1)
-                    if sub_tree:
-                        lines.append(sub_tree)
-                else:
-                    # 显示简单值
-                    value_preview = str(item)
-                    if len(value_preview) > 30:
-                        value_preview = value_preview[:27] + "..."
-                    lines.append(f"{indent}[{i}]: {value_preview} ({type(item).__name__})")
+                    lines.append(f"{label}: {child.preview} ({child.type_name})")
         
+        render(index.root, 0)
         return "\n".join(lines)
     
-    def _build_path_list(self, data: Any, depth_limit: int, filter_pattern: str) -> str:
-        """构建路径列表"""
-        paths = []
-        
-        def collect_paths(obj, current_path="", current_depth=0):
-            if current_depth >= depth_limit:
-                return
-                
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    # 过滤匹配
-                    if filter_pattern and filter_pattern.lower() not in key.lower():
-                        continue
-                        
-                    path = f"{current_path}.{key}" if current_path else key
-                    
-                    if isinstance(value, (dict, list)):
-                        collect_paths(value, path, current_depth + 1)
-                    else:
-                        # 显示完整路径和值类型
-                        value_type = type(value).__name__
-                        paths.append(f"{path} ({value_type})")
-            
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    if i >= 5:  # 数组限制显示前5项
-                        paths.append(f"{current_path}[...] (省略{len(obj)-5}项)")
-                        break
-                        
-                    path = f"{current_path}[{i}]"
-                    if isinstance(item, (dict, list)):
-                        collect_paths(item, path, current_depth + 1)
-                    else:
-                        value_type = type(item).__name__
-                        paths.append(f"{path} ({value_type})")
+    def _build_path_list(self, index: ShapeIndex, depth_limit: int, filter_pattern: str) -> str:
+        """构建路径列表 (数组元素写作 [*]，可直接用于路径表达式)"""
+        pattern = filter_pattern.lower()
+        keep = (lambda key: pattern in key.lower()) if pattern else None
         
-        collect_paths(data)
+        paths = []
+        for node, parts, _ in index.walk(depth_limit, keep):
+            if node.is_leaf:
+                # 显示完整路径和值类型
+                paths.append(f"{format_path(parts)} ({node.type_name})")
+            elif "list" in node.types:
+                paths.append(f"{format_path(parts)} (list, {self._array_note(node)})")
         
         if not paths:
             return "未找到匹配的路径"
             
         return "\n".join(paths)
     
-    def _suggest_paths(self, data: Any, depth_limit: int, filter_pattern: str) -> str:
+    def _suggest_paths(self, index: ShapeIndex, depth_limit: int, filter_pattern: str) -> str:
         """构建推荐路径"""
-        # 收集所有可能路径
-        all_paths = []
+        pattern = filter_pattern.lower()
         
-        def collect_interesting_paths(obj, current_path="", current_depth=0):
-            if current_depth >= depth_limit:
-                return
-                
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    path = f"{current_path}.{key}" if current_path else key
-                    
-                    # 收集"有趣"的终端路径（字符串/数字/布尔等）
-                    if not isinstance(value, (dict, list)):
-                        # 过滤匹配
-                        if not filter_pattern or filter_pattern.lower() in key.lower():
-                            path_info = {
-                                "path": path,
-                                "type": type(value).__name__,
-                                "key": key,
-                                "preview": str(value)[:30] + ("..." if len(str(value)) > 30 else ""),
-                                "depth": current_depth,
-                                "interesting": self._is_interesting_key(key)
-                            }
-                            all_paths.append(path_info)
-                    else:
-                        collect_interesting_paths(value, path, current_depth + 1)
-            
-            elif isinstance(obj, list) and len(obj) > 0:
-                # 收集数组中第一个元素的路径示例
-                path = f"{current_path}[0]"
-                if isinstance(obj[0], (dict, list)):
-                    collect_interesting_paths(obj[0], path, current_depth + 1)
-                else:
-                    all_paths.append({
-                        "path": path,
-                        "type": type(obj[0]).__name__,
-                        "key": "[0]",
-                        "preview": str(obj[0])[:30] + ("..." if len(str(obj[0])) > 30 else ""),
-                        "depth": current_depth,
-                        "interesting": False
-                    })
-        
-        collect_interesting_paths(data)
+        # 收集"有趣"的终端路径（字符串/数字/布尔等），数组取第一个元素作为路径示例
+        candidates = []
+        for order, (node, parts, depth) in enumerate(index.walk(depth_limit)):
+            if not node.is_leaf:
+                continue
+            if node.key is not None and pattern and pattern not in node.key.lower():
+                continue
+            interesting = node.key is not None and self._is_interesting_key(node.key)
+            candidates.append((not interesting, depth, order, format_path(parts, "[0]"), node))
         
         # 如果未找到路径
-        if not all_paths:
+        if not candidates:
             return "未找到推荐路径"
         
-        # 进行排序：有趣的路径优先，其次是浅层路径
-        sorted_paths = sorted(all_paths, key=lambda x: (-x["interesting"], x["depth"]))
+        # 有趣的路径优先，其次是浅层路径；只取前10条，不对全部路径排序
+        top = heapq.nsmallest(10, candidates)
         
         lines = ["🔍 推荐路径:"]
         
-        for i, path_info in enumerate(sorted_paths[:10]):  # 只展示前10条
-            icon = "⭐" if path_info["interesting"] else "•"
-            lines.append(f"{icon} {path_info['path']}\n  → {path_info['preview']} ({path_info['type']})")
+        for not_interesting, _, _, path, node in top:
+            icon = "•" if not_interesting else "⭐"
+            lines.append(f"{icon} {path}\n  → {node.preview} ({node.type_name})")
         
-        if len(sorted_paths) > 10:
-            lines.append(f"... 还有 {len(sorted_paths)-10} 条路径 ...")
+        if len(candidates) > 10:
+            lines.append(f"... 还有 {len(candidates)-10} 条路径 ...")
             
         return "\n".join(lines)
     
+    def _build_schema_view(self, schema: SchemaNode, depth_limit: int, filter_pattern: str,
+                           sample_rate: float) -> str:
+        """构建合并结构：数组元素合并为 [*]，列出键的类型分布、是否必需与长度范围"""
+        pattern = filter_pattern.lower()
+        header = "📐 合并结构"
+        if sample_rate < 1:
+            header += f" (抽样率 {sample_rate:.1%})"
+        lines = [header + ":", f"(根) {self._describe_schema(schema)}"]
+        
+        def render(node: SchemaNode, depth: int):
+            if depth >= depth_limit:
+                return
+            indent = "  " * depth
+            for key, child in node.properties.items():
+                if pattern and pattern not in key.lower():
+                    continue
+                if node.is_required(key):
+                    presence = "必需"
+                else:
+                    presence = f"可选 {child.count}/{node.object_count}"
+                lines.append(f"{indent}└─ {key}: {self._describe_schema(child)}  {presence}")
+                render(child, depth + 1)
+            if node.items is not None:
+                lines.append(f"{indent}[*]: {self._describe_schema(node.items)}")
+                render(node.items, depth + 1)
+        
+        render(schema, 0)
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _describe_schema(node: SchemaNode) -> str:
+        """类型分布与长度范围，如 "integer 50% | null 50%" / "array  长度 1-5 (抽样 10/100)\""""
+        frequencies = node.type_frequencies()
+        if len(frequencies) == 1:
+            text = frequencies[0][0]
+        else:
+            text = " | ".join(f"{name} {ratio:.0%}" for name, ratio in frequencies)
+        
+        ranges = []
+        if node.min_items is not None:
+            ranges.append((node.min_items, node.max_items))
+        if node.min_length is not None:
+            ranges.append((node.min_length, node.max_length))
+        for low, high in ranges:
+            text += f"  长度 {low}" if low == high else f"  长度 {low}-{high}"
+        if node.sampled_items < node.total_items:
+            text += f" (抽样 {node.sampled_items}/{node.total_items})"
+        return text
+    
     def _is_interesting_key(self, key: str) -> bool:
         """判断键名是否"有趣"（为推荐排序用）"""
         interesting_patterns = [
@@ -330,11 +498,15 @@ class PIP_JSON_Path_Builder:
 # 节点映射
 NODE_CLASS_MAPPINGS = {
     "PIP_JSON_Extractor_Pro": PIP_JSON_Extractor_Pro,
+    "PIP_JSON_Batch_Extractor": PIP_JSON_Batch_Extractor,
+    "PIP_JSON_List_Extractor": PIP_JSON_List_Extractor,
     "PIP_JSON_Path_Builder": PIP_JSON_Path_Builder,
 }
 
 # 显示名称映射
 NODE_DISPLAY_NAME_MAPPINGS = {
     "PIP_JSON_Extractor_Pro": "PIP JSON提取-Pro", 
+    "PIP_JSON_Batch_Extractor": "PIP JSON批量提取",
+    "PIP_JSON_List_Extractor": "PIP JSON列表提取",
     "PIP_JSON_Path_Builder": "PIP JSON路径分析",
 }
@@ -0,0 +1,12 @@
+"""测试公共设置
+
+插件目录名不是合法的Python包名，与基准脚本一样以固定名称加载整个包 (benchmarks/common.py)。
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from common import load_package  # noqa: E402
+
+load_package()
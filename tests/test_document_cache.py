@@ -0,0 +1,80 @@
+import gc
+import sys
+
+from pip_json_pro.utils import json_extractor
+from pip_json_pro.utils.json_extractor import DOCUMENT_CACHE, parse_json_cached
+
+
+def test_identity_index_holds_no_strings():
+    text = "".join(['{"a": [1, 2, 3], ', '"b": "x"}'])
+    data = parse_json_cached(text)
+    assert parse_json_cached(text) is data
+    assert all(isinstance(key, str) for key in json_extractor._IDENTITY_INDEX.values())
+    assert json_extractor._identity_key(text) is not None
+
+
+def test_text_counts_toward_limit():
+    DOCUMENT_CACHE.clear()
+    text = "".join(['{"value": ', '"' + "x" * 10000 + '"}'])
+    parse_json_cached(text)
+    assert DOCUMENT_CACHE.stats()["bytes"] >= sys.getsizeof(text) * 2
+
+
+def test_evicted_identity_is_not_trusted():
+    text = "".join(['{"c": ', '1}'])
+    parse_json_cached(text)
+    DOCUMENT_CACHE.clear()
+    gc.collect()
+    assert json_extractor._identity_key(text) is None
+
+
+def test_key_index_released_with_document():
+    from pip_json_pro.utils.key_index import _INDEX_CACHE, get_key_index
+
+    DOCUMENT_CACHE.clear()
+    text = "".join(['{"alpha": {"beta": ', '1}}'])
+    data = parse_json_cached(text)
+    assert get_key_index(data) is get_key_index(data)
+    assert len(_INDEX_CACHE.cache) == 1
+    DOCUMENT_CACHE.clear()
+    assert len(_INDEX_CACHE.cache) == 0
+
+
+def test_key_index_not_cached_for_uncached_data():
+    from pip_json_pro.utils.key_index import _INDEX_CACHE, get_key_index
+
+    data = {"alpha": 1}
+    get_key_index(data)
+    assert _INDEX_CACHE.get(data) is None
+
+
+def test_eviction_releases_derived_entries():
+    from pip_json_pro.utils.key_index import _INDEX_CACHE, get_key_index
+
+    DOCUMENT_CACHE.clear()
+    for i in range(DOCUMENT_CACHE.max_entries + 5):
+        get_key_index(parse_json_cached(f'{{"key{i}": {i}}}'))
+    assert len(_INDEX_CACHE.cache) <= len(DOCUMENT_CACHE)
+
+
+def test_shape_index_released_with_document():
+    from pip_json_pro.utils.shape_index import _INDEX_CACHE, get_shape_index
+
+    DOCUMENT_CACHE.clear()
+    data = parse_json_cached("".join(['{"items": [{"a": 1}, ', '{"a": 2}]}']))
+    assert get_shape_index(data) is get_shape_index(data)
+    assert len(_INDEX_CACHE.cache) == 1
+    DOCUMENT_CACHE.clear()
+    assert len(_INDEX_CACHE.cache) == 0
+
+
+def test_schema_released_with_document():
+    from pip_json_pro.utils.schema_inference import _SCHEMA_CACHE, infer_schema
+
+    DOCUMENT_CACHE.clear()
+    data = parse_json_cached("".join(['[{"a": 1}, ', '{"a": "x", "b": null}]']))
+    assert infer_schema(data, 1.0) is infer_schema(data, 1.0)
+    assert infer_schema(data, 0.5) is not infer_schema(data, 1.0)
+    assert len(_SCHEMA_CACHE.cache) == 2
+    DOCUMENT_CACHE.clear()
+    assert len(_SCHEMA_CACHE.cache) == 0
@@ -0,0 +1,28 @@
+import json
+import random
+import struct
+
+import pytest
+
+from pip_json_pro.utils import json_backend
+
+
+_FLOATS = [1e16, 1.7976931348623157e308, 1e-7, -2.5e-10, 1e-05, 0.000015, -0.00001, 0.0001, 1e15,
+           9999999999999998.0, 123456789012345680.0, 5e-324, 0.1, -0.0]
+
+
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("value", _FLOATS)
+def test_float_matches_json_dumps(value, sort_keys):
+    text = json.dumps({"z": value, "a": [value, {"v": value}], "s": "1e5 0.00001"})
+    data, native = json_backend.loads_native(text)
+    expected = json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    assert json_backend.dumps(data, 2, sort_keys, native=native) == expected
+
+
+def test_random_floats_match_json_dumps():
+    rng = random.Random(0)
+    values = [struct.unpack("d", struct.pack("Q", rng.getrandbits(64)))[0] for _ in range(2000)]
+    values += [rng.uniform(-1e-3, 1e-3) for _ in range(2000)]
+    data, native = json_backend.loads_native(json.dumps([v for v in values if v == v and abs(v) != float("inf")]))
+    assert json_backend.dumps(data, 2, native=native) == json.dumps(data, indent=2, ensure_ascii=False)
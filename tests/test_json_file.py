@@ -0,0 +1,39 @@
+import pytest
+
+from pip_json_pro.utils.json_file import MappedJSONFile, read_selected_json
+from pip_json_pro.utils.json_locator import STRATEGIES, locate_json
+
+
+_SAMPLES = [
+    '说明文字 {"a": "括号 } 在字符串中"} 中间 [1, 2, 3] 结尾 {"b": {"c": [true]}}',
+    '前言\n```json\n{"name": "测试", "v": 1}\n```\n以及 {"other": 2}',
+    '```python\nx = {"ignored": 1}\n```\n{"real": "值"}',
+    '﻿  {"bom": true}  ',
+    '截断的输出 {"a": [1, 2',
+    "没有JSON的文本",
+]
+
+
+@pytest.mark.parametrize("text", _SAMPLES)
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_select_matches_text_locate(tmp_path, text, strategy):
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.encode("utf-8"))
+    stripped = text.lstrip("﻿").strip()
+    assert read_selected_json(str(path), strategy) == (locate_json(stripped, strategy) or stripped)
+
+
+def test_select_decodes_only_candidate(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(("前言" * 1000 + '{"a": 1}' + "后记" * 1000).encode("utf-8"))
+    with MappedJSONFile(str(path)) as mapped:
+        assert mapped.select_text() == '{"a": 1}'
+        assert mapped.encoding == "utf-8"
+
+
+def test_select_non_utf8_falls_back_to_text(tmp_path):
+    # GBK 双字节字符的第二个字节可能是括号 ("亄" 为 0x81 0x7b)
+    text = '亄亄 说明 {"名字": "值"}'
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.encode("gbk"))
+    assert read_selected_json(str(path)) == '{"名字": "值"}'
@@ -0,0 +1,41 @@
+import pytest
+
+from pip_json_pro.utils.json_guided_repair import GuidedRepairError, guided_repair
+
+
+@pytest.mark.parametrize("text", [
+    "The answer is 42.",
+    "[1,2] [3]",
+    '{"a": 1} {"b": 2}',
+    '{"a": 1} trailing words',
+    "hello",
+    "{'msg': 'it''s ok'}",
+    '{"a": 1, "b"}',
+    '{"name": "Bob", "age": }',
+    '["a""b"]',
+])
+def test_no_dropped_or_invented_content(text):
+    with pytest.raises(GuidedRepairError):
+        guided_repair(text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1}\n```', {"a": 1}),
+    ('[1, 2]\n```\n', [1, 2]),
+    ("{a: 1, b: [x, 2]}", {"a": 1, "b": ["x", 2]}),
+    ("{'a': 'b',}", {"a": "b"}),
+    ('{"a": [1, 2', {"a": [1, 2]}),
+    # 截断处只有键名的成员被删除，不补 null (与词法修复一致)
+    ('{"key":', {}),
+    ('{"a": 1, "b"', {"a": 1}),
+    ('{"a": 1, "ke', {"a": 1}),
+    ('{"a": [1, {"b":', {"a": [1, {}]}),
+    ('{"a" 1}', {"a": 1}),
+    ('{"a": "say "hi" now"}', {"a": 'say "hi" now'}),
+    ("[true1, nullb]", ["true1", "nullb"]),
+    ("True", True),
+])
+def test_local_fixes(text, expected):
+    data, fixes = guided_repair(text)
+    assert data == expected
+    assert fixes
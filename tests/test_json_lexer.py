@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from pip_json_pro.utils.json_lexer import IncrementalRepairSession, lexer_repair_text, repair_json_lexer
+
+
+@pytest.mark.parametrize("text", [
+    "hello world",
+    '{"a":1}{"b":2}',
+    "[1,2] [3]",
+    "The answer is 42.",
+])
+def test_trailing_content_fails(text):
+    assert repair_json_lexer(text) == (text, False)
+
+
+@pytest.mark.parametrize("text", [
+    "{'a': 'it''s'}",
+    '{"a":"x", oops}',
+    '{"a": }',
+    '{"a"}',
+    '{"a", "b": 1}',
+    '["a""b"]',
+    '{"tags": ["a"b, "c"]}',
+])
+def test_no_invented_members(text):
+    assert repair_json_lexer(text) == (text, False)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("{'a': 1, 'b': True,}", {"a": 1, "b": True}),
+    ('{"a": 1 b: 2}', {"a": 1, "b": 2}),
+    ("[1 2 3]", [1, 2, 3]),
+    ('{"a":1} // done', {"a": 1}),
+    ("key: value, k2: 3", {"key": "value", "k2": 3}),
+    ('{"a": 1, "b":', {"a": 1}),
+    ('{"a": [1, {"b": "x', {"a": [1, {"b": "x"}]}),
+])
+def test_repairs(text, expected):
+    repaired, success = repair_json_lexer(text)
+    assert success
+    assert json.loads(repaired) == expected
+
+
+def test_session_matches_one_shot():
+    text = "{'a': 1, 'b': [True, None], 'c': 'it\\'s', 'd': {'e': 2,},"
+    session = IncrementalRepairSession()
+    for start in range(0, len(text), 3):
+        session.feed(text[start:start + 3])
+    assert json.loads(session.close()) == json.loads(lexer_repair_text(text))
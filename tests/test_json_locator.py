@@ -0,0 +1,32 @@
+import pytest
+
+from pip_json_pro.core.json_processor import JSONProcessor
+from pip_json_pro.utils.json_locator import find_documents
+
+
+@pytest.mark.parametrize("text", [
+    "[[1, 2],\n [3, 4]]",
+    '{\n  "a": [1, 2],\n  "b": {"c": 3}\n}',
+    '[{"a": 1},\n {"b": 2}]',
+])
+def test_pretty_printed_document_is_not_jsonl(text):
+    doc_format, spans = find_documents(text)
+    assert doc_format != "jsonl"
+    assert len(spans) == 1
+
+
+@pytest.mark.parametrize("text, count", [
+    ('{"a": 1}\n{"b": 2}\n[3]', 3),
+    ("{'a': True,}\n{\"b\": \"]\"} // note", 2),
+])
+def test_jsonl(text, count):
+    doc_format, spans = find_documents(text)
+    assert doc_format == "jsonl"
+    assert len(spans) == count
+
+
+def test_process_many_keeps_nested_array_whole():
+    results, merged, success, _ = JSONProcessor(use_cache=False).process_many(
+        "[[1, 2],\n [3, 4]]", pretty_print=False)
+    assert success
+    assert merged == "[[[1, 2], [3, 4]]]"
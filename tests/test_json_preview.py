@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from pip_json_pro.utils.json_preview import stream_format
+from pip_json_pro.utils.json_stream import JSONEventParser, JSONStreamError
+
+
+@pytest.mark.parametrize("text", [
+    '{"a": [1, 2.5, -0.0, 1e400, -1E400, 1e-400, 12345678901234567890], "b": {"c": null, "d": true}}',
+    '[NaN, Infinity, -Infinity, 0.1, 1E5, 3.0]',
+    '{"s": "中文\\n\\"q\\"", "e": {}, "l": []}',
+    '1E400',
+])
+@pytest.mark.parametrize("indent", [2, None])
+def test_matches_json_dumps(text, indent):
+    expected = json.dumps(json.loads(text), indent=indent, ensure_ascii=False)
+    assert stream_format(text, indent, 0, 0) == (expected, False)
+
+
+def test_non_finite_literals():
+    events = list(JSONEventParser("[NaN, -Infinity, Infinity]").events())
+    values = [value for event, value in events if event == "value"]
+    assert values[0] != values[0]
+    assert values[1:] == [float("-inf"), float("inf")]
+
+
+@pytest.mark.parametrize("text", ["[nan]", "[-NaN]", "[infinity]", "[Infinityx]"])
+def test_invalid_literals(text):
+    with pytest.raises(JSONStreamError):
+        stream_format(text, 2, 0, 0)
+
+
+def test_duplicate_keys_kept_in_order():
+    assert stream_format('{"a": 1, "a": 2}', None, 0, 0) == ('{"a": 1, "a": 2}', False)
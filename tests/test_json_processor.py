@@ -0,0 +1,38 @@
+import pytest
+
+from pip_json_pro.core.json_processor import JSONProcessor
+
+
+class _NoWorker:
+    """小输入不应发送到修复子进程"""
+
+    def call(self, *args, **kwargs):
+        raise AssertionError("small input sent to the tier worker")
+
+
+def test_small_inputs_run_in_process(monkeypatch):
+    monkeypatch.setattr(JSONProcessor, "tier_worker", _NoWorker())
+    processor = JSONProcessor(use_cache=False, tier_order="fixed")
+    _, success, debug = processor.process('{"a": 1, "b"} in process', repair_level=3)
+    assert not success
+    attempted = [entry for entry in debug["tiers"] if entry["tier"] in ("jsoncomment", "demjson", "ast_eval")]
+    assert attempted and all(entry["status"] != "skipped" and "worker" not in entry for entry in attempted)
+
+
+def test_result_cache_keyed_by_budgets():
+    text = "{'budget_key': True,}"
+    skip_all = {tier: {"max_size": 0} for tier in
+                ("guided_repair", "lexer_repair", "jsoncomment", "demjson", "ast_eval")}
+    tight = JSONProcessor(tier_budgets=skip_all)
+    default = JSONProcessor()
+
+    assert tight.process(text, repair_level=3)[1] is False
+    result, success, debug = default.process(text, repair_level=3)
+    assert success and debug["cache"]["status"] == "miss"
+    assert tight.process(text, repair_level=3)[1] is False
+    assert default.process(text, repair_level=3)[2]["cache"]["status"] == "hit"
+
+
+@pytest.mark.parametrize("budgets", [None, {"demjson": {"timeout": 2.0}}])
+def test_budget_key_is_stable(budgets):
+    assert JSONProcessor(tier_budgets=budgets)._budget_key == JSONProcessor(tier_budgets=budgets)._budget_key
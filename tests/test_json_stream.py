@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from pip_json_pro.utils import json_extractor
+from pip_json_pro.utils.json_extractor import DOCUMENT_CACHE, extract_by_expression, extract_from_file
+from pip_json_pro.utils.json_path import compile_path
+from pip_json_pro.utils.json_stream import stream_extract
+
+
+_DUPLICATES = '{"a": {"b": 1, "x": [1, 2]}, "c": 0, "a": {"b": 2, "b": {"d": "last"}}, "z": {"a": 3}}'
+
+
+@pytest.mark.parametrize("expression", ["a", "a.b", "a.b.d", "c", "z.a", "a.x", "missing"])
+@pytest.mark.parametrize("source", [str, lambda text: io.BytesIO(text.encode()), io.StringIO])
+def test_duplicate_keys_match_json_loads(expression, source):
+    steps = compile_path(expression)
+    data = json.loads(_DUPLICATES)
+    for kind, arg in steps:
+        data = data.get(arg, KeyError) if isinstance(data, dict) else KeyError
+    expected = (None, False) if data is KeyError else (data, True)
+    # 小块读取时重复的值跨越多个块
+    assert stream_extract(source(_DUPLICATES), steps, chunk_size=4) == expected
+
+
+def test_lookup_memoizes_position(monkeypatch):
+    DOCUMENT_CACHE.clear()
+    monkeypatch.setattr(json_extractor, "STREAMING_THRESHOLD", 0)
+    calls = []
+    locate = json_extractor.stream_locate
+    monkeypatch.setattr(json_extractor, "stream_locate", lambda text, steps: calls.append(steps) or locate(text, steps))
+    text = "".join([_DUPLICATES])
+    for _ in range(3):
+        value, success, debug_info = extract_by_expression(text, "a.b")
+        assert (value, success, debug_info.get("streaming")) == ({"d": "last"}, True, True)
+    assert extract_by_expression(text, "missing")[1] is False
+    assert extract_by_expression(text, "missing")[1] is False
+    assert len(calls) == 2
+
+
+def test_lookup_uses_parsed_document(monkeypatch):
+    monkeypatch.setattr(json_extractor, "STREAMING_THRESHOLD", 0)
+    text = "".join([_DUPLICATES, " "])
+    json_extractor.parse_json_cached(text)
+    copy = "".join([_DUPLICATES, " "])
+    value, success, debug_info = extract_by_expression(copy, "z.a")
+    assert (value, success, "streaming" in debug_info) == (3, True, False)
+
+
+def test_file_lookup_takes_last_duplicate(tmp_path):
+    path = tmp_path / "dup.json"
+    path.write_text('说明 {"k": {"v": "前"}, "pad": "' + "填充" * 50000 + '", "k": {"v": "后"}}', encoding="utf-8")
+    result, success, _ = extract_from_file(str(path), ["k", "v"])
+    assert (result, success) == ("后", True)
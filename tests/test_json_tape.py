@@ -0,0 +1,62 @@
+import json
+import math
+
+import pytest
+
+from pip_json_pro.utils import json_extractor
+from pip_json_pro.utils.cache_utils import DOCUMENT_CACHE
+from pip_json_pro.utils.json_tape import TapeError, build_tape, to_python
+
+
+def _same(a, b):
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b and type(a) is type(b)
+
+
+@pytest.mark.parametrize("text", [
+    '{"a": NaN, "b": [Infinity, -Infinity, 1.5, -2, 1e400], "c": {"d": null}}',
+    '[NaN]',
+    '-Infinity',
+    '{"s": "x\\"y", "t": true, "f": false}',
+])
+def test_matches_json_loads(text):
+    expected = json.loads(text)
+    tape = build_tape(text)
+    root = tape.root()
+    assert _same(to_python(root), expected)
+    if isinstance(expected, dict):
+        assert _same({key: to_python(value) for key, value in root.items()}, expected)
+    elif isinstance(expected, list):
+        assert _same([to_python(value) for value in root], expected)
+
+
+@pytest.mark.parametrize("text", ["[nan]", "[-NaN]", "[Infinityx]", "[NaN 1]", "[infinity]"])
+def test_invalid_literals(text):
+    with pytest.raises(TapeError):
+        build_tape(text)
+
+
+def test_tape_off_by_default(monkeypatch):
+    monkeypatch.delenv(json_extractor.TAPE_THRESHOLD_ENV, raising=False)
+    assert json_extractor._tape_threshold() == 0
+    monkeypatch.setattr(json_extractor, "TAPE_THRESHOLD", 0)
+    assert isinstance(json_extractor.parse_json_cached('{"opt_in": [1, 2]}'), dict)
+
+
+def test_opt_in_threshold(monkeypatch):
+    monkeypatch.setenv(json_extractor.TAPE_THRESHOLD_ENV, "8")
+    assert json_extractor._tape_threshold() == 8
+    monkeypatch.setenv(json_extractor.TAPE_THRESHOLD_ENV, "abc")
+    assert json_extractor._tape_threshold() == 0
+
+    monkeypatch.setattr(json_extractor, "TAPE_THRESHOLD", 8)
+    DOCUMENT_CACHE.clear()
+    data = json_extractor.parse_json_cached('{"value": NaN, "big": -Infinity}')
+    assert not isinstance(data, dict)
+    assert math.isnan(data["value"]) and data["big"] == float("-inf")
+    DOCUMENT_CACHE.clear()
@@ -0,0 +1,57 @@
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from pip_json_pro.utils.json_extractor import fuzzy_search
+from pip_json_pro.utils.key_index import KeyIndex
+
+
+def brute_force(data, target, min_similarity, top_k):
+    """逐个键计算相似度 (原实现)，按相似度降序、同分按出现顺序"""
+    results = []
+
+    def visit(node, prefix):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                path = f"{prefix}.{key}" if prefix else key
+                similarity = SequenceMatcher(None, target.lower(), key.lower()).ratio()
+                if similarity >= min_similarity:
+                    results.append((path, value, similarity))
+                if isinstance(value, (dict, list)):
+                    visit(value, path)
+        elif isinstance(node, list):
+            for i, item in enumerate(node):
+                if isinstance(item, (dict, list)):
+                    visit(item, f"{prefix}[{i}]" if prefix else f"[{i}]")
+
+    visit(data, "")
+    return sorted(results, key=lambda x: x[2], reverse=True)[:top_k]
+
+
+def random_key(rng):
+    return "".join(rng.choice("abcdeABC_x") for _ in range(rng.randint(0, 9)))
+
+
+def random_document(rng, depth=0):
+    if depth > 2 or rng.random() < 0.3:
+        return rng.randint(0, 9)
+    if rng.random() < 0.3:
+        return [random_document(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {random_key(rng): random_document(rng, depth + 1) for _ in range(rng.randint(0, 6))}
+
+
+def test_boundary_match():
+    assert fuzzy_search({"badc": 1}, "abcd", 0.5) == [("badc", 1, 0.5)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    data = {"root": [random_document(rng) for _ in range(10)]}
+    index = KeyIndex(data)
+    for _ in range(30):
+        target = random_key(rng)
+        min_similarity = rng.choice((0.0, 0.3, 0.5, 0.6, 2 / 3, 0.8, 1.0))
+        top_k = rng.choice((1, 5, 1000))
+        assert index.search(target, min_similarity, top_k) == brute_force(data, target, min_similarity, top_k)
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from pip_json_pro.core.json_processor import JSONProcessor
+from pip_json_pro.core.repair_dispatcher import ADAPTIVE, FIXED, RepairDispatcher
+
+
+def _primed_dispatcher(text: str) -> RepairDispatcher:
+    """运行统计显示按错误位置修复总是失败且很慢，jsoncomment/demjson/ast_eval 很快且总是成功"""
+    dispatcher = RepairDispatcher()
+    features = dispatcher.scan(text)
+    for _ in range(50):
+        dispatcher.record(features, "guided_repair", False, 500.0, 1024)
+        dispatcher.record(features, "lexer_repair", True, 0.1, 1024)
+        for tier in ("jsoncomment", "demjson", "ast_eval"):
+            dispatcher.record(features, tier, True, 0.001, 1024)
+    return dispatcher
+
+
+def test_order_moves_only_interchangeable_tiers():
+    dispatcher = _primed_dispatcher('{"a": 1')
+    tiers = ["guided_repair", "lexer_repair", "jsoncomment", "demjson", "ast_eval"]
+    features = dispatcher.scan('{"a": 1')
+    assert dispatcher.order(features, tiers, FIXED) == tiers
+    assert dispatcher.order(features, tiers, ADAPTIVE) == [
+        "lexer_repair", "guided_repair", "jsoncomment", "demjson", "ast_eval"]
+
+
+@pytest.mark.parametrize("text", [
+    '{"key":',
+    '{"a": 1, "b"',
+    '{"a": [1, {"b":',
+    "{'a': 'it\\'s', b: True, // c\n 'd': [1, 2.5, None,]}",
+    '{"tags": ["a", ,"b"], "x": {"y": null}}',
+    '{"n": [1, trueN, nullb]}',
+    '{"tags": ["a"b, "c"]}',
+    '{"a": "say "hi" now"}',
+])
+def test_adaptive_matches_fixed(monkeypatch, text):
+    monkeypatch.setattr(JSONProcessor, "dispatcher", _primed_dispatcher(text))
+    results = {}
+    for mode in (FIXED, ADAPTIVE):
+        processor = JSONProcessor(use_cache=False, tier_order=mode)
+        result, success, debug = processor.process(text, repair_level=3, pretty_print=False)
+        results[mode] = (json.loads(result) if success else None, success)
+    assert results[ADAPTIVE] == results[FIXED]
@@ -0,0 +1,212 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def content_hash(text: str) -> str:
+    """计算文本内容的快速哈希 (blake2b-128)"""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def input_fingerprint(inputs: Dict[str, Any]) -> str:
+    """计算节点输入的指纹，供ComfyUI的IS_CHANGED使用"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for name in sorted(inputs):
+        value = inputs[name]
+        hasher.update(name.encode("utf-8"))
+        hasher.update(b"\x00")
+        if isinstance(value, str):
+            hasher.update(value.encode("utf-8", "surrogatepass"))
+        else:
+            hasher.update(repr(value).encode("utf-8", "surrogatepass"))
+        hasher.update(b"\x01")
+    return hasher.hexdigest()
+
+
+class BoundedLRUCache:
+    """按条目数与总字节数双重限制的线程安全LRU缓存"""
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取缓存，命中时移动到最近使用位置"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """读取缓存，不计入命中统计也不改变淘汰顺序"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> bool:
+        """写入缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            size: 该条目的估算字节数
+
+        Returns:
+            是否写入 (超过总字节上限的单个条目不会被缓存)
+        """
+        if size > self.max_bytes or self.max_entries <= 0:
+            return False
+        removed = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+                removed.append((key, old[0]))
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                evicted_key, (evicted, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+                removed.append((evicted_key, evicted))
+        if removed:
+            self._removed(removed)
+        return True
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """删除键满足条件的条目，返回删除的条目数"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            removed = [(key, self._entries.pop(key)) for key in keys]
+            for _, (_, size) in removed:
+                self.total_bytes -= size
+        if removed:
+            self._removed([(key, value) for key, (value, _) in removed])
+        return len(removed)
+
+    def clear(self):
+        """清空缓存 (保留统计计数)"""
+        with self._lock:
+            removed = [(key, value) for key, (value, _) in self._entries.items()]
+            self._entries.clear()
+            self.total_bytes = 0
+        if removed:
+            self._removed(removed)
+
+    def _removed(self, entries: List[Tuple[Hashable, Any]]):
+        """条目被淘汰、替换或删除后调用 (不持有锁)，子类可以据此释放关联的数据"""
+
+    def stats(self) -> Dict[str, int]:
+        """返回缓存统计信息"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+class DocumentCache(BoundedLRUCache):
+    """已解析文档缓存，条目为 (原文本, 解析结果)
+
+    依附于文档的派生缓存 (DerivedCache，如键索引、结构索引) 只为仍在本缓存中的文档保存条目，
+    文档被淘汰时一并删除。派生数据往往引用文档中的值，这样文档不会在本缓存的字节上限之外被持有。
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 512 * 1024 * 1024):
+        super().__init__(max_entries, max_bytes)
+        # 解析结果的对象身份 -> 缓存键 (不持有对象，解析结果由缓存条目持有)
+        self._documents: Dict[int, Hashable] = {}
+        self._documents_lock = threading.Lock()
+        self._derived: List["DerivedCache"] = []
+
+    def put(self, key: Hashable, value: Tuple[str, Any], size: int) -> bool:
+        data = value[1]
+        with self._documents_lock:
+            self._documents[id(data)] = key
+        if super().put(key, value, size):
+            return True
+        self._forget(data)
+        return False
+
+    def holds(self, data: Any) -> bool:
+        """该解析结果对象是否在缓存中"""
+        key = self._documents.get(id(data))
+        if key is None:
+            return False
+        entry = self.peek(key)
+        return entry is not None and entry[1] is data
+
+    def _forget(self, data: Any):
+        """文档已不在缓存中时删除其身份记录与派生数据"""
+        if self.holds(data):
+            # 同一文档重新写入
+            return
+        with self._documents_lock:
+            self._documents.pop(id(data), None)
+        for derived in self._derived:
+            derived.discard(data)
+
+    def _removed(self, entries: List[Tuple[Hashable, Any]]):
+        for _, (_, data) in entries:
+            self._forget(data)
+
+
+class DerivedCache:
+    """依附于文档缓存的派生数据缓存 (按文档对象身份与变体索引)
+
+    只缓存仍在文档缓存中的文档的派生数据，文档被淘汰时对应条目一并删除；
+    不在文档缓存中的对象 (调用方自己的数据) 不缓存，每次重新计算。
+    """
+
+    def __init__(self, documents: DocumentCache, max_entries: int = 32, max_bytes: int = 64 * 1024 * 1024):
+        self.documents = documents
+        self.cache = BoundedLRUCache(max_entries, max_bytes)
+        documents._derived.append(self)
+
+    def get(self, data: Any, variant: Hashable = None) -> Optional[Any]:
+        """读取文档的派生数据"""
+        if not self.documents.holds(data):
+            return None
+        return self.cache.get((id(data), variant))
+
+    def put(self, data: Any, value: Any, size: int, variant: Hashable = None):
+        """写入文档的派生数据 (文档不在文档缓存中时不写入)"""
+        if not self.documents.holds(data):
+            return
+        self.cache.put((id(data), variant), value, size)
+        if not self.documents.holds(data):
+            # 写入期间文档被淘汰
+            self.discard(data)
+
+    def discard(self, data: Any):
+        """删除文档的全部派生数据"""
+        document_id = id(data)
+        self.cache.discard(lambda key: key[0] == document_id)
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats()
+
+
+# 进程内共享的已解析文档缓存：多个提取/分析节点读取同一段文本时只解析一次
+# 原文本同样计入字节上限
+DOCUMENT_CACHE = DocumentCache(max_entries=32, max_bytes=512 * 1024 * 1024)
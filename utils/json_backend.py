@@ -0,0 +1,79 @@
+import json
+import re
+from typing import Any, Optional, Tuple
+
+
+# 可选的高速JSON编解码库，按顺序选择第一个已安装的；都没有时使用标准库 json
+#   orjson: 解析与 indent=2 的序列化 (支持按键排序)
+#   ujson:  只用于解析 (序列化的换行与转义规则与标准库不同)
+# 高速库处理不了的情况一律回退到标准库，结果与原来完全一致：
+#   解析失败 (NaN/Infinity、超出double范围的数字、非法JSON等) 时由标准库重新解析，错误信息也来自标准库；
+#   紧凑输出与 indent 不为2 时直接使用标准库 (标准库的紧凑输出在逗号和冒号后带空格)。
+BACKEND = "json"
+_fast_loads = None
+_orjson = None
+
+try:
+    import orjson as _orjson
+    BACKEND = "orjson"
+    _fast_loads = _orjson.loads
+except ImportError:
+    try:
+        import ujson
+        BACKEND = "ujson"
+        _fast_loads = ujson.loads
+    except ImportError:
+        pass
+
+# 超出64位整数范围的整数会被高速库转为浮点数丢失精度，含有19位以上连续数字时交给标准库。
+# 先把UTF-8字节中的数字映射为"0"、其他字节映射为空格，再查找19个连续的"0"，比正则搜索快一个数量级
+_DIGIT_TABLE = bytes(0x30 if 0x30 <= i <= 0x39 else 0x20 for i in range(256))
+_LONG_DIGITS = b"0" * 19
+# 标准库在十进制指数小于-4或不小于16时用指数写法 (1e-05、1e+16)，orjson对同样的数写成 0.00001、1e16。
+# orjson输出中出现数字后的e或"0.0000"时交给标准库重新序列化；字符串里的同样内容只会多一次回退，结果不变
+_EXPONENT_RE = re.compile(rb"[0-9][eE]|0\.0000")
+
+
+def loads_native(text: str) -> Tuple[Any, bool]:
+    """解析JSON文本
+
+    Returns:
+        解析结果, 是否由高速库解析 (此时结果中不含NaN/Infinity，可以用高速库序列化)
+
+    Raises:
+        json.JSONDecodeError: 非法JSON (与标准库相同)
+    """
+    if _fast_loads is not None:
+        encoded = text.encode("utf-8", "surrogatepass")
+        if encoded.translate(_DIGIT_TABLE).find(_LONG_DIGITS) == -1:
+            try:
+                return _fast_loads(encoded), True
+            except (ValueError, OverflowError):
+                pass
+    return json.loads(text), False
+
+
+def loads(text: str) -> Any:
+    """解析JSON文本，高速库失败时回退到标准库"""
+    return loads_native(text)[0]
+
+
+def dumps(obj: Any, indent: Optional[int] = None, sort_keys: bool = False, native: bool = False) -> str:
+    """序列化为JSON字符串，输出与 json.dumps(obj, indent=indent, ensure_ascii=False, sort_keys=sort_keys) 相同
+
+    Args:
+        native: obj 来自 loads_native 的高速解析结果。只有这种对象保证不含NaN/Infinity
+                (orjson会把它们写成null)，才使用orjson序列化；含有需要指数写法的浮点数时回退到标准库
+    """
+    if native and _orjson is not None and indent == 2:
+        option = _orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        try:
+            encoded = _orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+        else:
+            if _EXPONENT_RE.search(encoded) is None:
+                return encoded.decode("utf-8")
+    return json.dumps(obj, indent=indent, ensure_ascii=False, sort_keys=sort_keys)
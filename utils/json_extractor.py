@@ -1,44 +1,160 @@
 import json
-import re
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Tuple, Union, Optional
 from difflib import SequenceMatcher
 
+from .cache_utils import DOCUMENT_CACHE, BoundedLRUCache, content_hash
+from .json_backend import loads
+from .json_file import MappedJSONFile
+from .key_index import get_key_index
+from .json_path import compile_path, compile_segment, evaluate, evaluate_many, get_by_steps, is_definite
+from .json_stream import STREAMING_THRESHOLD, JSONStreamError, is_streamable, read_value_at, stream_extract, stream_locate
+from .json_tape import OBJECT_TYPES, TapeError, build_tape, to_python
+from .metrics import StageTimer
+
+
+# 解析后的Python对象约为原文本的5-10倍内存，用于估算缓存占用
+_PARSED_SIZE_FACTOR = 6
+
+# 超过该长度的文本解析为紧凑磁带 (约为json.loads内存的四分之一，但构建慢得多)，0表示不使用
+# 默认关闭，内存紧张时通过环境变量开启 (单位为字符数，如 67108864)
+TAPE_THRESHOLD_ENV = "PIP_JSON_TAPE_THRESHOLD"
+
+
+def _tape_threshold() -> int:
+    try:
+        return max(int(os.environ.get(TAPE_THRESHOLD_ENV, "0").strip() or 0), 0)
+    except ValueError:
+        return 0
+
+
+TAPE_THRESHOLD = _tape_threshold()
+
+# 最近见过的字符串对象身份 -> 内容哈希，同一对象再次传入时无需重新计算哈希
+# 只保存 id 不持有字符串，命中时用缓存条目中的原文本确认是同一对象
+_IDENTITY_INDEX: "OrderedDict[int, str]" = OrderedDict()
+_IDENTITY_INDEX_SIZE = 64
+_identity_lock = threading.Lock()
+
+_MISSING = object()
+
+# 流式定位结果 (文本内容哈希, 路径步骤) -> 目标值在文本中的起始位置 (路径不存在时为None)
+# 同一大文本的重复提取只从该位置读取目标值，不再从头扫描；只记录位置，每个条目很小
+_STREAM_POSITIONS = BoundedLRUCache(max_entries=1024, max_bytes=1024 * 1024)
+_STREAM_POSITION_SIZE = 256
+
 
 def parse_json_safely(json_str: str) -> Dict:
     """u5b89u5168u89e3u6790JSONu5b57u7b26u4e32"""
     try:
-        return json.loads(json_str)
+        return loads(json_str)
     except json.JSONDecodeError as e:
-        raise ValueError(f"u65e0u6548JSONu683cu5f0f: {str(e)}")
+        raise ValueError(f"无效JSON格式: {str(e)}")
 
 
-def get_by_exact_path(data: Dict, path_parts: List[str]) -> Any:
-    """u6839u636eu7cbeu786eu8defu5f84u83b7u53d6u503c"""
-    current = data
+def _identity_key(json_str: str) -> Optional[str]:
+    """同一字符串对象已在文档缓存中时返回其缓存键 (不计算哈希)，否则返回None"""
+    with _identity_lock:
+        key = _IDENTITY_INDEX.get(id(json_str))
+    if key is None:
+        return None
+    entry = DOCUMENT_CACHE.peek(key)
+    if entry is None or entry[0] is not json_str:
+        # 文档已被淘汰，或原对象已释放而 id 被其他字符串复用
+        return None
+    return key
+
+
+def _remember_identity(json_str: str, key: str):
+    """记录已缓存文档的字符串对象身份"""
+    with _identity_lock:
+        _IDENTITY_INDEX[id(json_str)] = key
+        _IDENTITY_INDEX.move_to_end(id(json_str))
+        while len(_IDENTITY_INDEX) > _IDENTITY_INDEX_SIZE:
+            _IDENTITY_INDEX.popitem(last=False)
+
+
+def _document_key(json_str: str) -> str:
+    """按字符串对象身份与内容哈希生成文档缓存键"""
+    key = _identity_key(json_str)
+    if key is None:
+        key = content_hash(json_str)
+    return key
+
+
+def parse_json_cached(json_str: str) -> Any:
+    """解析JSON字符串，结果在进程内共享缓存
     
-    for part in path_parts:
-        # u5904u7406u6570u7ec4u7d22u5f15u8bbfu95ee pattern: key[index]
-        array_match = re.match(r"(.*?)\[(\d+)\]$", part)
-        
-        if array_match:  # u6570u7ec4u8bbfu95ee
-            key, index = array_match.groups()
-            index = int(index)
-            
-            if key and key in current:
-                if isinstance(current[key], list) and 0 <= index < len(current[key]):
-                    current = current[key][index]
-                else:
-                    raise KeyError(f"u65e0u6548u7684u6570u7ec4u8bbfu95ee: {key}[{index}]")
-            else:
-                raise KeyError(f"u952eu4e0du5b58u5728: {key}")
-                
-        elif part in current:  # u666eu901au952eu8bbfu95ee
-            current = current[part]
-            
-        else:
-            raise KeyError(f"u952eu4e0du5b58u5728: {part}")
+    返回的对象会被多个节点共享，调用方不能修改它。超过 TAPE_THRESHOLD 的文本
+    返回磁带代理 (TapeObject / TapeArray)，可以像字典/列表一样只读导航，
+    用 to_python() 转换为普通对象。
+    
+    Raises:
+        ValueError: 无效JSON格式
+    """
+    key = _document_key(json_str)
+    entry = DOCUMENT_CACHE.get(key)
+    if entry is not None:
+        if entry[0] is json_str:
+            _remember_identity(json_str, key)
+        return entry[1]
     
-    return current
+    text_size = sys.getsizeof(json_str)
+    if TAPE_THRESHOLD and len(json_str) > TAPE_THRESHOLD:
+        try:
+            tape = build_tape(json_str)
+        except TapeError as e:
+            raise ValueError(str(e))
+        data = tape.root()
+        # 磁带引用原文本，额外占用条目数组
+        size = text_size + tape.nbytes
+    else:
+        data = parse_json_safely(json_str)
+        size = text_size * (_PARSED_SIZE_FACTOR + 1)
+    if DOCUMENT_CACHE.put(key, (json_str, data), size):
+        _remember_identity(json_str, key)
+    return data
+
+
+def _stream_lookup(json_str: str, steps: Tuple) -> Any:
+    """大文本按确定路径流式提取，不构建完整对象树
+
+    定位结果按内容哈希与路径记住，同一文本再次提取时直接从记住的位置读取目标值。
+    文档已在缓存中、路径不支持流式定位或文本无效时返回 _MISSING，由调用方回退到完整解析。
+
+    Returns:
+        (值, 是否找到) 或 _MISSING
+    """
+    if len(json_str) <= STREAMING_THRESHOLD or not is_streamable(steps):
+        return _MISSING
+    # 先按对象身份检查，不必计算哈希
+    if _identity_key(json_str) is not None:
+        return _MISSING
+    key = content_hash(json_str)
+    if DOCUMENT_CACHE.peek(key) is not None:
+        return _MISSING
+    pos = _STREAM_POSITIONS.get((key, steps), _MISSING)
+    try:
+        if pos is _MISSING:
+            pos = stream_locate(json_str, steps)
+            _STREAM_POSITIONS.put((key, steps), pos, _STREAM_POSITION_SIZE)
+        if pos is None:
+            return None, False
+        return read_value_at(json_str, pos), True
+    except JSONStreamError:
+        return _MISSING
+
+
+def get_by_exact_path(data: Dict, path_parts: List[str]) -> Any:
+    """根据精确路径获取值 (每级键名如 key / key[0] / key[-1] 编译后缓存)"""
+    steps = ()
+    for part in path_parts:
+        steps += compile_segment(part)
+    return get_by_steps(data, steps)
 
 
 def find_partial_match(data: Dict, target_key: str, min_similarity: float = 0.6) -> List[Tuple[str, Any, float]]:
@@ -56,32 +172,21 @@ def find_partial_match(data: Dict, target_key: str, min_similarity: float = 0.6)
     return sorted(matches, key=lambda x: x[2], reverse=True)
 
 
-def fuzzy_search(data: Any, target_key: str, prefix: str = "", results: List[Tuple[str, Any, float]] = None) -> List[Tuple[str, Any, float]]:
-    """u9012u5f52u6a21u7ccau641cu7d22u6574u4e2aJSONu4e2du7684u952e"""
-    if results is None:
-        results = []
+def fuzzy_search(data: Any, target_key: str, min_similarity: float = 0.5, top_k: int = 10) -> List[Tuple[str, Any, float]]:
+    """模糊搜索整个JSON中的键
     
-    if isinstance(data, dict):
-        # u5728u5f53u524du5c42u7ea7u4e2du67e5u627eu90e8u5206u5339u914d
-        for key, value in data.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            similarity = SequenceMatcher(None, target_key.lower(), key.lower()).ratio()
-            
-            if similarity >= 0.5:  # u76f8u4f3cu5ea6u9608u503c
-                results.append((current_path, value, similarity))
-            
-            # u9012u5f52u641cu7d22u5b50u5c42u7ea7
-            if isinstance(value, (dict, list)):
-                fuzzy_search(value, target_key, current_path, results)
-                
-    elif isinstance(data, list):
-        # u9012u5f52u641cu7d22u6570u7ec4u5143u7d20
-        for i, item in enumerate(data):
-            current_path = f"{prefix}[{i}]" if prefix else f"[{i}]"
-            if isinstance(item, (dict, list)):
-                fuzzy_search(item, target_key, current_path, results)
+    使用每个文档只构建一次的键索引，只对可能达到阈值的键计算相似度。
     
-    return sorted(results, key=lambda x: x[2], reverse=True)
+    Args:
+        data: 已解析的JSON数据
+        target_key: 目标键名
+        min_similarity: 最小相似度阈值
+        top_k: 最多返回的匹配数
+        
+    Returns:
+        [(路径, 值, 相似度), ...] 按相似度降序
+    """
+    return get_key_index(data).search(target_key, min_similarity, top_k)
 
 
 def extract_from_json(json_str: str, 
@@ -99,6 +204,19 @@ def extract_from_json(json_str: str,
     Returns:
         u63d0u53d6u7684u503c, u662fu5426u6210u529f, u8c03u8bd5u4fe1u606f
     """
+    timer = StageTimer("extractor")
+    result, success, debug_info = _extract_from_json(json_str, path, fuzzy_mode, min_similarity, timer)
+    debug_info["timings"] = timer.finish("success" if success else "failure")
+    return result, success, debug_info
+
+
+def _extract_from_json(json_str: str,
+                       path: List[str],
+                       fuzzy_mode: bool,
+                       min_similarity: float,
+                       timer: StageTimer,
+                       allow_stream: bool = True) -> Tuple[str, bool, Dict]:
+    """extract_from_json 的实现，各阶段耗时记录在 timer 中 (allow_stream为False时不再尝试流式定位)"""
     debug_info = {
         "path": path,
         "fuzzy_mode": fuzzy_mode,
@@ -106,16 +224,32 @@ def extract_from_json(json_str: str,
     }
     
     try:
-        # u89e3u6790JSON
-        data = parse_json_safely(json_str)
-        
         # u8fc7u6ee4u6389u7a7au8defu5f84u6bb5
         path = [p for p in path if p and p.strip()]
         
+        # 大文本精确匹配先尝试流式定位，找到目标值后立即停止
+        if path and not fuzzy_mode and allow_stream:
+            steps = ()
+            for part in path:
+                steps += compile_segment(part)
+            with timer.stage("stream"):
+                streamed = _stream_lookup(json_str, steps)
+            if streamed is not _MISSING and streamed[1]:
+                debug_info["matches"] = [{"path": ".".join(path), "exact": True}]
+                debug_info["streaming"] = True
+                return str(streamed[0]), True, debug_info
+        
+        # 解析JSON (多个节点共享同一份解析结果)
+        with timer.stage("parse"):
+            data = parse_json_cached(json_str)
+        
         # u6a21u7ccau641cu7d22u6a21u5f0f
         if fuzzy_mode and path:
             target_key = path[-1]  # u53d6u8defu5f84u7684u6700u540eu4e00u90e8u5206u4f5cu4e3au641cu7d22u76eeu6807
-            matches = fuzzy_search(data, target_key)
+            with timer.stage("key_index"):
+                index = get_key_index(data)
+            with timer.stage("fuzzy_score"):
+                matches = index.search(target_key, min_similarity, top_k=5)
             
             debug_info["matches"] = [
                 {"path": m[0], "similarity": f"{m[2]:.2f}"} 
@@ -133,11 +267,13 @@ def extract_from_json(json_str: str,
         elif path:  
             try:
                 # u5148u5c1du8bd5u5b8cu6574u8defu5f84u7cbeu786eu5339u914d
-                result = get_by_exact_path(data, path)
+                with timer.stage("traverse"):
+                    result = get_by_exact_path(data, path)
                 debug_info["matches"] = [{"path": ".".join(path), "exact": True}]
                 return str(result), True, debug_info
             except KeyError:
                 # u5982u679cu7cbeu786eu5339u914du5931u8d25uff0cu5c1du8bd5u90e8u5206u8defu5f84u5339u914d
+                partial_start = time.perf_counter()
                 current = data
                 remaining_path = path.copy()
                 matched_path = []
@@ -146,24 +282,18 @@ def extract_from_json(json_str: str,
                     current_key = remaining_path[0]
                     remaining_path = remaining_path[1:]
                     
-                    # u5904u7406u6570u7ec4u7d22u5f15
-                    array_match = re.match(r"(.*?)\[(\d+)\]$", current_key)
-                    if array_match:
-                        key, index = array_match.groups()
-                        index = int(index)
-                        
-                        if key in current and isinstance(current[key], list) and 0 <= index < len(current[key]):
-                            matched_path.append(current_key)
-                            current = current[key][index]
-                            continue
-                    
-                    # u76f4u63a5u952eu5339u914d
-                    if current_key in current:
+                    # 直接按键名/数组索引匹配
+                    try:
+                        current = get_by_steps(current, compile_segment(current_key))
                         matched_path.append(current_key)
-                        current = current[current_key]
+                        continue
+                    except KeyError:
+                        pass
+                    
+                    if not isinstance(current, OBJECT_TYPES):
                         continue
                     
-                    # u5982u679cu6ca1u6709u76f4u63a5u5339u914duff0cu5c1du8bd5u90e8u5206u5339u914d
+                    # 如果没有直接匹配，尝试部分匹配
                     matches = find_partial_match(current, current_key, min_similarity)
                     
                     if matches:
@@ -176,9 +306,11 @@ def extract_from_json(json_str: str,
                         matched_path.append(best_match[0])
                         current = best_match[1]
                     else:
-                        # u5982u679cu5f53u524du5c42u6ca1u6709u5339u914duff0cu8df3u8fc7u5e76u5c1du8bd5u4e0bu4e00u4e2au952e
+                        # 如果当前层没有匹配，跳过并尝试下一个键
                         continue
                         
+                timer.add("fuzzy_score", time.perf_counter() - partial_start)
+                
                 # u5982u679cu6210u529fu5339u914du4e86u81f3u5c11u4e00u90e8u5206u8defu5f84
                 if matched_path:
                     debug_info["matches"].append({"final_path": ".".join(matched_path)})
@@ -191,3 +323,228 @@ def extract_from_json(json_str: str,
     
     except Exception as e:
         return "", False, {"error": str(e)}
+
+
+def extract_by_expression(json_str: str, expression: str) -> Tuple[Any, bool, Dict]:
+    """按路径表达式从JSON中提取值
+    
+    Args:
+        json_str: JSON字符串
+        expression: 路径表达式，如 "a.b[0]", "items[*].name", "list[-3:]", "..id"
+        
+    Returns:
+        提取的值 (确定路径为单个值，否则为值列表), 是否成功, 调试信息
+    """
+    timer = StageTimer("extractor")
+    value, success, debug_info = _extract_by_expression(json_str, expression, timer)
+    debug_info["timings"] = timer.finish("success" if success else "failure")
+    return value, success, debug_info
+
+
+def _extract_by_expression(json_str: str,
+                           expression: str,
+                           timer: StageTimer,
+                           allow_stream: bool = True) -> Tuple[Any, bool, Dict]:
+    """extract_by_expression 的实现，各阶段耗时记录在 timer 中 (allow_stream为False时不再尝试流式定位)"""
+    debug_info = {
+        "path": [expression],
+        "expression": expression,
+        "fuzzy_mode": False,
+        "matches": []
+    }
+    
+    try:
+        steps = compile_path(expression)
+        
+        streamed = _MISSING
+        if allow_stream:
+            with timer.stage("stream"):
+                streamed = _stream_lookup(json_str, steps)
+        if streamed is not _MISSING:
+            debug_info["streaming"] = True
+            if not streamed[1]:
+                debug_info["error"] = f"路径未匹配: {expression}"
+                return None, False, debug_info
+            debug_info["matches"] = [{"path": expression, "exact": True}]
+            return streamed[0], True, debug_info
+        
+        with timer.stage("parse"):
+            data = parse_json_cached(json_str)
+        with timer.stage("traverse"):
+            results = evaluate(data, steps)
+        
+        debug_info["matches"] = [{"path": path, "exact": True} for path, _ in results[:5]]
+        if len(results) > 5:
+            debug_info["match_count"] = len(results)
+        
+        if not results:
+            debug_info["error"] = f"路径未匹配: {expression}"
+            return None, False, debug_info
+        if is_definite(steps):
+            return to_python(results[0][1]), True, debug_info
+        return [to_python(value) for _, value in results], True, debug_info
+    
+    except Exception as e:
+        return None, False, {"error": str(e)}
+
+
+def _stream_file_lookup(mapped: MappedJSONFile, steps: Tuple) -> Any:
+    """在映射的文件上流式定位确定路径，只解码读到目标为止的内容
+
+    路径不支持流式定位、文件中没有JSON或内容无效时返回 _MISSING，由调用方回退到解码整个JSON。
+
+    Returns:
+        (值, 是否找到) 或 _MISSING
+    """
+    if not mapped.located or not is_streamable(steps):
+        return _MISSING
+    try:
+        return stream_extract(mapped.reader(), steps)
+    except ValueError:
+        # JSONStreamError 或 UTF-8 解码错误
+        return _MISSING
+
+
+def extract_from_file(file_path: str,
+                      path: List[str],
+                      fuzzy_mode: bool = False,
+                      min_similarity: float = 0.6) -> Tuple[str, bool, Dict]:
+    """从JSON文件中提取值
+
+    文件以只读方式内存映射。精确路径直接在映射的字节上流式定位，峰值内存与文件大小无关；
+    模糊搜索、路径不存在时的部分匹配等需要完整文档的情况才解码定位到的JSON内容，
+    之后与 extract_from_json 相同。
+
+    Returns:
+        提取的值, 是否成功, 调试信息
+    """
+    timer = StageTimer("extractor")
+    try:
+        with MappedJSONFile(file_path) as mapped:
+            result, success, debug_info = _extract_from_file(mapped, path, fuzzy_mode, min_similarity, timer)
+    except (OSError, ValueError) as e:
+        result, success, debug_info = "", False, {"error": str(e)}
+    debug_info["file"] = file_path
+    debug_info["timings"] = timer.finish("success" if success else "failure")
+    return result, success, debug_info
+
+
+def _extract_from_file(mapped: MappedJSONFile,
+                       path: List[str],
+                       fuzzy_mode: bool,
+                       min_similarity: float,
+                       timer: StageTimer) -> Tuple[str, bool, Dict]:
+    """extract_from_file 的实现"""
+    path = [p for p in path if p and p.strip()]
+    if path and not fuzzy_mode:
+        steps = ()
+        for part in path:
+            steps += compile_segment(part)
+        with timer.stage("stream"):
+            streamed = _stream_file_lookup(mapped, steps)
+        if streamed is not _MISSING and streamed[1]:
+            debug_info = {"path": path, "fuzzy_mode": False, "streaming": True,
+                          "matches": [{"path": ".".join(path), "exact": True}]}
+            return str(streamed[0]), True, debug_info
+
+    with timer.stage("read"):
+        json_str = mapped.text()
+    return _extract_from_json(json_str, path, fuzzy_mode, min_similarity, timer, allow_stream=False)
+
+
+def extract_by_expression_from_file(file_path: str, expression: str) -> Tuple[Any, bool, Dict]:
+    """按路径表达式从JSON文件中提取值
+
+    确定路径在映射的字节上流式定位；通配符、切片、递归下降等解码定位到的JSON内容后求值。
+
+    Returns:
+        提取的值 (确定路径为单个值，否则为值列表), 是否成功, 调试信息
+    """
+    timer = StageTimer("extractor")
+    try:
+        with MappedJSONFile(file_path) as mapped:
+            value, success, debug_info = _extract_by_expression_from_file(mapped, expression, timer)
+    except (OSError, ValueError) as e:
+        value, success, debug_info = None, False, {"error": str(e)}
+    debug_info["file"] = file_path
+    debug_info["timings"] = timer.finish("success" if success else "failure")
+    return value, success, debug_info
+
+
+def _extract_by_expression_from_file(mapped: MappedJSONFile,
+                                     expression: str,
+                                     timer: StageTimer) -> Tuple[Any, bool, Dict]:
+    """extract_by_expression_from_file 的实现"""
+    steps = compile_path(expression)
+    with timer.stage("stream"):
+        streamed = _stream_file_lookup(mapped, steps)
+    if streamed is not _MISSING:
+        debug_info = {"path": [expression], "expression": expression, "fuzzy_mode": False, "streaming": True,
+                      "matches": []}
+        if not streamed[1]:
+            debug_info["error"] = f"路径未匹配: {expression}"
+            return None, False, debug_info
+        debug_info["matches"] = [{"path": expression, "exact": True}]
+        return streamed[0], True, debug_info
+
+    with timer.stage("read"):
+        json_str = mapped.text()
+    return _extract_by_expression(json_str, expression, timer, allow_stream=False)
+
+
+def extract_many_by_expression(json_str: str, expressions: List[str]) -> Tuple[List[Tuple[Any, bool]], Dict]:
+    """一次遍历提取多条路径
+    
+    Args:
+        json_str: JSON字符串
+        expressions: 路径表达式列表
+        
+    Returns:
+        与expressions一一对应的 (值, 是否成功) 列表, 调试信息
+    """
+    debug_info = {
+        "batch": True,
+        "results": []
+    }
+    timer = StageTimer("extractor_batch")
+    
+    try:
+        with timer.stage("parse"):
+            data = parse_json_cached(json_str)
+    except ValueError as e:
+        debug_info["error"] = str(e)
+        debug_info["results"] = [{"path": expression, "success": False} for expression in expressions]
+        debug_info["timings"] = timer.finish("failure")
+        return [(None, False)] * len(expressions), debug_info
+    
+    # 编译所有路径，无效表达式单独记录
+    compiled = []
+    errors = {}
+    for position, expression in enumerate(expressions):
+        try:
+            compiled.append((position, compile_path(expression)))
+        except ValueError as e:
+            errors[position] = str(e)
+    
+    with timer.stage("traverse"):
+        matches = evaluate_many(data, [steps for _, steps in compiled])
+    
+    values: List[Tuple[Any, bool]] = [(None, False)] * len(expressions)
+    for (position, steps), results in zip(compiled, matches):
+        if results:
+            if is_definite(steps):
+                value = to_python(results[0][1])
+            else:
+                value = [to_python(value) for _, value in results]
+            values[position] = (value, True)
+        else:
+            errors[position] = "路径未匹配"
+    
+    for position, expression in enumerate(expressions):
+        entry = {"path": expression, "success": values[position][1]}
+        if position in errors:
+            entry["error"] = errors[position]
+        debug_info["results"].append(entry)
+    
+    debug_info["timings"] = timer.finish("success" if not errors else "failure")
+    return values, debug_info
@@ -0,0 +1,40 @@
+import re
+from typing import Tuple
+
+
+# 输入特征：每种特征用一次C实现的正则搜索检测，找到第一个匹配即停止。
+# 这些只是启发式判断 (字符串内容也可能命中)，用于决定修复方法的尝试顺序，不影响修复结果的正确性。
+COMMENTS = "comments"
+SINGLE_QUOTES = "single_quotes"
+UNQUOTED_KEYS = "unquoted_keys"
+PYTHON_LITERALS = "python_literals"
+TRUNCATED = "truncated"
+
+FEATURES = (COMMENTS, SINGLE_QUOTES, UNQUOTED_KEYS, PYTHON_LITERALS, TRUNCATED)
+
+_FEATURE_PATTERNS = (
+    # 排除 "http://" 之类字符串中的双斜杠
+    (COMMENTS, re.compile(r'(?<![:\w"])//|/\*')),
+    (SINGLE_QUOTES, re.compile(r"[\[{,:]\s*'")),
+    (UNQUOTED_KEYS, re.compile(r'[{,]\s*[A-Za-z_$][\w$]*\s*:')),
+    (PYTHON_LITERALS, re.compile(r'[\[:,]\s*(?:True|False|None)\b')),
+)
+
+
+def scan_features(text: str) -> Tuple[str, ...]:
+    """扫描输入的格式特征
+
+    Returns:
+        命中的特征名元组 (按 FEATURES 顺序)，合法JSON通常为空元组
+    """
+    found = []
+    for name, pattern in _FEATURE_PATTERNS:
+        if pattern.search(text):
+            found.append(name)
+
+    # 括号数量不匹配或以未闭合的值结尾，视为被截断
+    stripped = text.rstrip()
+    if (text.count("{") != text.count("}") or text.count("[") != text.count("]")
+            or (stripped and stripped[-1] not in "}]\"'0123456789el")):
+        found.append(TRUNCATED)
+    return tuple(found)
@@ -0,0 +1,207 @@
+import codecs
+import mmap
+import os
+from typing import Optional
+
+from .json_locator import FIRST, JSONCandidate, find_candidates, locate_bytes, locate_json, select_candidate
+from .json_utils import decode_bytes, sniff_wide_encoding
+
+
+_WHITESPACE = b" \t\r\n"
+
+# 流式读取时每读过这么多字节释放一次已读的页
+_RELEASE_BYTES = 8 * 1024 * 1024
+
+# 校验编码时每次解码的字节数 (解码结果随即丢弃)
+_VALIDATE_CHUNK = 8 * 1024 * 1024
+
+
+def normalize_path(path: str) -> str:
+    """去掉首尾空白与引号 (从资源管理器复制的路径常带引号)，展开 ~"""
+    path = path.strip().strip('"\'').strip()
+    return os.path.expanduser(path)
+
+
+def file_stamp(path: str) -> str:
+    """文件的大小与修改时间，用于在文件内容变化时让节点重新执行"""
+    try:
+        stat = os.stat(normalize_path(path))
+    except OSError:
+        return "missing"
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def with_file_stamp(inputs: dict, name: str = "json_file") -> dict:
+    """在节点输入中加入文件戳 (文件路径输入非空时)，供 input_fingerprint 使用"""
+    path = inputs.get(name)
+    if not path or not path.strip():
+        return inputs
+    return dict(inputs, **{f"{name}_stamp": file_stamp(path)})
+
+
+class _SpanReader:
+    """映射中某个范围的类文件读取接口 (JSONEventParser 按块读取并增量解码)
+
+    读过的页很少再访问 (回退到重复键名时由系统重新读入)，每读过 _RELEASE_BYTES 就通知系统丢弃 (支持 madvise 的平台)，
+    顺序扫描整个文件时常驻内存不随读取位置增长。
+    """
+
+    def __init__(self, buffer, start: int, end: int):
+        self._buffer = buffer
+        self._pos = start
+        self._end = end
+        self._released = start - start % mmap.PAGESIZE
+        self._can_release = isinstance(buffer, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED")
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or self._pos + size > self._end:
+            size = self._end - self._pos
+        chunk = self._buffer[self._pos:self._pos + size]
+        self._pos += size
+        if self._can_release and self._pos - self._released >= _RELEASE_BYTES:
+            release_end = self._pos - self._pos % mmap.PAGESIZE
+            self._buffer.madvise(mmap.MADV_DONTNEED, self._released, release_end - self._released)
+            self._released = release_end
+        return chunk
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, pos: int):
+        """回到映射中的某个位置 (流式定位遇到重复键名时回退到最后一个匹配的值)"""
+        self._pos = pos
+        self._released = min(self._released, pos - pos % mmap.PAGESIZE)
+
+
+class MappedJSONFile:
+    """以只读内存映射方式打开的JSON文件
+
+    文件内容由操作系统按需分页读入，不复制到Python内存。打开时在映射的字节上
+    定位JSON内容 (locate_bytes)，之后可以按块流式读取该范围，或只解码该范围为文本。
+    UTF-16/32 文件的字节不能直接定位，只能整体解码。用完需要关闭 (支持 with 语句)。
+    """
+
+    def __init__(self, path: str):
+        self.path = normalize_path(path)
+        if not os.path.isfile(self.path):
+            raise ValueError(f"文件不存在: {self.path}")
+        self._file = open(self.path, "rb")
+        try:
+            self.size = os.fstat(self._file.fileno()).st_size
+            # 空文件不能映射
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        # 解码文本时实际使用的编码
+        self.encoding: Optional[str] = None
+        self.wide = self._map is not None and sniff_wide_encoding(self._map) is not None
+        self.candidate: Optional[JSONCandidate] = None
+        if self._map is not None and not self.wide:
+            self.candidate = locate_bytes(self._map)
+
+    @property
+    def located(self) -> bool:
+        """文件中找到了JSON内容"""
+        return self.candidate is not None
+
+    def reader(self) -> _SpanReader:
+        """定位到的JSON内容的流式读取接口"""
+        if self.candidate is None:
+            return _SpanReader(b"", 0, 0)
+        return _SpanReader(self._map, self.candidate.start, self.candidate.end)
+
+    def text(self, whole: bool = False) -> str:
+        """把定位到的JSON内容 (whole为True时为整个文件，去掉BOM与首尾空白) 解码为文本
+
+        编码按 decode_bytes 识别 (BOM、严格UTF-8、对有限样本做统计检测)，结果记录在 encoding 中。
+        """
+        if self._map is None:
+            return ""
+        if self.wide:
+            # 解码后在文本上定位
+            with memoryview(self._map) as view:
+                text, self.encoding = decode_bytes(view)
+            return text.strip() if whole else locate_json(text) or ""
+        if whole:
+            # 首尾空白在字节上去掉，解码后的文本不需要再 strip() (strip 会复制整个文本)
+            start = 3 if self._map[:3] == b"\xef\xbb\xbf" else 0
+            end = self.size
+            while start < end and self._map[start] in _WHITESPACE:
+                start += 1
+            while end > start and self._map[end - 1] in _WHITESPACE:
+                end -= 1
+        elif self.candidate is None:
+            return ""
+        else:
+            start, end = self.candidate.start, self.candidate.end
+        # 通过memoryview直接解码映射中的范围，不先复制为bytes
+        with memoryview(self._map) as view, view[start:end] as span:
+            text, self.encoding = decode_bytes(span)
+        return text
+
+    def _is_utf8(self) -> bool:
+        """整个文件是否为合法的UTF-8 (分块校验，不保留解码结果)"""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            with memoryview(self._map) as view:
+                for start in range(0, self.size, _VALIDATE_CHUNK):
+                    with view[start:start + _VALIDATE_CHUNK] as chunk:
+                        decoder.decode(chunk)
+            decoder.decode(b"", True)
+        except UnicodeDecodeError:
+            return False
+        return True
+
+    def select_text(self, strategy: str = FIRST) -> str:
+        """按定位策略选出文件中的一个JSON块，只解码该块
+
+        在映射的字节上扫描全部候选块 (find_candidates) 并选择，结果与解码整个文件后
+        在文本上选择相同。其他编码 (GBK 等的双字节字符中可能含有括号字节) 与 UTF-16/32
+        文件不能在字节上扫描，整体解码后在文本上选择。没有候选块时返回去掉首尾空白的整个文件。
+        """
+        if self._map is None:
+            return ""
+        if self.wide or not self._is_utf8():
+            text = self.text(whole=True)
+            return locate_json(text, strategy) or text
+        candidate = select_candidate(self._map, find_candidates(self._map), strategy)
+        if candidate is None:
+            return self.text(whole=True)
+        with memoryview(self._map) as view, view[candidate.start:candidate.end] as span:
+            text, self.encoding = decode_bytes(span)
+        return text.strip()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "MappedJSONFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_selected_json(path: str, strategy: str = FIRST) -> str:
+    """按定位策略读取文件中的一个JSON块，只解码该块 (见 MappedJSONFile.select_text)
+
+    Raises:
+        ValueError: 文件不存在
+        OSError: 文件无法读取
+    """
+    with MappedJSONFile(path) as mapped:
+        return mapped.select_text(strategy)
+
+
+def read_json_file(path: str, whole: bool = False) -> str:
+    """读取文件中的JSON内容为文本 (只解码定位到的范围，whole为True时解码整个文件)
+
+    Raises:
+        ValueError: 文件不存在
+        OSError: 文件无法读取
+    """
+    with MappedJSONFile(path) as mapped:
+        return mapped.text(whole)
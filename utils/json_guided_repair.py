@@ -0,0 +1,249 @@
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .json_lexer import _CTRL_RE, _WORD_VALUES, _convert_single_quoted, _escape_control, _fix_double_quoted
+
+
+# 默认最多修复次数；接近合法的文档通常只有几处错误，超过上限时交给后续的整体修复方法
+DEFAULT_MAX_ITERATIONS = 50
+
+_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?(?:\*/|\Z)', re.DOTALL)
+_SINGLE_QUOTED_RE = re.compile(r"'[^'\\]*(?:\\.[^'\\]*)*(?:'|\Z)", re.DOTALL)
+_IDENTIFIER_RE = re.compile(r'(?:[^\W\d]|\$)[\w$]*')
+# 括号计数时跳过字符串 (包括到文本末尾仍未闭合的字符串)
+_BRACKET_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|[{}\[\]]', re.DOTALL)
+_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+_VALUE_START = frozenset('"\'{[-')
+# 第一个值之后允许丢弃的内容：空白与代码块围栏的残留
+_FENCE_RESIDUE_RE = re.compile(r'(?:\s*`{3,}\s*)*\Z')
+
+
+class GuidedRepairError(ValueError):
+    """无法根据错误位置完成修复"""
+
+
+def _open_brackets(text: str, end: int) -> List[str]:
+    """text[:end] 中尚未闭合的括号 (由外到内)"""
+    stack: List[str] = []
+    for match in _BRACKET_RE.finditer(text, 0, end):
+        token = match.group()
+        if token in "{[":
+            stack.append(token)
+        elif token in "}]":
+            if stack and _CLOSERS[stack[-1]] == token:
+                stack.pop()
+    return stack
+
+
+def _string_before(text: str, end: int) -> int:
+    """text[:end] 以一个完整的字符串结尾时返回该字符串的起始位置，否则返回-1"""
+    start = -1
+    for match in _BRACKET_RE.finditer(text, 0, end):
+        if match.end() == end and match.group()[0] == '"':
+            start = match.start()
+    if start >= 0:
+        string = _STRING_RE.match(text, start, end)
+        if string and string.end() == end:
+            return start
+    return -1
+
+
+def _previous_significant(text: str, pos: int) -> Tuple[int, str]:
+    """pos之前最近的非空白字符及其位置，没有时返回 (-1, "")"""
+    index = pos - 1
+    while index >= 0 and text[index].isspace():
+        index -= 1
+    return index, text[index] if index >= 0 else ""
+
+
+class GuidedRepair:
+    """根据 json.loads 报告的错误位置逐处修复
+
+    每次解析失败时读取 JSONDecodeError 的位置与信息，只在该位置做一处局部修改
+    (插入逗号、为键名加引号、转义控制字符、闭合字符串等) 后重新解析，直到成功或达到次数上限。
+    只有少数几处错误的文档只需要几次C实现的完整解析，远快于逐个token的整体修复。
+    """
+
+    def __init__(self, max_iterations: int = DEFAULT_MAX_ITERATIONS):
+        self.max_iterations = max_iterations
+        # 已应用的修复 [{"pos": 位置, "fix": 说明}, ...]
+        self.fixes: List[Dict[str, Any]] = []
+        self.iterations = 0
+
+    def loads(self, text: str) -> Any:
+        """修复并解析文本
+
+        Raises:
+            GuidedRepairError: 遇到无法局部修复的错误或超过次数上限
+        """
+        self.fixes = []
+        self.iterations = 0
+        while True:
+            self.iterations += 1
+            try:
+                return json.loads(text)
+            except json.JSONDecodeError as e:
+                if self.iterations > self.max_iterations:
+                    raise GuidedRepairError(f"超过修复次数上限 ({self.max_iterations})")
+                fixed = self._fix(text, e.msg, e.pos)
+                if fixed is None:
+                    raise GuidedRepairError(f"无法修复: {e.msg} (位置 {e.pos})")
+                text = fixed
+
+    def _apply(self, text: str, start: int, end: int, replacement: str, fix: str) -> str:
+        self.fixes.append({"pos": start, "fix": fix})
+        return text[:start] + replacement + text[end:]
+
+    def _escaped_inside(self, text: str, end: int) -> bool:
+        """以 end 结尾的字符串中是否已经转义过未转义的内部引号"""
+        start = _string_before(text, end)
+        return start >= 0 and any(fix["fix"] == "转义引号" and start < fix["pos"] < end for fix in self.fixes)
+
+    def _drop_member(self, text: str, key_end: int) -> Optional[str]:
+        """删除末尾只有键名 (可能带冒号) 的不完整成员，与词法修复一致，不补全缺失的值"""
+        start = _string_before(text, key_end)
+        if start < 0:
+            return None
+        index, prev = _previous_significant(text, start)
+        if prev == ",":
+            start = index
+        elif prev != "{":
+            return None
+        return self._apply(text, start, len(text), "", "删除不完整的成员")
+
+    def _close(self, text: str) -> Optional[str]:
+        """文本在值中间被截断：去掉末尾的逗号与不完整的成员，补全括号"""
+        index, prev = _previous_significant(text, len(text))
+        if prev == ",":
+            return self._apply(text, index, index + 1, "", "删除末尾逗号")
+        if prev == ":":
+            return self._drop_member(text, _previous_significant(text, index)[0] + 1)
+        stack = _open_brackets(text, len(text))
+        if not stack:
+            return None
+        closers = "".join(_CLOSERS[b] for b in reversed(stack))
+        return self._apply(text, len(text), len(text), closers, f"补全括号 {closers}")
+
+    def _fix(self, text: str, msg: str, pos: int) -> Optional[str]:
+        """针对一处错误返回修改后的文本，无法修复时返回None"""
+        char = text[pos] if pos < len(text) else ""
+
+        # 任何位置上的注释都直接删除
+        if char == "/":
+            comment = _COMMENT_RE.match(text, pos)
+            if comment:
+                return self._apply(text, pos, comment.end(), "", "删除注释")
+
+        if msg.startswith("Unterminated string"):
+            return self._apply(text, pos, len(text), _fix_double_quoted(text[pos:]), "闭合字符串")
+
+        if msg.startswith("Invalid control character"):
+            return self._apply(text, pos, pos + 1, _CTRL_RE.sub(_escape_control, char), "转义控制字符")
+
+        if msg.startswith("Invalid \\escape") or msg.startswith("Invalid \\uXXXX"):
+            backslash = pos if char == "\\" else pos - 1
+            if text.startswith("\\'", backslash):
+                return self._apply(text, backslash, backslash + 1, "", "删除多余的转义")
+            return self._apply(text, backslash, backslash, "\\", "转义反斜杠")
+
+        if msg.startswith("Extra data"):
+            # 只删除围栏残留；其余内容 (第二个值、说明文字) 删除会丢失数据，交给后续方法处理
+            if _FENCE_RESIDUE_RE.match(text, pos):
+                return self._apply(text, pos, len(text), "", "删除多余内容")
+            return None
+
+        if msg.startswith("Expecting ':' delimiter"):
+            index, prev = _previous_significant(text, pos)
+            if prev != '"' or _string_before(text, index + 1) < 0:
+                return None
+            if not char:
+                return self._drop_member(text, index + 1)
+            return self._apply(text, pos, pos, ":", "插入冒号")
+
+        if not char:
+            return self._close(text)
+
+        if msg.startswith("Expecting ',' delimiter"):
+            if char in "}]":
+                # 括号不匹配：先闭合内层的括号
+                stack = _open_brackets(text, pos)
+                if stack:
+                    closer = _CLOSERS[stack[-1]]
+                    return self._apply(text, pos, pos, closer, f"补全括号 {closer}")
+                return None
+            if char == "." and text[pos - 1].isdigit():
+                return self._apply(text, pos + 1, pos + 1, "0", "补全数字")
+            index, prev = _previous_significant(text, pos)
+            if prev == '"' and (index == pos - 1 or self._escaped_inside(text, index + 1)):
+                # 紧跟在字符串后的内容说明字符串中间有未转义的引号 (如 'it''s')，插入逗号会把它拆成两个值；
+                # 已转义过内部引号的字符串之后的内容同样属于这个字符串 (如 "say "hi" now" 中的 now)
+                quote = text.find('"', pos)
+                segment = text[pos:quote]
+                if char.isalnum() and quote != -1 and "\n" not in segment and ":" not in segment:
+                    # 到下一个引号之间是同一行的普通文字 (没有冒号)：转义提前结束字符串的引号
+                    return self._apply(text, index, index, "\\", "转义引号")
+                return None
+            if (prev.isalnum() or prev == "$") and index == pos - 1 and (char.isalnum() or char == "$"):
+                # 关键字后紧跟其他字符 (如 trueN)：整个词是一个裸字符串，与词法修复一致
+                word_start = index
+                while word_start > 0 and (text[word_start - 1].isalnum() or text[word_start - 1] in "_$"):
+                    word_start -= 1
+                identifier = _IDENTIFIER_RE.match(text, word_start)
+                if identifier and identifier.end() > pos:
+                    return self._apply(text, word_start, identifier.end(), f'"{identifier.group()}"', "为字符串值加引号")
+            if char in _VALUE_START or char.isalnum() or char == "$":
+                return self._apply(text, pos, pos, ",", "插入逗号")
+            return None
+
+        if msg.startswith("Expecting property name"):
+            if char == "}":
+                index, prev = _previous_significant(text, pos)
+                if prev == ",":
+                    return self._apply(text, index, index + 1, "", "删除尾逗号")
+                return None
+            if char == "'":
+                token = _SINGLE_QUOTED_RE.match(text, pos).group()
+                return self._apply(text, pos, pos + len(token), _convert_single_quoted(token), "键名改为双引号")
+            identifier = _IDENTIFIER_RE.match(text, pos)
+            if identifier:
+                return self._apply(text, pos, identifier.end(), f'"{identifier.group()}"', "为键名加引号")
+            return None
+
+        if msg.startswith("Expecting value"):
+            if char in "]}":
+                index, prev = _previous_significant(text, pos)
+                if prev == ",":
+                    return self._apply(text, index, index + 1, "", "删除尾逗号")
+                return None
+            if char == "'":
+                token = _SINGLE_QUOTED_RE.match(text, pos).group()
+                return self._apply(text, pos, pos + len(token), _convert_single_quoted(token), "字符串改为双引号")
+            if char == "." and text[pos + 1:pos + 2].isdigit():
+                return self._apply(text, pos, pos, "0", "补全数字")
+            identifier = _IDENTIFIER_RE.match(text, pos)
+            if identifier:
+                word = identifier.group()
+                if word in _WORD_VALUES:
+                    return self._apply(text, pos, identifier.end(), _WORD_VALUES[word], f"{word} 改为 {_WORD_VALUES[word]}")
+                if not _open_brackets(text, pos):
+                    # 顶层的裸词是普通文字而不是JSON，不当作字符串值
+                    return None
+                return self._apply(text, pos, identifier.end(), f'"{word}"', "为字符串值加引号")
+            return None
+
+        return None
+
+
+def guided_repair(text: str, max_iterations: int = DEFAULT_MAX_ITERATIONS) -> Tuple[Any, List[Dict[str, Any]]]:
+    """根据错误位置逐处修复并解析
+
+    Returns:
+        解析结果, 已应用的修复列表
+
+    Raises:
+        GuidedRepairError: 无法修复
+    """
+    repair = GuidedRepair(max_iterations)
+    return repair.loads(text), repair.fixes
@@ -0,0 +1,440 @@
+import re
+import json
+from typing import Tuple, List, Optional
+
+
+# 单次扫描的词法规则，字符串与注释作为整体token匹配，因此内部内容不会被误改
+_TOKEN_RE = re.compile(r'''
+  \s*(?:
+    (?P<dq>"[^"\\]*(?:\\.[^"\\]*)*(?:"|\\?\Z))
+  | (?P<sq>'[^'\\]*(?:\\.[^'\\]*)*(?:'|\\?\Z))
+  | (?P<lc>//[^\n]*)
+  | (?P<bc>/\*.*?(?:\*/|\Z))
+  | (?P<punct>[{}\[\]:,])
+  | (?P<num>-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))
+  | (?P<word>-?Infinity|(?:[^\W\d]|\$)[\w$]*)
+  | (?P<other>.)
+  | (?P<ws>\Z)
+  )
+''', re.VERBOSE | re.DOTALL)
+
+# 已合法的JSON片段 (严格字符串/数字/关键字)，可整段原样复制
+_STRICT_STRING = r'"[^"\\\x00-\x1f]*(?:\\["\\/bfnrtu][^"\\\x00-\x1f]*)*"'
+_STRICT_SCALAR = (r'(?:' + _STRICT_STRING +
+                  r'|-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?(?![\w.])|true\b|false\b|null\b)')
+_MEMBER_RUN_RE = re.compile(r'(?:\s*' + _STRICT_STRING + r'\s*:\s*' + _STRICT_SCALAR + r'\s*,)+')
+_VALUE_RUN_RE = re.compile(r'(?:\s*' + _STRICT_SCALAR + r'\s*,)+')
+
+_CTRL_RE = re.compile(r'[\x00-\x1f]')
+_SQ_BODY_RE = re.compile(r'\\.|"', re.DOTALL)
+
+_CTRL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+# 关键字映射 (包含Python字面量)
+_WORD_VALUES = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+    "undefined": "null",
+}
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# 位于文本末尾时可能被截断、需要等待后续数据的token类型
+_OPEN_ENDED = frozenset(("dq", "sq", "lc", "bc", "num", "word", "other"))
+# 数字/关键字之后若只剩这些字符，说明token可能尚未结束 (如 "-3" 之后的 "e")
+_CONTINUATION_RE = re.compile(r'[\w$.+\-]*')
+# 截断在 \u 转义中间的不完整序列
+_PARTIAL_UNICODE_RE = re.compile(r'\\u[0-9a-fA-F]{0,3}\Z')
+
+# 解析状态
+_KEY = 0      # 对象中等待键
+_COLON = 1    # 键之后等待冒号
+_VALUE = 2    # 等待值
+_AFTER = 3    # 值之后等待逗号或闭合
+_DONE = 4     # 顶层值已完成
+
+
+def _escape_control(match) -> str:
+    char = match.group()
+    return _CTRL_ESCAPES.get(char) or "\\u%04x" % ord(char)
+
+
+def _fix_double_quoted(token: str) -> str:
+    """修复双引号字符串中的控制字符、非法转义和未闭合引号"""
+    if len(token) == 1 or token[-1] != '"' or _is_escaped_end(token):
+        # 未闭合的字符串 (到达文本末尾)
+        if _is_escaped_end(token + '"'):
+            token = token[:-1]
+        partial = _PARTIAL_UNICODE_RE.search(token)
+        if partial and _is_escaped_end(token[:partial.start() + 1] + '"'):
+            token = token[:partial.start()]
+        token += '"'
+    if "\\'" in token:
+        token = token.replace("\\'", "'")
+    if _CTRL_RE.search(token):
+        token = _CTRL_RE.sub(_escape_control, token)
+    return token
+
+
+def _is_escaped_end(token: str) -> bool:
+    """判断末尾引号是否被反斜杠转义"""
+    backslashes = 0
+    index = len(token) - 2
+    while index >= 0 and token[index] == "\\":
+        backslashes += 1
+        index -= 1
+    return backslashes % 2 == 1
+
+
+def _convert_single_quoted(token: str) -> str:
+    """将单引号字符串转为双引号字符串"""
+    closed = len(token) > 1 and token[-1] == "'" and not _is_escaped_end(token)
+    body = token[1:-1] if closed else token[1:]
+    if not closed and _is_escaped_end(body + "'"):
+        body = body[:-1]
+
+    def replace(match):
+        text = match.group()
+        if text == "\\'":
+            return "'"
+        if text == '"':
+            return '\\"'
+        return text
+
+    body = _SQ_BODY_RE.sub(replace, body)
+    if _CTRL_RE.search(body):
+        body = _CTRL_RE.sub(_escape_control, body)
+    return '"' + body + '"'
+
+
+def _fix_number(token: str) -> str:
+    """补全 .5 / 5. 之类的数字写法"""
+    if token[-1] == ".":
+        return token + "0"
+    if token.startswith("."):
+        return "0" + token
+    if token.startswith("-."):
+        return "-0" + token[1:]
+    if ".e" in token or ".E" in token:
+        return token.replace(".e", ".0e").replace(".E", ".0E")
+    return token
+
+
+class JSONRepairLexer:
+    """单次扫描的JSON修复词法器
+
+    同时跟踪字符串/转义状态与括号栈，在一次线性扫描中完成：
+    删除注释、单引号转双引号、补全键名引号、删除尾部逗号、
+    补全缺失逗号、特殊数值转字符串以及补全未闭合的括号。
+    """
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.stack: List[List] = []  # [括号, 是否已有元素]
+        self.state = _VALUE
+        # 最近写入的对象键在 out 中的起始下标 (含其前面的逗号)
+        self.key_mark: Optional[int] = None
+
+    def feed(self, text: str, pos: int = 0, end: Optional[int] = None, final: bool = True) -> int:
+        """扫描 text[pos:end] 并写入修复结果
+
+        Args:
+            final: 为False时表示后面还有数据，末尾可能被截断的token不处理
+
+        Returns:
+            扫描停止的位置 (顶层值完成后停止；非final时停在未完成的token之前)
+        """
+        if end is None:
+            end = len(text)
+        match_token = _TOKEN_RE.match
+        while pos < end:
+            state = self.state
+            if state == _DONE:
+                return pos
+            # 快速路径：整段已合法的 "键:标量," / "标量," 原样复制
+            if state == _KEY or (state == _VALUE and self.stack and self.stack[-1][0] == "["):
+                run = (_MEMBER_RUN_RE if state == _KEY else _VALUE_RUN_RE).match(text, pos, end)
+                if run:
+                    if self.stack[-1][1]:
+                        self.out.append(",")
+                    self.out.append(text[pos:run.end() - 1])
+                    self.stack[-1][1] = True
+                    pos = run.end()
+                    continue
+
+            match = match_token(text, pos, end)
+            pos = match.end()
+            kind = match.lastgroup
+            if not final and kind in _OPEN_ENDED and (
+                    pos == end
+                    or (kind in ("num", "word") and _CONTINUATION_RE.match(text, pos, end).end() == end)
+                    or (kind not in ("lc", "bc")
+                        and ((not self.stack and state == _VALUE)
+                             or (state == _AFTER and self.stack[-1][0] == "{" and kind != "other"))
+                        and _peek_significant(text, pos, end) is None)):
+                # 字符串/数字/关键字可能被截断；顶层标量与对象中缺少逗号的成员需要看到后续符号才能决定如何处理
+                return match.start()
+            token = match.group(kind)
+            if state == _AFTER and kind in ("dq", "sq", "num", "word") and match.start(kind) > 0 and \
+                    text[match.start(kind) - 1] in "\"'":
+                # 紧跟在字符串之后的值说明字符串中间有未转义的引号 (如 "say "hi"")，不推断逗号把它拆成多个值，
+                # 原样保留交由最终校验判定失败
+                self.out.append(token)
+                continue
+            if kind == "punct":
+                if token == ",":
+                    # 最常见的情况直接处理：值之后的逗号
+                    if state == _AFTER:
+                        self.state = _KEY if self.stack[-1][0] == "{" else _VALUE
+                    else:
+                        self._punct(token)
+                elif token == ":" and state == _COLON:
+                    self.out.append(":")
+                    self.state = _VALUE
+                else:
+                    self._punct(token)
+            elif kind == "ws" or kind == "lc" or kind == "bc":
+                continue
+            elif kind == "dq":
+                self._scalar(_fix_double_quoted(token), True, text, pos, end)
+            elif kind == "sq":
+                self._scalar(_convert_single_quoted(token), True, text, pos, end)
+            elif kind == "num":
+                if token.lstrip("-")[:2] in ("0x", "0X"):
+                    self._scalar('"' + token + '"', True, text, pos, end)
+                else:
+                    self._scalar(_fix_number(token), False, text, pos, end)
+            elif kind == "word":
+                self._word(token, text, pos, end)
+            elif token == "=" and state == _COLON:
+                self._punct(":")
+            else:
+                # 无法识别的字符原样保留，由最终校验决定是否修复成功
+                self.out.append(token)
+        return end
+
+    def closing_suffix(self) -> str:
+        """返回补全当前未闭合结构所需的后缀 (不修改状态，不为悬空的键补值)"""
+        return "".join(_CLOSERS[frame[0]] for frame in reversed(self.stack))
+
+    @property
+    def dangling(self) -> bool:
+        """最内层对象中最后一个成员只有键没有值"""
+        return self.state == _COLON or (self.state == _VALUE and bool(self.stack) and self.stack[-1][0] == "{")
+
+    def getvalue(self) -> str:
+        """返回补全后的完整文本
+
+        文本在键之后截断时丢弃只有键没有值的成员 (与增量会话的快照一致)，不凭空补 null。
+        """
+        out = self.out
+        if self.dangling and self.key_mark is not None:
+            out = out[:self.key_mark]
+        return "".join(out) + self.closing_suffix()
+
+    def _begin_value(self) -> bool:
+        """在写入一个值之前处理逗号/冒号，返回该值是否应当作为键"""
+        state = self.state
+        out = self.out
+        if state == _AFTER:
+            # 缺失的逗号
+            out.append(",")
+            state = _KEY if self.stack[-1][0] == "{" else _VALUE
+        elif state == _COLON:
+            # 缺失的冒号
+            out.append(":")
+            state = _VALUE
+        elif self.stack and self.stack[-1][1] and (
+                state == _KEY or (state == _VALUE and self.stack[-1][0] == "[")):
+            out.append(",")
+        self.state = state
+        if self.stack:
+            self.stack[-1][1] = True
+        return state == _KEY
+
+    def _end_value(self):
+        self.state = _AFTER if self.stack else _DONE
+
+    def _scalar(self, token: str, is_string: bool, text: str, pos: int, end: int):
+        if not self.stack and self.state == _VALUE:
+            self._maybe_wrap_top_level(text, pos, end)
+        elif self.state == _AFTER and self.stack[-1][0] == "{" and \
+                _peek_significant(text, pos, end) not in (":", None):
+            # 对象中值之后又出现不是键的标量 (如 'it''s')：不推断逗号、不编造成员，原样保留交由最终校验判定失败
+            self.out.append(token)
+            return
+        mark = len(self.out)
+        as_key = self._begin_value()
+        if as_key:
+            self.key_mark = mark
+            if not is_string:
+                token = '"' + token + '"'
+            self.out.append(token)
+            self.state = _COLON
+        else:
+            self.out.append(token)
+            self._end_value()
+
+    def _word(self, token: str, text: str, pos: int, end: int):
+        if self.state == _KEY or (self.state == _AFTER and self.stack and self.stack[-1][0] == "{"):
+            self._scalar('"' + token + '"', True, text, pos, end)
+        elif token in _WORD_VALUES:
+            self._scalar(_WORD_VALUES[token], False, text, pos, end)
+        else:
+            # 特殊数值(Infinity/NaN)与裸字符串都转为字符串，与正则路径一致
+            self._scalar('"' + token + '"', True, text, pos, end)
+
+    def _maybe_wrap_top_level(self, text: str, pos: int, end: int):
+        """顶层不是对象或数组时，根据后续符号补全外层括号"""
+        nxt = _peek_significant(text, pos, end)
+        if nxt == ":":
+            self.out.append("{")
+            self.stack.append(["{", False])
+            self.state = _KEY
+        elif nxt == ",":
+            self.out.append("[")
+            self.stack.append(["[", False])
+            self.state = _VALUE
+
+    def _punct(self, token: str):
+        state = self.state
+        if token == "{" or token == "[":
+            # 对象中以容器作为键时保持原样，交由后续校验判定失败
+            self._begin_value()
+            self.out.append(token)
+            self.stack.append([token, False])
+            self.state = _KEY if token == "{" else _VALUE
+        elif token == "}" or token == "]":
+            self._close(token)
+        elif token == ":":
+            if state == _COLON:
+                self.out.append(":")
+                self.state = _VALUE
+        elif token == ",":
+            if state == _COLON:
+                # 只有键没有值：不补 null，原样保留交由最终校验判定失败
+                self.out.append(",")
+                self.state = _KEY
+            elif state == _AFTER:
+                self.state = _KEY if self.stack[-1][0] == "{" else _VALUE
+
+    def _close(self, token: str):
+        opener = "{" if token == "}" else "["
+        if not any(frame[0] == opener for frame in self.stack):
+            # 多余的闭合括号
+            return
+        while self.stack:
+            frame = self.stack[-1]
+            # 只有键没有值的成员不补 null，闭合后的文本无效，交由最终校验判定失败
+            self.out.append(_CLOSERS[frame[0]])
+            self.stack.pop()
+            self.state = _AFTER
+            if frame[0] == opener:
+                break
+        if not self.stack:
+            self.state = _DONE
+
+
+def _peek_significant(text: str, pos: int, end: int) -> Optional[str]:
+    """查看下一个有效token (跳过空白与注释)"""
+    for match in _TOKEN_RE.finditer(text, pos, end):
+        kind = match.lastgroup
+        if kind in ("ws", "lc", "bc"):
+            continue
+        return match.group()
+    return None
+
+
+class IncrementalRepairSession:
+    """流式LLM输出的增量修复会话
+
+    逐块接收文本，在调用之间保留词法器状态与括号栈。每个块只扫描一次，
+    末尾可能被截断的token暂存到下一块；快照只需修复暂存的尾部并补全括号，
+    开销与新增数据成正比，而不是每次重新修复整个前缀。
+    """
+
+    _START_RE = re.compile(r'[{\[]')
+
+    def __init__(self):
+        self._lexer = JSONRepairLexer()
+        self._pending = ""
+        self._started = False
+
+    @property
+    def done(self) -> bool:
+        """顶层值是否已经完整 (之后的内容会被忽略)"""
+        return self._lexer.state == _DONE
+
+    def feed(self, chunk: str) -> str:
+        """追加一块文本并返回当前前缀的快照"""
+        text = self._pending + chunk
+        if not self._started:
+            # 跳过JSON之前的说明文字与 ```json 标记
+            match = self._START_RE.search(text)
+            if match is None:
+                self._pending = ""
+                return self.snapshot()
+            text = text[match.start():]
+            self._started = True
+        if self.done:
+            self._pending = ""
+        else:
+            pos = self._lexer.feed(text, final=False)
+            self._pending = text[pos:]
+        return self.snapshot()
+
+    def snapshot(self) -> str:
+        """返回当前前缀的最佳修复结果：闭合未完成的字符串与括号，丢弃悬空的键"""
+        lexer = self._lexer
+        if not self._started:
+            return ""
+        # 在状态副本上处理暂存的尾部，不影响后续的增量扫描
+        tail = JSONRepairLexer()
+        tail.stack = [frame[:] for frame in lexer.stack]
+        tail.state = lexer.state
+        if self._pending and lexer.state != _DONE and _TOKEN_RE.match(self._pending).lastgroup != "other":
+            tail.feed(self._pending)
+
+        if not tail.dangling:
+            return "".join(lexer.out) + "".join(tail.out) + tail.closing_suffix()
+        # 只有键没有值的成员整体丢弃 (键之后的输出都属于该成员)
+        if tail.key_mark is not None:
+            head = "".join(lexer.out) + "".join(tail.out[:tail.key_mark])
+        else:
+            head = "".join(lexer.out[:lexer.key_mark])
+        return head + "".join(_CLOSERS[frame[0]] for frame in reversed(tail.stack))
+
+    def close(self) -> str:
+        """输入结束，处理剩余内容并返回最终修复结果"""
+        if self._started and self._pending and not self.done:
+            self._lexer.feed(self._pending)
+        self._pending = ""
+        return self.snapshot()
+
+
+def lexer_repair_text(text: str) -> str:
+    """使用单次扫描词法器修复JSON文本 (不做校验)"""
+    lexer = JSONRepairLexer()
+    pos = lexer.feed(text)
+    if _peek_significant(text, pos, len(text)) is not None:
+        # 顶层值之后还有其他内容 (说明文字或第二个值)：原样保留，由最终校验判定失败，不静默截断
+        return lexer.getvalue() + text[pos:]
+    return lexer.getvalue()
+
+
+def repair_json_lexer(text: str) -> Tuple[str, bool]:
+    """使用单次扫描词法器修复JSON
+
+    Args:
+        text: 输入文本
+
+    Returns:
+        修复后的文本, 是否修复成功
+    """
+    repaired = lexer_repair_text(text)
+
+    try:
+        json.loads(repaired)
+        return repaired, True
+    except json.JSONDecodeError:
+        return text, False
@@ -0,0 +1,329 @@
+import json
+import re
+from typing import List, Optional, Tuple
+
+from .json_backend import loads
+
+
+# 候选块类型
+FENCE = "fence"        # ```json 代码块
+OBJECT = "object"      # 平衡的 {...}
+ARRAY = "array"        # 平衡的 [...]
+PARTIAL = "partial"    # 到文本末尾仍未闭合的块 (LLM输出被截断)
+LINE = "line"          # JSONL中的一行
+
+# 同一策略下的类型优先级：与原提取逻辑一致，代码块 > 对象 > 数组；
+# 被截断的块通常才是真正的输出，排在说明文字中常见的 [1] 之类的短数组之前
+_KIND_PRIORITY = {FENCE: 0, OBJECT: 1, PARTIAL: 2, ARRAY: 3, LINE: 4}
+
+# 排序策略
+FIRST = "first"
+LARGEST = "largest"
+LAST = "last"
+FIRST_VALID = "first_valid"
+
+STRATEGIES = (FIRST, LARGEST, LAST, FIRST_VALID)
+
+# 视为JSON代码块的语言标记
+_JSON_FENCE_LANGS = frozenset(("", "json", "jsonc", "json5", "javascript", "js"))
+
+# 块外只关心代码块标记与开括号；说明文字中的引号 (如 it's) 不能当作字符串处理
+_OUTER_RE = re.compile(r'```|[{\[]')
+# 块内还需要跳过字符串与注释，其中的括号不计数；字符串不跨行，未闭合的引号按普通字符处理
+_INNER_RE = re.compile(r'''
+    ```
+  | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+  | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+  | //[^\n]*
+  | /\*.*?\*/
+  | [{}\[\]]
+''', re.VERBOSE | re.DOTALL)
+_FENCE_LANG_RE = re.compile(r'[ \t]*([\w+-]*)[^\n]*\n?')
+# 在字节缓冲区 (内存映射的文件) 上使用的相同规则：UTF-8 的多字节字符中没有ASCII字节，
+# 按字节扫描得到的块与解码后扫描一致 (位置为字节偏移)
+_BYTES_OUTER_RE = re.compile(_OUTER_RE.pattern.encode("ascii"))
+_BYTES_INNER_RE = re.compile(_INNER_RE.pattern.encode("ascii"), re.VERBOSE | re.DOTALL)
+# UTF-8 的后续字节，在字节缓冲区上计算候选块的字符数
+_UTF8_CONTINUATION = bytes(range(0x80, 0xC0))
+_CLOSING = {"}": "{", "]": "["}
+_LINE_RE = re.compile(r'[^\n]*\S[^\n]*')
+
+
+class JSONCandidate:
+    """文本中的一个候选JSON块，只记录偏移量，选中后才切片"""
+
+    __slots__ = ("kind", "start", "end")
+
+    def __init__(self, kind: str, start: int, end: int):
+        self.kind = kind
+        self.start = start
+        self.end = end
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+    def text(self, source: str) -> str:
+        return source[self.start:self.end].strip()
+
+    def __repr__(self) -> str:
+        return f"JSONCandidate({self.kind!r}, {self.start}, {self.end})"
+
+
+def find_candidates(text) -> List[JSONCandidate]:
+    """单次线性扫描，找出所有JSON代码块与顶层的平衡对象/数组
+
+    括号计数会跳过字符串和注释中的括号。JSON代码块内的内容作为一个整体候选，
+    不再单独列出其中的对象；其他语言的代码块按普通文本处理。
+    text 也可以是UTF-8字节缓冲区 (如内存映射的文件)，不解码直接扫描，候选块的位置为字节偏移。
+
+    Returns:
+        按出现顺序排列的候选块
+    """
+    if isinstance(text, str):
+        outer_re, inner_re, lang_re, fence_mark = _OUTER_RE, _INNER_RE, _FENCE_LANG_RE, "```"
+    else:
+        outer_re, inner_re, lang_re, fence_mark = _BYTES_OUTER_RE, _BYTES_INNER_RE, _BYTES_FENCE_LANG_RE, b"```"
+    candidates: List[JSONCandidate] = []
+    stack: List[str] = []
+    block_start = 0
+    # 未闭合的JSON代码块内容的起始位置
+    fence_start: Optional[int] = None
+    # 非JSON语言代码块内 (其中的块照常查找)
+    in_other_fence = False
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        match = (inner_re if stack else outer_re).search(text, pos)
+        if match is None:
+            break
+        token = match.group()
+        pos = match.end()
+
+        if token == fence_mark:
+            if in_other_fence:
+                in_other_fence = False
+                if stack:
+                    candidates.append(JSONCandidate(PARTIAL, block_start, match.start()))
+                    stack.clear()
+            else:
+                # 字符串外的代码块标记说明之前未闭合的括号只是说明文字
+                stack.clear()
+                lang = lang_re.match(text, pos)
+                pos = lang.end()
+                name = lang.group(1)
+                if not isinstance(name, str):
+                    name = name.decode("ascii", "ignore")
+                if name.lower() in _JSON_FENCE_LANGS:
+                    # JSON代码块内容整体作为候选，直接跳到结束标记
+                    fence_end = text.find(fence_mark, pos)
+                    if fence_end == -1:
+                        fence_start = pos
+                        break
+                    candidates.append(JSONCandidate(FENCE, pos, fence_end))
+                    pos = fence_end + 3
+                else:
+                    in_other_fence = True
+            continue
+
+        char = token[:1]
+        if not isinstance(char, str):
+            char = char.decode("latin-1")
+        if char == "{" or char == "[":
+            if not stack:
+                block_start = match.start()
+            stack.append(char)
+        elif char == "}" or char == "]":
+            # 不匹配的闭合括号直接忽略
+            if stack[-1] != _CLOSING[char]:
+                continue
+            stack.pop()
+            if not stack:
+                kind = OBJECT if char == "}" else ARRAY
+                candidates.append(JSONCandidate(kind, block_start, pos))
+
+    if fence_start is not None:
+        # 未闭合的代码块：内容延续到文本末尾
+        candidates.append(JSONCandidate(FENCE, fence_start, length))
+    elif stack:
+        candidates.append(JSONCandidate(PARTIAL, block_start, length))
+    return candidates
+
+
+def _is_valid(candidate: JSONCandidate, source) -> bool:
+    try:
+        text = candidate.text(source)
+        loads(text if isinstance(text, str) else str(text, "utf-8"))
+        return True
+    except ValueError:
+        return False
+
+
+def _char_size(candidate: JSONCandidate, source) -> int:
+    """候选块的字符数 (字节缓冲区上按UTF-8计算，与解码后的长度相同)"""
+    if isinstance(source, str):
+        return candidate.size
+    return len(source[candidate.start:candidate.end].translate(None, _UTF8_CONTINUATION))
+
+
+def select_candidate(text,
+                     candidates: List[JSONCandidate],
+                     strategy: str = FIRST) -> Optional[JSONCandidate]:
+    """按策略从候选块中选出一个
+
+    Args:
+        text: 原始文本 (或 find_candidates 扫描的字节缓冲区)
+        candidates: find_candidates 的结果
+        strategy: first=最高优先级类型中的第一个 (默认，与原逻辑一致),
+                  last=最高优先级类型中的最后一个, largest=跨度最大的块,
+                  first_valid=按优先级与出现顺序第一个可直接解析的块 (都不能解析时同first)
+
+    Returns:
+        选中的候选块，没有候选时返回None
+    """
+    candidates = [c for c in candidates if c.end > c.start]
+    if not candidates:
+        return None
+
+    if strategy == LARGEST:
+        return max(candidates, key=lambda c: (_char_size(c, text), -_KIND_PRIORITY[c.kind]))
+
+    ranked = sorted(candidates, key=lambda c: _KIND_PRIORITY[c.kind])
+    if strategy == FIRST_VALID:
+        for candidate in ranked:
+            if candidate.kind != PARTIAL and _is_valid(candidate, text):
+                return candidate
+    elif strategy == LAST:
+        top = _KIND_PRIORITY[ranked[0].kind]
+        return [c for c in ranked if _KIND_PRIORITY[c.kind] == top][-1]
+    return ranked[0]
+
+
+def locate_json(text: str, strategy: str = FIRST) -> Optional[str]:
+    """在文本中定位JSON内容
+
+    Returns:
+        选中的JSON文本，未找到时返回None
+    """
+    candidate = select_candidate(text, find_candidates(text), strategy)
+    if candidate is None:
+        return None
+    return candidate.text(text)
+
+
+def _is_line_value(text: str, start: int, end: int) -> bool:
+    """text[start:end] 是否为单独一个完整的对象/数组
+
+    可以直接解析，或者括号在行内恰好闭合 (跳过字符串与注释中的括号) 且之后只有空白或注释，
+    这样的行内容有误时也能单独修复。美化输出的多行文档 (如 "[[1, 2],") 括号在行内不平衡，不满足条件。
+    """
+    try:
+        loads(text[start:end])
+        return True
+    except ValueError:
+        pass
+    stack: List[str] = []
+    for match in _INNER_RE.finditer(text, start, end):
+        token = match.group()
+        char = token[:1]
+        if not isinstance(char, str):
+            char = char.decode("latin-1")
+        if char == "{" or char == "[":
+            stack.append(char)
+        elif char == "}" or char == "]":
+            if not stack or stack[-1] != _CLOSING[char]:
+                return False
+            stack.pop()
+            if not stack:
+                rest = text[match.end():end].strip()
+                return not rest or rest.startswith("//") or (rest.startswith("/*") and rest.endswith("*/"))
+        elif token == "```":
+            return False
+    return False
+
+
+def _jsonl_lines(text: str) -> Optional[List[JSONCandidate]]:
+    """不少于两行且每个非空行都是单独一个完整的对象/数组时按JSONL处理，返回各行的范围"""
+    spans = []
+    for match in _LINE_RE.finditer(text):
+        if match.group().lstrip()[0] not in "{[":
+            return None
+        spans.append((match.start(), match.end()))
+    if len(spans) < 2 or not all(_is_line_value(text, start, end) for start, end in spans):
+        return None
+    return [JSONCandidate(LINE, start, end) for start, end in spans]
+
+
+def find_documents(text: str) -> Tuple[str, List[JSONCandidate]]:
+    """找出文本中的所有JSON文档 (多文档模式)
+
+    依次识别：JSONL (每行一条完整的记录，单独一行的内容有误不会影响其他行)、多个JSON代码块、
+    连续或夹杂在说明文字中的多个JSON值。任何一行不是完整的对象/数组时 (如美化输出的多行文档)
+    不按JSONL处理。
+
+    Returns:
+        格式 ("jsonl" / "fences" / "values"), 按出现顺序排列的文档范围
+    """
+    lines = _jsonl_lines(text)
+    if lines is not None:
+        return "jsonl", lines
+    candidates = find_candidates(text)
+    fences = [c for c in candidates if c.kind == FENCE and c.end > c.start]
+    if fences:
+        return "fences", fences
+    return "values", candidates
+
+
+_BYTES_WS = b" \t\r\n"
+_BYTES_OPEN_RE = re.compile(rb'[{\[]')
+_BYTES_FENCE_LANG_RE = re.compile(rb'[ \t]*([\w+-]*)[^\n]*\n?')
+
+
+def locate_bytes(buffer) -> Optional[JSONCandidate]:
+    """在字节缓冲区 (如内存映射的文件) 中定位JSON内容，不解码
+
+    只使用缓冲区自身的查找操作，不逐个扫描括号，耗时与文件大小基本无关：
+    以括号开头时取整个缓冲区；否则取第一个JSON代码块；再否则取第一个开括号
+    到最后一个闭括号 (没有闭括号时到末尾，按截断处理)。
+    多个候选块之间的选择与修复交给文本定位 (find_candidates / select_candidate)。
+
+    Returns:
+        去掉BOM与首尾空白后的范围，没有任何JSON内容时返回None
+    """
+    start = 3 if buffer[:3] == b"\xef\xbb\xbf" else 0
+    end = len(buffer)
+    while start < end and buffer[start] in _BYTES_WS:
+        start += 1
+    while end > start and buffer[end - 1] in _BYTES_WS:
+        end -= 1
+    if start >= end:
+        return None
+
+    if buffer[start] in b"{[":
+        kind = OBJECT if buffer[start] == ord("{") else ARRAY
+        return JSONCandidate(kind, start, end)
+
+    fence = buffer.find(b"```", start, end)
+    while fence != -1:
+        lang = _BYTES_FENCE_LANG_RE.match(buffer, fence + 3, end)
+        body = lang.end()
+        closing = buffer.find(b"```", body, end)
+        if lang.group(1).decode("ascii", "ignore").lower() in _JSON_FENCE_LANGS:
+            body_end = closing if closing != -1 else end
+            while body < body_end and buffer[body] in _BYTES_WS:
+                body += 1
+            while body_end > body and buffer[body_end - 1] in _BYTES_WS:
+                body_end -= 1
+            return JSONCandidate(FENCE, body, body_end)
+        fence = buffer.find(b"```", closing + 3, end) if closing != -1 else -1
+
+    match = _BYTES_OPEN_RE.search(buffer, start, end)
+    if match is None:
+        return None
+    block_start = match.start()
+    block_end = max(buffer.rfind(b"}", block_start, end), buffer.rfind(b"]", block_start, end)) + 1
+    if block_end <= block_start:
+        return JSONCandidate(PARTIAL, block_start, end)
+    kind = OBJECT if buffer[block_start] == ord("{") else ARRAY
+    return JSONCandidate(kind, block_start, block_end)
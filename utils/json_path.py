@@ -0,0 +1,299 @@
+import re
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+from .json_tape import ARRAY_TYPES, CONTAINER_TYPES, OBJECT_TYPES
+
+# 路径步骤类型
+KEY = "key"            # 对象键
+INDEX = "index"        # 单个数组下标 (支持负数)
+INDEXES = "indexes"    # 多个数组下标 [0,2,5]
+KEYS = "keys"          # 多个对象键 ['a','b']
+SLICE = "slice"        # 数组切片 [1:5:2]，参数为 (start, stop, step) 元组
+WILDCARD = "wildcard"  # 所有子元素 * / [*]
+DESCEND = "descend"    # 递归下降 ..key / ..*
+
+Step = Tuple[str, Any]
+
+# 仅在编译时使用，编译结果被缓存，求值时不再做任何正则匹配
+_PATH_TOKEN_RE = re.compile(r'''
+    (?P<descend>\.\.)
+  | (?P<dot>\.)
+  | (?P<bracket>\[(?P<selector>(?:'[^']*'|"[^"]*"|[^\]'"])*)\])
+  | (?P<name>[^.\[]+)
+''', re.VERBOSE)
+
+_SELECTOR_PART_RE = re.compile(r'\'[^\']*\'|"[^"]*"|[^,]+')
+
+_SEGMENT_INDEX_RE = re.compile(r'\[(?P<selector>(?:\'[^\']*\'|"[^"]*"|[^\]\'"])*)\]$')
+
+
+def _parse_int(text: str, expression: str) -> int:
+    try:
+        return int(text.strip())
+    except ValueError:
+        raise ValueError(f"无效路径表达式: {expression} (非法下标 {text.strip()!r})")
+
+
+def _parse_selector(selector: str, expression: str) -> Step:
+    """解析方括号内的选择器"""
+    selector = selector.strip()
+    if selector == "*":
+        return (WILDCARD, None)
+
+    parts = [part.strip() for part in _SELECTOR_PART_RE.findall(selector)]
+    if parts and all(len(part) >= 2 and part[0] == part[-1] and part[0] in ("'", '"') for part in parts):
+        keys = tuple(part[1:-1] for part in parts)
+        return (KEY, keys[0]) if len(keys) == 1 else (KEYS, keys)
+
+    if ":" in selector:
+        bounds = selector.split(":")
+        if len(bounds) > 3:
+            raise ValueError(f"无效路径表达式: {expression} (非法切片 {selector!r})")
+        values = [_parse_int(bound, expression) if bound.strip() else None for bound in bounds]
+        if len(values) == 3 and values[2] == 0:
+            raise ValueError(f"无效路径表达式: {expression} (切片步长不能为0)")
+        values += [None] * (3 - len(values))
+        return (SLICE, tuple(values))
+
+    indexes = tuple(_parse_int(part, expression) for part in parts)
+    if not indexes:
+        raise ValueError(f"无效路径表达式: {expression} (空的下标)")
+    return (INDEX, indexes[0]) if len(indexes) == 1 else (INDEXES, indexes)
+
+
+@lru_cache(maxsize=1024)
+def compile_path(expression: str) -> Tuple[Step, ...]:
+    """将路径表达式编译为访问步骤元组 (结果缓存)
+
+    支持的语法:
+        a.b.c            点分路径
+        a[0] / a[-1]     数组下标 (支持负数)
+        a[0,2,5]         多个下标
+        a[1:5] / a[::2]  切片
+        a.* / a[*]       通配符
+        a..name / ..*    递归下降
+        a["x.y"]         含特殊字符的键
+    开头的 "$" 可选。
+
+    Raises:
+        ValueError: 表达式无效
+    """
+    text = expression.strip()
+    if text.startswith("$"):
+        text = text[1:]
+
+    steps: List[Step] = []
+    pending_descend = False
+    pos = 0
+    while pos < len(text):
+        match = _PATH_TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ValueError(f"无效路径表达式: {expression}")
+        pos = match.end()
+        kind = match.lastgroup
+
+        if kind == "descend":
+            if pending_descend:
+                raise ValueError(f"无效路径表达式: {expression}")
+            pending_descend = True
+            continue
+        if kind == "dot":
+            continue
+
+        if kind == "bracket":
+            step = _parse_selector(match.group("selector"), expression)
+        else:
+            name = match.group("name").strip()
+            step = (WILDCARD, None) if name == "*" else (KEY, name)
+
+        if pending_descend:
+            if step[0] not in (KEY, WILDCARD):
+                raise ValueError(f"无效路径表达式: {expression} (递归下降后只能是键名或*)")
+            steps.append((DESCEND, step[1]))
+            pending_descend = False
+        else:
+            steps.append(step)
+
+    if pending_descend:
+        raise ValueError(f"无效路径表达式: {expression} (递归下降缺少键名)")
+    return tuple(steps)
+
+
+@lru_cache(maxsize=1024)
+def compile_segment(segment: str) -> Tuple[Step, ...]:
+    """编译单级路径键 (如 "key", "key[0]", "key[-1][2]")
+
+    与完整表达式不同，这里不会按 "." 拆分，键名中的点号按字面处理，
+    与按层级填写键名的输入方式保持一致。
+    """
+    indexes: List[Step] = []
+    key = segment
+    while True:
+        match = _SEGMENT_INDEX_RE.search(key)
+        if match is None:
+            break
+        try:
+            step = _parse_selector(match.group("selector"), segment)
+        except ValueError:
+            break
+        if step[0] != INDEX:
+            break
+        indexes.append(step)
+        key = key[:match.start()]
+
+    steps: List[Step] = [(KEY, key)] if key else []
+    steps.extend(reversed(indexes))
+    return tuple(steps)
+
+
+def is_definite(steps: Tuple[Step, ...]) -> bool:
+    """路径是否只会命中单个值 (不含通配/切片/多选/递归下降)"""
+    return all(kind in (KEY, INDEX) for kind, _ in steps)
+
+
+def format_path(prefix: str, kind: str, arg: Any) -> str:
+    """拼接结果路径，格式与其他模块一致: a.b[0]"""
+    if kind == KEY:
+        return f"{prefix}.{arg}" if prefix else str(arg)
+    return f"{prefix}[{arg}]"
+
+
+def _children(path: str, node: Any):
+    if isinstance(node, OBJECT_TYPES):
+        for key, value in node.items():
+            yield format_path(path, KEY, key), value
+    elif isinstance(node, ARRAY_TYPES):
+        for i, item in enumerate(node):
+            yield format_path(path, INDEX, i), item
+
+
+def _descendants(path: str, node: Any):
+    """前序遍历所有后代 (不含自身)"""
+    stack = [iter(_children(path, node))]
+    while stack:
+        for child_path, child in stack[-1]:
+            yield child_path, child
+            if isinstance(child, CONTAINER_TYPES):
+                stack.append(iter(_children(child_path, child)))
+            break
+        else:
+            stack.pop()
+
+
+def get_by_steps(data: Any, steps: Tuple[Step, ...]) -> Any:
+    """按确定路径取值
+
+    Raises:
+        KeyError: 键或下标不存在
+    """
+    current = data
+    for kind, arg in steps:
+        if kind == KEY:
+            if not isinstance(current, OBJECT_TYPES) or arg not in current:
+                raise KeyError(f"键不存在: {arg}")
+            current = current[arg]
+        elif kind == INDEX:
+            if not isinstance(current, ARRAY_TYPES) or not -len(current) <= arg < len(current):
+                raise KeyError(f"无效的数组访问: [{arg}]")
+            current = current[arg]
+        else:
+            raise KeyError(f"不支持的确定路径步骤: {kind}")
+    return current
+
+
+def apply_step(step: Step, current: List[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+    """对当前匹配集合应用一个步骤"""
+    kind, arg = step
+    matched = []
+    for path, node in current:
+        if kind == KEY:
+            if isinstance(node, OBJECT_TYPES) and arg in node:
+                matched.append((format_path(path, KEY, arg), node[arg]))
+        elif kind == INDEX:
+            if isinstance(node, ARRAY_TYPES) and -len(node) <= arg < len(node):
+                index = arg if arg >= 0 else len(node) + arg
+                matched.append((format_path(path, INDEX, index), node[index]))
+        elif kind == KEYS:
+            if isinstance(node, OBJECT_TYPES):
+                matched.extend((format_path(path, KEY, key), node[key]) for key in arg if key in node)
+        elif kind == INDEXES:
+            if isinstance(node, ARRAY_TYPES):
+                size = len(node)
+                for index in arg:
+                    if -size <= index < size:
+                        index = index if index >= 0 else size + index
+                        matched.append((format_path(path, INDEX, index), node[index]))
+        elif kind == SLICE:
+            if isinstance(node, ARRAY_TYPES):
+                window = slice(*arg)
+                # 一次切片取出所有元素 (磁带数组按下标逐个访问需要从头扫描)
+                matched.extend((format_path(path, INDEX, index), item)
+                               for index, item in zip(range(*window.indices(len(node))), node[window]))
+        elif kind == WILDCARD:
+            matched.extend(_children(path, node))
+        elif kind == DESCEND:
+            if arg is None:
+                matched.extend(_descendants(path, node))
+                continue
+            if isinstance(node, OBJECT_TYPES) and arg in node:
+                matched.append((format_path(path, KEY, arg), node[arg]))
+            for child_path, child in _descendants(path, node):
+                if isinstance(child, OBJECT_TYPES) and arg in child:
+                    matched.append((format_path(child_path, KEY, arg), child[arg]))
+    return matched
+
+
+def evaluate(data: Any, steps: Tuple[Step, ...], root_path: str = "") -> List[Tuple[str, Any]]:
+    """按编译后的步骤求值
+
+    Returns:
+        [(路径, 值), ...] 按文档顺序排列
+    """
+    current = [(root_path, data)]
+    for step in steps:
+        current = apply_step(step, current)
+        if not current:
+            break
+    return current
+
+
+class _TrieNode:
+    """路径前缀树节点"""
+
+    __slots__ = ("children", "terminals")
+
+    def __init__(self):
+        self.children = {}
+        self.terminals = []
+
+
+def evaluate_many(data: Any, steps_list: List[Tuple[Step, ...]]) -> List[List[Tuple[str, Any]]]:
+    """一次遍历同时求值多条路径
+
+    将所有路径的步骤构建成前缀树，公共前缀只求值一次。
+
+    Returns:
+        与 steps_list 一一对应的匹配结果列表
+    """
+    root = _TrieNode()
+    for position, steps in enumerate(steps_list):
+        node = root
+        for step in steps:
+            child = node.children.get(step)
+            if child is None:
+                child = node.children[step] = _TrieNode()
+            node = child
+        node.terminals.append(position)
+
+    results: List[List[Tuple[str, Any]]] = [[] for _ in steps_list]
+    pending = [(root, [("", data)])]
+    while pending:
+        node, current = pending.pop()
+        for position in node.terminals:
+            results[position] = current
+        for step, child in node.children.items():
+            matched = apply_step(step, current)
+            if matched:
+                pending.append((child, matched))
+    return results
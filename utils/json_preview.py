@@ -0,0 +1,259 @@
+from json.encoder import encode_basestring
+from typing import Any, IO, List, Optional, Tuple, Union
+
+from .json_stream import JSONEventParser, JSONStreamError
+
+
+# 预览的默认预算：输出行数与字节数 (0表示不限)
+DEFAULT_MAX_LINES = 1000
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+# 摘要模式：数组抽样的元素数、列出的键数，以及计数时最多扫描的输入字符数
+SUMMARY_SAMPLE = 3
+SUMMARY_KEYS = 5
+SUMMARY_SCAN_LIMIT = 1024 * 1024
+
+# 紧凑模式累积到该长度再写出一次
+_FLUSH_CHARS = 4096
+
+_SCALARS = {True: "true", False: "false", None: "null"}
+_INFINITY = float("inf")
+
+
+class PreviewBudgetExceeded(Exception):
+    """输出达到预算"""
+
+
+def _encode_scalar(value: Any) -> str:
+    """与 json.dumps(value, ensure_ascii=False) 相同的标量输出"""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None or value is True or value is False:
+        return _SCALARS[value]
+    if isinstance(value, float):
+        # 与 json 编码器的 floatstr 相同：超出范围的数字 (如 1E400) 解析为 inf，写作 Infinity
+        if value != value:
+            return "NaN"
+        if value == _INFINITY:
+            return "Infinity"
+        if value == -_INFINITY:
+            return "-Infinity"
+        return float.__repr__(value)
+    return int.__repr__(value)
+
+
+class _BudgetWriter:
+    """按行写出文本，超出行数或字节数预算时抛出 PreviewBudgetExceeded"""
+
+    def __init__(self, max_lines: int, max_bytes: int):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.parts: List[str] = []
+        self.lines = 0
+        self.size = 0
+
+    def write(self, text: str, newline: bool):
+        """写出一段文本，newline为True时它是完整的一行"""
+        if newline and self.max_lines and self.lines >= self.max_lines:
+            raise PreviewBudgetExceeded()
+        size = len(text.encode("utf-8", "surrogatepass")) + newline
+        if self.max_bytes and self.size + size > self.max_bytes:
+            # 放不下的一行截取能放下的前缀 (紧凑模式只有一行)
+            remaining = self.max_bytes - self.size
+            if remaining > 0:
+                self.parts.append(text.encode("utf-8", "surrogatepass")[:remaining].decode("utf-8", "ignore"))
+            raise PreviewBudgetExceeded()
+        self.parts.append(text + "\n" if newline else text)
+        self.size += size
+        self.lines += newline
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def stream_format(source: Union[str, IO],
+                  indent: Optional[int] = 2,
+                  max_lines: int = DEFAULT_MAX_LINES,
+                  max_bytes: int = DEFAULT_MAX_BYTES) -> Tuple[str, bool]:
+    """流式格式化JSON，输出达到预算时立即停止
+
+    只解析已输出的部分，耗时与内存取决于预算而不是文档大小。未截断且没有重复键时输出与
+    json.dumps(data, indent=indent, ensure_ascii=False) 相同；重复键按原文逐个输出，
+    不像 json.loads 那样只保留最后一个 (合并需要缓存整个对象)。
+
+    Args:
+        source: JSON字符串或类文件对象
+        indent: 缩进空格数，None为紧凑的单行输出
+        max_lines: 最多输出的行数 (0表示不限)
+        max_bytes: 最多输出的字节数 (0表示不限)
+
+    Returns:
+        格式化文本 (截断时末尾附带截断说明), 是否截断
+
+    Raises:
+        JSONStreamError: 在达到预算之前遇到无效JSON
+    """
+    parser = JSONEventParser(source)
+    writer = _BudgetWriter(max_lines, max_bytes)
+    pretty = indent is not None
+    # 栈中每项为 [是否对象, 已写出的成员数]
+    stack: List[list] = []
+    line = ""
+
+    def begin_item():
+        nonlocal line
+        top = stack[-1]
+        if pretty:
+            if top[1]:
+                line += ","
+            writer.write(line, True)
+            line = " " * (indent * len(stack))
+        elif top[1]:
+            line += ", "
+            if len(line) >= _FLUSH_CHARS:
+                writer.write(line, False)
+                line = ""
+        top[1] += 1
+
+    try:
+        for event, value in parser.events():
+            if event == "map_key":
+                begin_item()
+                line += encode_basestring(value) + ": "
+                continue
+            if event in ("end_map", "end_array"):
+                closer = "}" if event == "end_map" else "]"
+                _, count = stack.pop()
+                if count and pretty:
+                    writer.write(line, True)
+                    line = " " * (indent * len(stack)) + closer
+                else:
+                    line += closer
+                continue
+            if stack and not stack[-1][0]:
+                begin_item()
+            if event == "start_map":
+                line += "{"
+                stack.append([True, 0])
+            elif event == "start_array":
+                line += "["
+                stack.append([False, 0])
+            else:
+                line += _encode_scalar(value)
+        # 顶层值之后只能有空白
+        if parser._peek():
+            raise JSONStreamError(f"多余的内容 (位置 {parser._pos})")
+        writer.write(line, False)
+        return writer.text(), False
+    except PreviewBudgetExceeded:
+        shown = f"{writer.lines} 行 / {_format_size(writer.size)}" if pretty else _format_size(writer.size)
+        marker = f"... (预览已截断: 显示 {shown}"
+        if isinstance(source, str):
+            marker += f"，已读取输入 {_format_size(parser._pos)} / {_format_size(len(source))}"
+        marker += ")"
+        text = writer.text()
+        return text + ("" if text.endswith("\n") or not text else "\n") + marker, True
+
+
+class _Summarizer:
+    """摘要模式：数组只抽样前几个元素，计数时最多扫描 SUMMARY_SCAN_LIMIT 个字符"""
+
+    def __init__(self, parser: JSONEventParser, scan_limit: int):
+        self.parser = parser
+        self.scan_limit = scan_limit
+
+    def _count_members(self, is_map: bool, keys: Optional[List[str]] = None,
+                       samples: Optional[List[str]] = None) -> Tuple[int, bool]:
+        """扫描容器成员 (解析器位于左括号处)
+
+        Returns:
+            成员数, 是否完整计数 (超出扫描上限时为下限)
+        """
+        parser = self.parser
+        parser._pos += 1
+        count = 0
+        closer = "}" if is_map else "]"
+        while True:
+            char = parser._peek()
+            if char == closer:
+                parser._pos += 1
+                return count, True
+            if count:
+                parser._expect(",")
+                char = parser._peek()
+            if parser._pos > self.scan_limit:
+                return count, False
+            if is_map:
+                if char != '"':
+                    raise JSONStreamError(f"期望键名 (位置 {parser._pos})")
+                key = parser._read_string()
+                parser._expect(":")
+                if keys is not None and len(keys) < SUMMARY_KEYS:
+                    keys.append(key)
+                complete = parser.skip_value(self.scan_limit)
+            elif samples is not None and len(samples) < SUMMARY_SAMPLE:
+                samples.append(self.describe_value())
+                complete = parser._pos <= self.scan_limit
+            else:
+                complete = parser.skip_value(self.scan_limit)
+            count += 1
+            if not complete:
+                return count, False
+
+    def describe_value(self) -> str:
+        """单个值的简短描述 (与原摘要模式的写法一致)"""
+        parser = self.parser
+        char = parser._peek()
+        if char in ("{", "["):
+            count, complete = self._count_members(char == "{")
+            amount = f"{count}" if complete else f"至少{count}"
+            return f"对象 {{{amount}个键}}" if char == "{" else f"数组 [{amount}项]"
+        if char == '"':
+            value = parser._read_string()
+            if len(value) > 30:
+                return f'"{value[:27]}..."'
+            return f'"{value}"'
+        return str(parser._read_scalar())
+
+    def summarize(self) -> str:
+        parser = self.parser
+        char = parser._peek()
+        if char == "{":
+            keys: List[str] = []
+            count, complete = self._count_members(True, keys=keys)
+            preview = ", ".join(keys)
+            if not complete:
+                preview += f"... 等至少{count}个键"
+            elif count > SUMMARY_KEYS:
+                preview += f"... 等{count}个键"
+            return f"对象 {{{preview}}}"
+        if char == "[":
+            samples: List[str] = []
+            count, complete = self._count_members(False, samples=samples)
+            preview = ", ".join(samples)
+            if not complete:
+                preview += f"... 等至少{count}项"
+            elif count > SUMMARY_SAMPLE:
+                preview += f"... 等{count}项"
+            return f"数组 [{preview}]"
+        return self.describe_value()
+
+
+def stream_summary(source: str, scan_limit: int = SUMMARY_SCAN_LIMIT) -> str:
+    """生成JSON结构摘要，不构建完整文档
+
+    顶层对象列出前几个键，顶层数组只抽样描述前几个元素，其余元素直接跳过。
+    扫描超过 scan_limit 个字符后停止计数，数量显示为"至少N"。
+
+    Raises:
+        JSONStreamError: 扫描范围内遇到无效JSON
+    """
+    return _Summarizer(JSONEventParser(source), scan_limit).summarize()
@@ -0,0 +1,364 @@
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, IO, Iterator, Optional, Tuple, Union
+
+from .json_path import KEY, INDEX, Step
+
+
+# 超过该大小的输入在提取时使用流式解析，避免构建完整的对象树
+STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+_WS_RE = re.compile(r'[ \t\n\r]*')
+# 与 json.loads 相同，接受 NaN、Infinity、-Infinity
+_SCALAR_RE = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null|NaN|-?Infinity')
+_TOKEN_END_RE = re.compile(r'[^\s,\]}]*')
+# 跳过值时按块匹配：连续的非括号字符与完整字符串合并为一次匹配，或单个括号
+_SKIP_RE = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")+|[{}\[\]]', re.DOTALL)
+
+_LITERALS = {"true": True, "false": False, "null": None,
+             "NaN": float("nan"), "Infinity": float("inf"), "-Infinity": float("-inf")}
+
+_decoder = json.JSONDecoder()
+
+
+class JSONStreamError(ValueError):
+    """流式解析错误"""
+
+
+class JSONEventParser:
+    """基于事件的流式JSON解析器
+
+    输入可以是字符串或类文件对象 (按块读取)。解析过程中只保存括号栈和当前
+    未完成的token，峰值内存与嵌套深度成正比，而不是与文档大小成正比。
+    """
+
+    def __init__(self, source: Union[str, IO], chunk_size: int = 64 * 1024):
+        if isinstance(source, str):
+            self._buffer = source
+            self._read = None
+            self._eof = True
+        else:
+            self._buffer = ""
+            self._read = source.read
+            self._eof = False
+        self._source = source
+        # 类文件对象返回bytes时为True (读取第一块后确定)
+        self._binary = False
+        self._chunk_size = chunk_size
+        # 二进制输入按UTF-8增量解码，多字节字符可能跨越块边界
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._pos = 0
+        # 需要保留在缓冲区中的起始位置 (提取完整值时使用)
+        self._mark: Optional[int] = None
+
+    # ---- 缓冲区管理 ----
+
+    def _fill(self) -> bool:
+        """读取更多数据，丢弃已消费的部分；到达末尾时返回False"""
+        if self._eof:
+            return False
+        while True:
+            chunk = self._read(self._chunk_size)
+            if not isinstance(chunk, bytes):
+                break
+            self._binary = True
+            raw = chunk
+            chunk = self._decoder.decode(raw, final=not raw)
+            # 块只包含不完整的多字节字符时继续读取
+            if chunk or not raw:
+                break
+        keep = self._pos if self._mark is None else self._mark
+        if keep:
+            self._buffer = self._buffer[keep:]
+            self._pos -= keep
+            if self._mark is not None:
+                self._mark = 0
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        """跳过空白并返回下一个字符，到达末尾返回空字符串"""
+        while True:
+            self._pos = _WS_RE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise JSONStreamError(f"期望 {char!r}，实际为 {found or '文本末尾'!r} (位置 {self._pos})")
+        self._pos += 1
+
+    def _read_string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self._buffer, self._pos + 1, True)
+                self._pos = end
+                return value
+            except json.JSONDecodeError as e:
+                if not self._fill():
+                    raise JSONStreamError(f"无效字符串: {e.msg} (位置 {self._pos})")
+
+    def _read_scalar(self) -> Any:
+        while True:
+            end = _TOKEN_END_RE.match(self._buffer, self._pos).end()
+            # token可能被块边界截断，需要更多数据才能确定
+            if end == len(self._buffer) and end - self._pos < 1024 and self._fill():
+                continue
+            match = _SCALAR_RE.match(self._buffer, self._pos, end)
+            if match is None or match.end() != end:
+                raise JSONStreamError(f"无效的值 (位置 {self._pos})")
+            self._pos = end
+            token = match.group()
+            if token in _LITERALS:
+                return _LITERALS[token]
+            if "." in token or "e" in token or "E" in token:
+                return float(token)
+            return int(token)
+
+    # ---- 事件接口 ----
+
+    def events(self) -> Iterator[Tuple[str, Any]]:
+        """生成解析事件
+
+        事件类型: start_map, map_key, end_map, start_array, end_array, value
+        """
+        stack = []
+        while True:
+            char = self._peek()
+            if stack:
+                if not char:
+                    raise JSONStreamError("文本意外结束")
+                container = stack[-1]
+                # 容器内: 处理逗号、闭合括号与对象键
+                if container[1]:
+                    if char == ",":
+                        self._pos += 1
+                        char = self._peek()
+                    elif char in "}]":
+                        pass
+                    else:
+                        raise JSONStreamError(f"缺少逗号 (位置 {self._pos})")
+                if char == "}" and container[0] == "{":
+                    self._pos += 1
+                    stack.pop()
+                    yield "end_map", None
+                    if not stack:
+                        return
+                    continue
+                if char == "]" and container[0] == "[":
+                    self._pos += 1
+                    stack.pop()
+                    yield "end_array", None
+                    if not stack:
+                        return
+                    continue
+                container[1] = True
+                if container[0] == "{":
+                    if char != '"':
+                        raise JSONStreamError(f"期望键名 (位置 {self._pos})")
+                    yield "map_key", self._read_string()
+                    self._expect(":")
+                    char = self._peek()
+
+            if char == "{":
+                self._pos += 1
+                stack.append(["{", False])
+                yield "start_map", None
+            elif char == "[":
+                self._pos += 1
+                stack.append(["[", False])
+                yield "start_array", None
+            elif char == '"':
+                yield "value", self._read_string()
+                if not stack:
+                    return
+            elif char == "":
+                raise JSONStreamError("文本意外结束")
+            else:
+                yield "value", self._read_scalar()
+                if not stack:
+                    return
+
+    # ---- 路径定位 ----
+
+    def skip_value(self, limit: Optional[int] = None) -> bool:
+        """跳过当前位置的一个完整值，不构建任何对象
+
+        Args:
+            limit: 缓冲区位置上限，容器跳过到该位置仍未结束时停在中途并返回False (只用于字符串输入)
+
+        Returns:
+            是否跳过了完整的值
+        """
+        char = self._peek()
+        if char == '"':
+            self._read_string()
+            return True
+        if not char or char not in "{[":
+            self._read_scalar()
+            return True
+        depth = 0
+        while True:
+            match = _SKIP_RE.match(self._buffer, self._pos)
+            if match is None:
+                # 缓冲区已耗尽或字符串被块边界截断
+                if not self._fill():
+                    raise JSONStreamError("文本意外结束")
+                continue
+            token = match.group()
+            self._pos = match.end()
+            if token in "{[":
+                depth += 1
+            elif token in "}]":
+                depth -= 1
+                if depth == 0:
+                    return True
+            if limit is not None and self._pos > limit:
+                return False
+
+    def read_value(self) -> Any:
+        """读取当前位置的一个完整值"""
+        char = self._peek()
+        if char == '"':
+            return self._read_string()
+        if not char or char not in "{[":
+            return self._read_scalar()
+        # 先跳过以确保整个值都在缓冲区中，再用C实现的解码器一次解析
+        self._mark = self._pos
+        try:
+            self.skip_value()
+            value, _ = _decoder.raw_decode(self._buffer, self._mark)
+            return value
+        finally:
+            self._mark = None
+
+    def _checkpoint(self) -> Optional[int]:
+        """记录当前位置，之后用 _restore 回到这里
+
+        字符串输入直接记录位置；可定位的二进制输入记录对应的字节偏移，回退时重新读取；
+        其他类文件对象在回退之前保留缓冲区中该位置之后的内容。
+        """
+        if self._read is None:
+            return self._pos
+        if self._binary and hasattr(self._source, "seek"):
+            unread = len(self._buffer[self._pos:].encode("utf-8", "surrogatepass"))
+            return self._source.tell() - unread - len(self._decoder.getstate()[0])
+        self._mark = self._pos
+        return None
+
+    def _restore(self, point: Optional[int]):
+        if point is None:
+            self._pos = self._mark
+            self._mark = None
+        elif self._read is None:
+            self._pos = point
+        else:
+            self._source.seek(point)
+            self._buffer = ""
+            self._pos = 0
+            self._decoder.reset()
+            self._eof = False
+
+    def seek_path(self, steps: Tuple[Step, ...]) -> bool:
+        """沿确定路径定位到目标值的起始位置
+
+        不匹配的子树直接跳过；路径不存在时返回False。
+        仅支持键名与非负下标步骤。与 json.loads 一致，重复的键名取最后一个：
+        找到键名后继续跳过对象的其余成员，到对象结束时回到最后一个匹配的值。
+        """
+        for kind, arg in steps:
+            char = self._peek()
+            if kind == KEY:
+                if char != "{":
+                    return False
+                self._pos += 1
+                found = False
+                point = None
+                first = True
+                while True:
+                    char = self._peek()
+                    if char == "}":
+                        break
+                    if not first:
+                        self._expect(",")
+                        char = self._peek()
+                    first = False
+                    if char != '"':
+                        raise JSONStreamError(f"期望键名 (位置 {self._pos})")
+                    key = self._read_string()
+                    self._expect(":")
+                    if key == arg:
+                        self._peek()
+                        found = True
+                        point = self._checkpoint()
+                    self.skip_value()
+                if not found:
+                    return False
+                self._restore(point)
+            elif kind == INDEX:
+                if char != "[" or arg < 0:
+                    return False
+                self._pos += 1
+                for index in range(arg + 1):
+                    char = self._peek()
+                    if char == "]":
+                        return False
+                    if index:
+                        self._expect(",")
+                    if index < arg:
+                        self.skip_value()
+            else:
+                return False
+        return True
+
+
+def is_streamable(steps: Tuple[Step, ...]) -> bool:
+    """路径是否可以用流式定位 (只含键名与非负下标)"""
+    return all(kind == KEY or (kind == INDEX and arg >= 0) for kind, arg in steps)
+
+
+def iter_events(source: Union[str, IO], chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, Any]]:
+    """从字符串或类文件对象生成解析事件"""
+    return JSONEventParser(source, chunk_size).events()
+
+
+def stream_locate(text: str, steps: Tuple[Step, ...]) -> Optional[int]:
+    """在字符串中流式定位确定路径，返回目标值的起始位置，路径不存在时返回None
+
+    Raises:
+        JSONStreamError: 在确认目标之前遇到无效JSON
+    """
+    parser = JSONEventParser(text)
+    if not parser.seek_path(steps):
+        return None
+    return parser._pos
+
+
+def read_value_at(text: str, pos: int) -> Any:
+    """读取字符串中从 pos 开始的一个完整值 (pos 通常来自 stream_locate)"""
+    parser = JSONEventParser(text)
+    parser._pos = pos
+    return parser.read_value()
+
+
+def stream_extract(source: Union[str, IO], steps: Tuple[Step, ...], chunk_size: int = 64 * 1024) -> Tuple[Any, bool]:
+    """流式提取确定路径的值，路径上的对象扫描到结束 (重复键名取最后一个)，目标值读取完成后立即停止
+
+    Returns:
+        提取的值, 是否找到
+
+    Raises:
+        JSONStreamError: 在到达目标之前遇到无效JSON
+    """
+    parser = JSONEventParser(source, chunk_size)
+    if not parser.seek_path(steps):
+        return None, False
+    return parser.read_value(), True
@@ -0,0 +1,362 @@
+import json
+import re
+from array import array
+from collections.abc import Mapping, Sequence
+from json.decoder import scanstring
+from typing import Any, Iterator, Optional, Tuple
+
+
+# 条目类型
+OBJECT = 1
+ARRAY = 2
+KEY = 3
+STRING = 4
+NUMBER = 5
+TRUE = 6
+FALSE = 7
+NULL = 8
+
+_WS = r'[ \t\n\r]*'
+# 每次匹配一个token及其前面的分隔符: 1=分隔符 2=字符串 3=左括号 4=右括号 5=数字或字面量
+_TOKEN_RE = re.compile(
+    _WS + r'([,:]?)' + _WS +
+    r'(?:("[^"\\]*(?:\\.[^"\\]*)*")'
+    r'|([{\[])'
+    r'|([}\]])'
+    r'|(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null|NaN|-?Infinity))',
+    re.DOTALL)
+_WS_RE = re.compile(_WS)
+_NUMBER_RE = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?')
+# 与 json.loads 相同接受的非有限数字，记录为 NUMBER 条目
+_CONSTANT_RE = re.compile(r'NaN|-?Infinity')
+_SCALAR_TAGS = {"t": TRUE, "f": FALSE, "n": NULL}
+_LITERALS = {TRUE: True, FALSE: False, NULL: None}
+
+_decoder = json.JSONDecoder()
+
+
+class TapeError(ValueError):
+    """无效JSON"""
+
+
+class Tape:
+    """simdjson风格的紧凑文档表示
+
+    扫描一次文本，把每个值、键和容器记录为一个条目，存放在三个平坦的数组中：
+      tags:    条目类型 (1字节)
+      offsets: 条目在原文中的起始位置
+      links:   容器条目的结束位置 (其最后一个后代之后的条目下标)，用于跳过整个子树
+    每个条目约9字节，不创建任何Python对象；键名与字符串只在访问时解码，
+    数字只在访问时转换。原文本必须在整个生命周期内保留 (条目只记录位置)。
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        # 文本超过4G字符时位置需要64位
+        code = "I" if len(text) < 2 ** 32 else "Q"
+        self.tags = array("B")
+        self.offsets = array(code)
+        self.links = array(code)
+        self._build()
+
+    @property
+    def nbytes(self) -> int:
+        """条目数组占用的字节数 (不含原文本)"""
+        return sum(len(a) * a.itemsize for a in (self.tags, self.offsets, self.links))
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def _build(self):
+        text = self.text
+        tags = self.tags
+        offsets = self.offsets
+        links = self.links
+        add_tag = tags.append
+        add_offset = offsets.append
+        add_link = links.append
+
+        # 栈中保存外层容器的 (条目下标, 是否对象, 是否第一个成员, 是否期待键名)
+        stack = []
+        index = -1
+        is_object = False
+        first = True
+        expect_key = False
+        done = False
+        pos = 0
+
+        for match in _TOKEN_RE.finditer(text):
+            if match.start() != pos or done:
+                break
+            pos = match.end()
+            separator = match.group(1)
+            group = match.lastindex
+
+            if group == 4:
+                closer = text[pos - 1]
+                if index < 0 or separator or (closer == "}") != is_object or (is_object and not expect_key):
+                    raise TapeError(f"无效JSON格式: 意外的 {closer!r} (位置 {pos - 1})")
+                links[index] = len(tags)
+                if not stack:
+                    done = True
+                    continue
+                index, is_object, first, expect_key = stack.pop()
+                continue
+
+            start = match.start(group)
+            if index >= 0:
+                expected = "" if first else ","
+                if is_object:
+                    if expect_key:
+                        if group != 2 or separator != expected:
+                            raise TapeError(f"无效JSON格式: 期望键名 (位置 {start})")
+                        add_tag(KEY)
+                        add_offset(start)
+                        add_link(0)
+                        expect_key = False
+                        first = False
+                        continue
+                    expected = ":"
+                    expect_key = True
+                if separator != expected:
+                    raise TapeError(f"无效JSON格式: 期望 {expected or '值'!r} (位置 {start})")
+                first = False
+            elif separator:
+                raise TapeError(f"无效JSON格式: 意外的 {separator!r} (位置 {start})")
+
+            if group == 3:
+                if index >= 0:
+                    stack.append((index, is_object, first, expect_key))
+                index = len(tags)
+                is_object = text[start] == "{"
+                first = True
+                expect_key = is_object
+                add_tag(OBJECT if is_object else ARRAY)
+                add_offset(start)
+                add_link(0)
+                continue
+
+            add_tag(STRING if group == 2 else _SCALAR_TAGS.get(text[start], NUMBER))
+            add_offset(start)
+            add_link(0)
+            if index < 0:
+                done = True
+
+        if not done and (index >= 0 or not tags):
+            raise TapeError(f"无效JSON格式: 文本意外结束或无法识别 (位置 {pos})")
+        if _WS_RE.match(text, pos).end() != len(text):
+            raise TapeError(f"无效JSON格式: 多余的内容 (位置 {pos})")
+
+    # ---- 条目访问 ----
+
+    def next_sibling(self, entry: int) -> int:
+        """跳过一个值 (容器连同其全部后代) 后的条目下标"""
+        if self.tags[entry] <= ARRAY:
+            return self.links[entry]
+        return entry + 1
+
+    def string(self, entry: int) -> str:
+        """解码键名或字符串条目"""
+        return scanstring(self.text, self.offsets[entry] + 1, True)[0]
+
+    def value(self, entry: int) -> Any:
+        """条目的值：标量直接解码，容器返回可导航的代理对象"""
+        tag = self.tags[entry]
+        if tag == OBJECT:
+            return TapeObject(self, entry)
+        if tag == ARRAY:
+            return TapeArray(self, entry)
+        if tag == STRING:
+            return self.string(entry)
+        if tag == NUMBER:
+            match = _NUMBER_RE.match(self.text, self.offsets[entry])
+            if match is None:
+                return float(_CONSTANT_RE.match(self.text, self.offsets[entry]).group())
+            if match.group(1) or match.group(2):
+                return float(match.group())
+            return int(match.group())
+        return _LITERALS[tag]
+
+    def materialize(self, entry: int) -> Any:
+        """把条目转换为普通的Python对象 (容器由C解码器一次解析对应的文本)"""
+        if self.tags[entry] <= ARRAY:
+            return _decoder.raw_decode(self.text, self.offsets[entry])[0]
+        return self.value(entry)
+
+    def key_equals(self, entry: int, key: str) -> bool:
+        """键名条目是否等于key，不含转义时直接比较原文，不解码"""
+        offset = self.offsets[entry]
+        text = self.text
+        if text.startswith(key, offset + 1) and text.startswith('"', offset + 1 + len(key)) and \
+                "\\" not in key and '"' not in key:
+            return True
+        # 原文中含有转义序列时解码后比较
+        end = self.offsets[entry + 1]
+        if "\\" not in text[offset:end]:
+            return False
+        return self.string(entry) == key
+
+    def root(self) -> Any:
+        """根值"""
+        return self.value(0)
+
+
+class TapeObject(Mapping):
+    """磁带中对象的只读代理，可以像字典一样按键访问与遍历
+
+    按键取值逐个比较键名 (不建立字典)；重复的键在遍历时按原文逐个出现，取值时取最后一个。
+    """
+
+    __slots__ = ("tape", "entry", "_length")
+
+    def __init__(self, tape: Tape, entry: int):
+        self.tape = tape
+        self.entry = entry
+        self._length: Optional[int] = None
+
+    def _members(self) -> Iterator[int]:
+        """依次生成各键名条目的下标"""
+        tape = self.tape
+        end = tape.links[self.entry]
+        entry = self.entry + 1
+        while entry < end:
+            yield entry
+            entry = tape.next_sibling(entry + 1)
+
+    def find(self, key: str) -> int:
+        """键对应的值条目下标，不存在时返回-1 (重复的键取最后一个，与json.loads一致)"""
+        found = -1
+        for entry in self._members():
+            if self.tape.key_equals(entry, key):
+                found = entry + 1
+        return found
+
+    def __getitem__(self, key: str) -> Any:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        entry = self.find(key)
+        if entry < 0:
+            raise KeyError(key)
+        return self.tape.value(entry)
+
+    def __contains__(self, key: Any) -> bool:
+        return isinstance(key, str) and self.find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for entry in self._members():
+            yield self.tape.string(entry)
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = sum(1 for _ in self._members())
+        return self._length
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        tape = self.tape
+        for entry in self._members():
+            yield tape.string(entry), tape.value(entry + 1)
+
+    def values(self) -> Iterator[Any]:
+        tape = self.tape
+        for entry in self._members():
+            yield tape.value(entry + 1)
+
+    def materialize(self) -> dict:
+        return self.tape.materialize(self.entry)
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+
+class TapeArray(Sequence):
+    """磁带中数组的只读代理，可以像列表一样按下标访问、切片与遍历"""
+
+    __slots__ = ("tape", "entry", "_length")
+
+    def __init__(self, tape: Tape, entry: int):
+        self.tape = tape
+        self.entry = entry
+        self._length: Optional[int] = None
+
+    def _elements(self) -> Iterator[int]:
+        """依次生成各元素条目的下标"""
+        tape = self.tape
+        end = tape.links[self.entry]
+        entry = self.entry + 1
+        while entry < end:
+            yield entry
+            entry = tape.next_sibling(entry)
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = sum(1 for _ in self._elements())
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # 只为选中的元素创建对象
+            wanted = range(*index.indices(len(self)))
+            if not wanted:
+                return []
+            if wanted.step < 0:
+                return [self[i] for i in wanted]
+            picked = set(wanted)
+            last = wanted[-1]
+            result = []
+            for position, entry in enumerate(self._elements()):
+                if position in picked:
+                    result.append(self.tape.value(entry))
+                if position >= last:
+                    break
+            return result
+        if not isinstance(index, int):
+            raise TypeError(f"数组下标必须是整数: {index!r}")
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for position, entry in enumerate(self._elements()):
+                if position == index:
+                    return self.tape.value(entry)
+        raise IndexError("数组下标超出范围")
+
+    def __iter__(self) -> Iterator[Any]:
+        tape = self.tape
+        for entry in self._elements():
+            yield tape.value(entry)
+
+    def materialize(self) -> list:
+        return self.tape.materialize(self.entry)
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+
+# 可以按字典/列表方式导航的类型
+OBJECT_TYPES = (dict, TapeObject)
+ARRAY_TYPES = (list, TapeArray)
+CONTAINER_TYPES = OBJECT_TYPES + ARRAY_TYPES
+
+
+def type_name(value: Any) -> str:
+    """Python类型名，磁带代理分别报告为 dict / list"""
+    if isinstance(value, TapeObject):
+        return "dict"
+    if isinstance(value, TapeArray):
+        return "list"
+    return type(value).__name__
+
+
+def to_python(value: Any) -> Any:
+    """把磁带代理转换为普通的字典/列表，其他值原样返回"""
+    if isinstance(value, (TapeObject, TapeArray)):
+        return value.materialize()
+    return value
+
+
+def build_tape(text: str) -> Tape:
+    """扫描JSON文本构建磁带
+
+    Raises:
+        TapeError: 无效JSON
+    """
+    return Tape(text)
@@ -1,16 +1,125 @@
 import re
 import json
 import ast
-import chardet
-from typing import Tuple, Dict, Any, List, Union
+import codecs
+from typing import Tuple, Dict, Any, List, Optional, Union
 
+from .json_backend import dumps, loads_native
 
-def detect_encoding(text_bytes: bytes) -> str:
-    """检测文本编码"""
-    result = chardet.detect(text_bytes)
+
+# 字节顺序标记 -> 编码 (UTF-32LE 的BOM以 UTF-16LE 的BOM开头，需要先检查)
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# 统计检测最多使用的字节数
+DETECT_SAMPLE_SIZE = 64 * 1024
+
+# chardet 报告的编码 -> 实际用于解码的超集编码 (GB2312 文本中常混有 GBK 才有的字)
+_SUPERSET_ENCODINGS = {"gb2312": "gb18030", "gbk": "gb18030", "ascii": "utf-8"}
+
+# 单字节编码：汉字很少的样本常被统计检测误判为这些编码
+_SINGLE_BYTE_PREFIXES = ("iso-8859", "iso8859", "windows-125", "cp12", "cp4", "cp7", "cp8", "latin",
+                         "mac", "koi8", "tis-620", "ascii")
+
+
+def detect_encoding(text_bytes: bytes, sample_size: int = DETECT_SAMPLE_SIZE) -> str:
+    """检测文本编码，只对前 sample_size 个字节做统计检测"""
+    for bom, encoding in _BOMS:
+        if text_bytes[:len(bom)] == bom:
+            return encoding
+    # chardet 导入较慢，只在实际需要检测编码时加载
+    import chardet
+    result = chardet.detect(bytes(text_bytes[:sample_size]))
     return result['encoding'] or 'utf-8'
 
 
+def _sniff_utf16(data) -> Optional[str]:
+    """没有BOM的UTF-16：JSON以ASCII字符开头，前两个字符中每隔一个字节为0"""
+    head = bytes(data[:4])
+    if len(head) < 4:
+        return None
+    if head[0] == 0 and head[2] == 0 and head[1] and head[3]:
+        return "utf-16-be"
+    if head[1] == 0 and head[3] == 0 and head[0] and head[2]:
+        return "utf-16-le"
+    return None
+
+
+def sniff_wide_encoding(data) -> Optional[str]:
+    """UTF-16/32 编码 (按BOM或字节模式识别)，这类字节不能按ASCII兼容的方式查找括号"""
+    for bom, encoding in _BOMS:
+        if data[:len(bom)] == bom:
+            return None if encoding == "utf-8" else encoding
+    return _sniff_utf16(data)
+
+
+def _is_cjk(char: str) -> bool:
+    return "\u4e00" <= char <= "\u9fff" or "\u3000" <= char <= "\u303f" or "\uff00" <= char <= "\uffef"
+
+
+def _looks_like_gb18030(sample: bytes) -> bool:
+    """样本能按 GB18030 解码，且非ASCII字符几乎都是汉字或中文标点
+
+    JSON中的汉字往往只有几个，统计检测在这种样本上经常误判为单字节编码。
+    """
+    try:
+        # 样本末尾可能截断一个多字节字符
+        text = codecs.getincrementaldecoder("gb18030")().decode(sample, False)
+    except UnicodeDecodeError:
+        return False
+    non_ascii = [char for char in text if char > "\x7f"]
+    return bool(non_ascii) and sum(map(_is_cjk, non_ascii)) >= 0.9 * len(non_ascii)
+
+
+def decode_bytes(data, sample_size: int = DETECT_SAMPLE_SIZE) -> Tuple[str, str]:
+    """把字节 (bytes / memoryview / mmap) 解码为文本
+
+    依次：BOM -> 无BOM的UTF-16 -> 严格UTF-8 (合法的UTF-8输入到此为止，不调用chardet)
+    -> 从第一个非UTF-8字节开始取 sample_size 个字节做统计检测。检测结果是单字节编码、
+    而样本像GBK中文时按 gb18030 解码；都无法完整解码时按UTF-8解码并替换无效字节。
+
+    Returns:
+        文本, 使用的编码
+    """
+    for bom, encoding in _BOMS:
+        if data[:len(bom)] == bom:
+            with memoryview(data) as view, view[len(bom):] as body:
+                return codecs.decode(body, encoding, "replace"), encoding
+
+    encoding = _sniff_utf16(data)
+    if encoding is not None:
+        try:
+            return codecs.decode(data, encoding), encoding
+        except UnicodeDecodeError:
+            pass
+
+    try:
+        return str(data, "utf-8"), "utf-8"
+    except UnicodeDecodeError as e:
+        # 前面合法的部分 (通常是ASCII的JSON语法) 对检测没有帮助
+        sample = bytes(data[e.start:e.start + sample_size])
+
+    detected = detect_encoding(sample, sample_size).lower()
+    candidates = []
+    if detected.startswith(_SINGLE_BYTE_PREFIXES) and _looks_like_gb18030(sample):
+        candidates.append("gb18030")
+    candidates.append(_SUPERSET_ENCODINGS.get(detected, detected))
+    if "gb18030" not in candidates:
+        candidates.append("gb18030")
+    for encoding in candidates:
+        try:
+            return codecs.decode(data, encoding), encoding
+        except (UnicodeDecodeError, LookupError):
+            continue
+    # 都不能完整解码时按UTF-8解码，无效字节以替换字符代替
+    return codecs.decode(data, "utf-8", "replace"), "utf-8"
+
+
 def fix_quotes(text: str) -> str:
     """修复单引号为双引号"""
     # 修复键名中的单引号
@@ -89,6 +198,34 @@ def try_fix_json_structure(text: str) -> str:
     return text
 
 
+def apply_normalize_rules(text: str, repair_level: int = 2) -> str:
+    """按修复级别依次应用正则修复规则 (不做校验)
+    
+    Args:
+        text: 输入文本
+        repair_level: 修复级别 (1=基础, 2=标准, 3=高级)
+        
+    Returns:
+        修复后的文本
+    """
+    # 基础级别修复
+    if repair_level >= 1:
+        text = remove_comments(text)
+        text = remove_trailing_commas(text)
+    
+    # 标准级别修复
+    if repair_level >= 2:
+        text = fix_quotes(text)
+        text = fix_unquoted_keys(text)
+        text = format_numeric_values(text)
+    
+    # 高级级别修复
+    if repair_level >= 3:
+        text = try_fix_json_structure(text)
+    
+    return text
+
+
 def normalize_json(text: str, repair_level: int = 2) -> Tuple[str, bool]:
     """规范化JSON
     
@@ -103,20 +240,7 @@ def normalize_json(text: str, repair_level: int = 2) -> Tuple[str, bool]:
     success = False
     
     try:
-        # 基础级别修复
-        if repair_level >= 1:
-            text = remove_comments(text)
-            text = remove_trailing_commas(text)
-        
-        # 标准级别修复
-        if repair_level >= 2:
-            text = fix_quotes(text)
-            text = fix_unquoted_keys(text)
-            text = format_numeric_values(text)
-        
-        # 高级级别修复
-        if repair_level >= 3:
-            text = try_fix_json_structure(text)
+        text = apply_normalize_rules(text, repair_level)
         
         # 验证JSON
         json.loads(text)
@@ -131,7 +255,7 @@ def normalize_json(text: str, repair_level: int = 2) -> Tuple[str, bool]:
 def apply_format_style(json_str: str, indent: int = 2, sort_keys: bool = False) -> str:
     """应用格式化样式"""
     try:
-        parsed = json.loads(json_str)
-        return json.dumps(parsed, indent=indent, ensure_ascii=False, sort_keys=sort_keys)
+        parsed, native = loads_native(json_str)
+        return dumps(parsed, indent, sort_keys, native=native)
     except:
         return json_str
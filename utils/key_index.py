@@ -0,0 +1,117 @@
+import heapq
+import sys
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Set, Tuple
+
+from .cache_utils import DOCUMENT_CACHE, DerivedCache
+from .json_tape import CONTAINER_TYPES, OBJECT_TYPES
+
+
+# 每个文档的键索引缓存，依附于共享的解析缓存，文档被淘汰时一并删除
+_INDEX_CACHE = DerivedCache(DOCUMENT_CACHE, max_entries=32, max_bytes=128 * 1024 * 1024)
+
+
+class KeyIndex:
+    """文档的键索引
+
+    遍历文档一次，记录去重后的小写键名及其出现的路径，
+    并建立字符倒排索引用于快速筛选模糊匹配的候选键。
+    """
+
+    def __init__(self, data: Any):
+        # 小写键名 -> [(出现顺序, 路径, 值), ...]
+        self.keys: Dict[str, List[Tuple[int, str, Any]]] = {}
+        # 字符 -> {包含该字符的小写键名: 出现次数}
+        self.chars: Dict[str, Dict[str, int]] = {}
+        self.occurrences = 0
+        self._build(data)
+        for key in self.keys:
+            for char, count in Counter(key).items():
+                self.chars.setdefault(char, {})[key] = count
+
+    def _build(self, data: Any):
+        """深度优先遍历文档，路径格式与出现顺序与原递归实现一致"""
+        keys = self.keys
+        order = 0
+
+        def visit(node: Any, prefix: str):
+            nonlocal order
+            if isinstance(node, OBJECT_TYPES):
+                for key, value in node.items():
+                    path = f"{prefix}.{key}" if prefix else key
+                    keys.setdefault(key.lower(), []).append((order, path, value))
+                    order += 1
+                    if isinstance(value, CONTAINER_TYPES):
+                        visit(value, path)
+            else:
+                for i, item in enumerate(node):
+                    if isinstance(item, CONTAINER_TYPES):
+                        visit(item, f"{prefix}[{i}]" if prefix else f"[{i}]")
+
+        if isinstance(data, CONTAINER_TYPES):
+            visit(data, "")
+        self.occurrences = order
+
+    def candidates(self, target: str, min_similarity: float) -> Set[str]:
+        """筛选可能达到相似度阈值的键
+
+        ratio = 2*M/(la+lb)，匹配字符数M不超过两者字符多重集的交集大小 (即 quick_ratio 的上界)。
+        通过字符倒排索引一次累计每个键与目标的交集大小，只保留上界达到阈值的键，不会漏掉真正的匹配。
+        """
+        if min_similarity <= 0 or not target:
+            # 与目标没有公共字符的键相似度为0 (两者都为空时为1)，不在倒排索引的结果中
+            return {key for key in self.keys if min_similarity <= 0 or not key}
+
+        target_len = len(target)
+        common: Dict[str, int] = {}
+        for char, count in Counter(target).items():
+            for key, key_count in self.chars.get(char, {}).items():
+                common[key] = common.get(key, 0) + min(count, key_count)
+        # 与 SequenceMatcher.ratio 相同的计算方式，避免浮点误差导致边界上的键被错误排除
+        return {key for key, matches in common.items()
+                if 2.0 * matches / (len(key) + target_len) >= min_similarity}
+
+    def search(self, target_key: str, min_similarity: float = 0.5, top_k: int = 10) -> List[Tuple[str, Any, float]]:
+        """模糊搜索键名
+
+        Args:
+            target_key: 目标键名
+            min_similarity: 最小相似度阈值
+            top_k: 最多返回的匹配数
+
+        Returns:
+            [(路径, 值, 相似度), ...] 按相似度降序
+        """
+        target = target_key.lower()
+        # 序列顺序与原实现 SequenceMatcher(None, target, key) 保持一致
+        matcher = SequenceMatcher(None)
+        matcher.set_seq1(target)
+
+        heap: List[Tuple[float, int, str, Any]] = []
+        for key in self.candidates(target, min_similarity):
+            matcher.set_seq2(key)
+            similarity = matcher.ratio()
+            if similarity < min_similarity:
+                continue
+            for order, path, value in self.keys[key]:
+                entry = (similarity, -order, path, value)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+
+        heap.sort(key=lambda entry: entry[:2], reverse=True)
+        return [(path, value, similarity) for similarity, _, path, value in heap]
+
+
+def get_key_index(data: Any) -> KeyIndex:
+    """获取文档的键索引，共享解析缓存中的文档只构建一次"""
+    index = _INDEX_CACHE.get(data)
+    if index is not None:
+        return index
+
+    index = KeyIndex(data)
+    size = sys.getsizeof(index.keys) + sys.getsizeof(index.chars) + index.occurrences * 64
+    _INDEX_CACHE.put(data, index, size)
+    return index
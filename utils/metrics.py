@@ -0,0 +1,225 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# 延迟直方图的桶上限 (秒)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# 设置该环境变量后，节点执行结束时把指标写入这个Prometheus文本文件 (供监控sidecar读取)
+METRICS_FILE_ENV = "PIP_JSON_METRICS_FILE"
+# 两次写文件的最小间隔 (秒)
+EXPORT_INTERVAL = 5.0
+
+# 指标名称
+STAGE_SECONDS = "pip_json_stage_seconds"
+TIER_ATTEMPTS = "pip_json_repair_tier_attempts_total"
+TIER_SECONDS = "pip_json_repair_tier_seconds"
+REQUESTS = "pip_json_requests_total"
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> _Labels:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _escape(value: str) -> str:
+    """转义标签值中的反斜杠、换行与双引号"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: _Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels)
+    if extra is not None:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in items) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class MetricsRegistry:
+    """进程内的指标注册表：计数器与延迟直方图，可导出为Prometheus文本格式
+
+    写入只在锁内更新字典中的几个数字，每次记录的开销在微秒级。
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 名称 -> (类型, 说明)
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        # 名称 -> {标签: 值}
+        self._counters: Dict[str, Dict[_Labels, float]] = {}
+        # 名称 -> {标签: [各桶计数 (非累计, 最后一个为+Inf), 总和, 次数]}
+        self._histograms: Dict[str, Dict[_Labels, list]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str):
+        """登记指标的类型与说明"""
+        self._meta[name] = (kind, help_text)
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1):
+        """计数器加 value"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None):
+        """直方图记录一次耗时 (秒)"""
+        self.observe_key(name, seconds, _label_key(labels))
+
+    def observe_key(self, name: str, seconds: float, key: _Labels):
+        """直方图记录一次耗时，标签已转换为排好序的元组 (调用方可以复用，省去每次排序)"""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += seconds
+            entry[2] += 1
+
+    def render(self) -> str:
+        """导出为Prometheus文本格式"""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(set(self._counters) | set(self._histograms)):
+                kind, help_text = self._meta.get(name, (HISTOGRAM if name in self._histograms else COUNTER, ""))
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+                for labels, (counts, total, count) in sorted(self._histograms.get(name, {}).items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', repr(bound)))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {repr(total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """原子地写入Prometheus文本文件 (先写临时文件再替换，读取方不会看到写了一半的内容)"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def reset(self):
+        """清空所有指标数据 (保留登记的说明)"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# 进程内共享的指标注册表
+REGISTRY = MetricsRegistry()
+REGISTRY.describe(STAGE_SECONDS, HISTOGRAM, "Time spent in each processing stage.")
+REGISTRY.describe(TIER_ATTEMPTS, COUNTER, "Repair tier attempts by outcome.")
+REGISTRY.describe(TIER_SECONDS, HISTOGRAM, "Time spent in each repair tier attempt.")
+REGISTRY.describe(REQUESTS, COUNTER, "Processed requests by component and outcome.")
+
+_last_export = 0.0
+_export_lock = threading.Lock()
+
+
+def maybe_export(force: bool = False) -> bool:
+    """设置了 PIP_JSON_METRICS_FILE 时把指标写入该文件，两次写入至少间隔 EXPORT_INTERVAL 秒
+
+    Returns:
+        是否写入了文件
+    """
+    global _last_export
+    path = os.environ.get(METRICS_FILE_ENV)
+    if not path:
+        return False
+    now = time.monotonic()
+    with _export_lock:
+        if not force and now - _last_export < EXPORT_INTERVAL:
+            return False
+        _last_export = now
+    try:
+        REGISTRY.write_textfile(path)
+    except OSError:
+        return False
+    return True
+
+
+# (组件, 阶段) -> 标签元组
+_STAGE_LABELS: Dict[Tuple[str, str], _Labels] = {}
+
+
+class _Stage:
+    """StageTimer.stage 返回的上下文管理器"""
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: "StageTimer", name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    """记录一次处理中各阶段的耗时，同时写入指标注册表的阶段直方图
+
+    同名阶段多次执行时耗时累加 (如多文档模式中每个文档的修复)。
+    """
+
+    def __init__(self, component: str, registry: MetricsRegistry = REGISTRY):
+        self.component = component
+        self.registry = registry
+        self.seconds: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    def stage(self, name: str) -> "_Stage":
+        """计时一个阶段，用法: with timer.stage("parse"): ..."""
+        return _Stage(self, name)
+
+    def add(self, name: str, seconds: float):
+        """记录一个阶段的耗时 (秒)"""
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        key = _STAGE_LABELS.get((self.component, name))
+        if key is None:
+            key = _STAGE_LABELS[(self.component, name)] = _label_key({"component": self.component, "stage": name})
+        self.registry.observe_key(STAGE_SECONDS, seconds, key)
+
+    def finish(self, outcome: str) -> Dict[str, float]:
+        """结束计时：记录总耗时与请求结果
+
+        Returns:
+            {阶段: 毫秒}，最后一项为总耗时 "total"
+        """
+        self.add("total", time.perf_counter() - self._start)
+        self.registry.inc(REQUESTS, {"component": self.component, "outcome": outcome})
+        return self.timings()
+
+    def timings(self) -> Dict[str, float]:
+        """各阶段耗时 (毫秒)"""
+        return {name: round(seconds * 1000, 3) for name, seconds in self.seconds.items()}
+
+
+def format_timings(timings: Dict[str, float], names: Dict[str, str]) -> str:
+    """把阶段耗时格式化为一行，如 "定位 0.12ms / 修复 3.40ms / 总计 3.60ms\""""
+    return " / ".join(f"{names.get(name, name)} {ms:.2f}ms" for name, ms in timings.items())
@@ -0,0 +1,53 @@
+import os
+
+
+# 插件包名 (如 "PIP-JSON-PRO") 与目录，子进程需要以同一名称加载本包才能反序列化任务
+PACKAGE_NAME = __name__.rsplit(".", 2)[0]
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def package_bootstrap(statement: str) -> str:
+    """生成子进程引导代码：以相同包名加载插件后执行给定语句
+
+    引导代码交给内置的exec执行，spawn方式启动的子进程不需要能按名称导入本包。
+    语句中可以使用 importlib。
+    """
+    return f'''
+import importlib, importlib.util, os, sys
+if {PACKAGE_NAME!r} not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        {PACKAGE_NAME!r}, os.path.join({PACKAGE_ROOT!r}, "__init__.py"),
+        submodule_search_locations=[{PACKAGE_ROOT!r}])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[{PACKAGE_NAME!r}] = module
+    spec.loader.exec_module(module)
+{statement}
+'''
+
+
+# 子进程启动方式，可用环境变量覆盖 (fork / forkserver / spawn)
+START_METHOD_ENV = "PIP_JSON_START_METHOD"
+
+
+def start_method() -> str:
+    """子进程启动方式
+
+    ComfyUI 是多线程的服务进程，fork 出的子进程可能继承其他线程持有的锁而死锁，
+    默认使用 forkserver (不支持的平台使用 spawn)。环境变量指定的方式不可用时使用默认值。
+    """
+    # multiprocessing 只在第一次启动子进程时导入
+    import multiprocessing
+    available = multiprocessing.get_all_start_methods()
+    method = os.environ.get(START_METHOD_ENV, "").strip().lower()
+    if method in available:
+        return method
+    return "forkserver" if "forkserver" in available else "spawn"
+
+
+def mp_context():
+    """按 start_method() 的启动方式创建 multiprocessing 上下文
+
+    子进程通过 package_bootstrap 的引导代码加载本包，不依赖从父进程继承的模块。
+    """
+    import multiprocessing
+    return multiprocessing.get_context(start_method())
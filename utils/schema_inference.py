@@ -0,0 +1,174 @@
+import sys
+from typing import Any, Dict, List, Optional
+
+from .cache_utils import DOCUMENT_CACHE, DerivedCache
+from .json_tape import TapeArray, TapeObject
+
+
+# 每个文档的推断结果缓存，按抽样率区分，依附于共享的解析缓存，文档被淘汰时一并删除
+_SCHEMA_CACHE = DerivedCache(DOCUMENT_CACHE, max_entries=32, max_bytes=64 * 1024 * 1024)
+
+# 元素个数不超过该值的数组总是全部检查，抽样率只作用于更大的数组
+SAMPLE_MIN_LENGTH = 100
+
+JSON_SCHEMA_DRAFT = "https://json-schema.org/draft/2020-12/schema"
+
+# Python类型 -> JSON Schema类型名
+_JSON_TYPES = {
+    dict: "object",
+    list: "array",
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    type(None): "null",
+    TapeObject: "object",
+    TapeArray: "array",
+}
+
+
+class SchemaNode:
+    """推断出的某个路径的结构
+
+    数组的所有元素合并为一个元素结构 (items)，对象的各个键合并为属性并集。
+    """
+
+    __slots__ = ("types", "count", "properties", "items", "min_length", "max_length",
+                 "min_items", "max_items", "total_items", "sampled_items")
+
+    def __init__(self):
+        # JSON类型名 -> 出现次数
+        self.types: Dict[str, int] = {}
+        # 在该路径上观察到的值的个数
+        self.count = 0
+        self.properties: Dict[str, "SchemaNode"] = {}
+        self.items: Optional["SchemaNode"] = None
+        # 字符串长度范围
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        # 数组长度范围与元素个数 (sampled_items 小于 total_items 时为抽样)
+        self.min_items: Optional[int] = None
+        self.max_items: Optional[int] = None
+        self.total_items = 0
+        self.sampled_items = 0
+
+    @property
+    def object_count(self) -> int:
+        return self.types.get("object", 0)
+
+    def is_required(self, key: str) -> bool:
+        """该路径上的每个对象都包含这个键"""
+        return self.properties[key].count == self.object_count
+
+    def type_frequencies(self) -> List[tuple]:
+        """[(类型名, 出现比例), ...] 按出现次数降序"""
+        return [(name, count / self.count)
+                for name, count in sorted(self.types.items(), key=lambda item: -item[1])]
+
+
+class SchemaInference:
+    """一次遍历推断JSON文档的结构
+
+    Args:
+        sample_rate: 数组元素的抽样率 (0-1]，小于1时超过 SAMPLE_MIN_LENGTH 的数组
+                     按固定步长检查元素 (总是包含第一个元素)，1表示检查全部元素
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        if not 0 < sample_rate <= 1:
+            raise ValueError(f"抽样率必须在 (0, 1] 之间: {sample_rate}")
+        self.sample_rate = sample_rate
+        self._step = max(1, round(1 / sample_rate))
+
+    def infer(self, data: Any) -> SchemaNode:
+        """推断文档结构，返回根节点"""
+        root = SchemaNode()
+        step = self._step
+        # 显式栈，深层嵌套的文档不会递归溢出
+        stack = [(root, data)]
+        while stack:
+            node, value = stack.pop()
+            kind = _JSON_TYPES.get(type(value)) or type(value).__name__
+            node.types[kind] = node.types.get(kind, 0) + 1
+            node.count += 1
+            if kind == "object":
+                properties = node.properties
+                for key, item in value.items():
+                    child = properties.get(key)
+                    if child is None:
+                        child = properties[key] = SchemaNode()
+                    stack.append((child, item))
+            elif kind == "array":
+                length = len(value)
+                if node.min_items is None or length < node.min_items:
+                    node.min_items = length
+                if node.max_items is None or length > node.max_items:
+                    node.max_items = length
+                node.total_items += length
+                if not length:
+                    continue
+                if node.items is None:
+                    node.items = SchemaNode()
+                picks = value[::step] if step > 1 and length > SAMPLE_MIN_LENGTH else value
+                node.sampled_items += len(picks)
+                items = node.items
+                stack.extend((items, item) for item in picks)
+            elif kind == "string":
+                length = len(value)
+                if node.min_length is None or length < node.min_length:
+                    node.min_length = length
+                if node.max_length is None or length > node.max_length:
+                    node.max_length = length
+        return root
+
+
+def infer_schema(data: Any, sample_rate: float = 1.0) -> SchemaNode:
+    """推断文档结构，共享解析缓存中的文档对每个抽样率只推断一次"""
+    schema = _SCHEMA_CACHE.get(data, sample_rate)
+    if schema is not None:
+        return schema
+
+    schema = SchemaInference(sample_rate).infer(data)
+    _SCHEMA_CACHE.put(data, schema, sys.getsizeof(schema) + _count_nodes(schema) * 300, sample_rate)
+    return schema
+
+
+def _count_nodes(node: SchemaNode) -> int:
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.properties.values())
+        if node.items is not None:
+            stack.append(node.items)
+    return count
+
+
+def to_json_schema(node: SchemaNode, root: bool = True) -> Dict[str, Any]:
+    """转换为JSON Schema (draft 2020-12) 文档
+
+    出现多种类型时 type 为列表；同时出现整数与小数时只保留 number。
+    """
+    types = [name for name, _ in node.type_frequencies()]
+    if "integer" in types and "number" in types:
+        types.remove("integer")
+
+    schema: Dict[str, Any] = {"$schema": JSON_SCHEMA_DRAFT} if root else {}
+    if types:
+        schema["type"] = types[0] if len(types) == 1 else types
+
+    if node.properties:
+        schema["properties"] = {key: to_json_schema(child, False) for key, child in node.properties.items()}
+        required = [key for key in node.properties if node.is_required(key)]
+        if required:
+            schema["required"] = required
+    if node.min_items is not None:
+        if node.items is not None:
+            schema["items"] = to_json_schema(node.items, False)
+        schema["minItems"] = node.min_items
+        schema["maxItems"] = node.max_items
+    if node.min_length is not None:
+        schema["minLength"] = node.min_length
+        schema["maxLength"] = node.max_length
+    return schema
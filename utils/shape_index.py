@@ -0,0 +1,180 @@
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .cache_utils import DOCUMENT_CACHE, DerivedCache
+from .json_tape import ARRAY_TYPES, CONTAINER_TYPES, OBJECT_TYPES, type_name
+
+
+# 每个文档的结构索引缓存，依附于共享的解析缓存，文档被淘汰时一并删除
+_INDEX_CACHE = DerivedCache(DOCUMENT_CACHE, max_entries=32, max_bytes=64 * 1024 * 1024)
+
+# 同一路径上的数组元素最多抽样的个数 (所有数组实例合计)
+DEFAULT_SAMPLE_SIZE = 8
+
+# 值预览的最大长度
+PREVIEW_LENGTH = 30
+
+
+def preview_value(value: Any) -> str:
+    """值的简短预览，只截取长字符串的开头，不对整个值调用 str()"""
+    if isinstance(value, str):
+        text = value[:PREVIEW_LENGTH + 1]
+    elif isinstance(value, CONTAINER_TYPES):
+        return type_name(value)
+    else:
+        text = str(value)
+    if len(text) > PREVIEW_LENGTH:
+        return text[:PREVIEW_LENGTH - 3] + "..."
+    return text
+
+
+class ShapeNode:
+    """结构索引中的一个路径
+
+    对象的每个键是一个子节点；数组的所有元素合并为一个元素节点 (路径写作 [*])。
+    """
+
+    __slots__ = ("key", "types", "count", "preview", "children", "element",
+                 "min_length", "max_length", "total_length", "sampled")
+
+    def __init__(self, key: Optional[str] = None):
+        # 对象中的键名，数组元素节点与根节点为None
+        self.key = key
+        # 类型名 -> 出现次数
+        self.types: Dict[str, int] = {}
+        # 在该路径上观察到的值的个数
+        self.count = 0
+        # 第一个标量值的预览
+        self.preview: Optional[str] = None
+        self.children: Dict[str, "ShapeNode"] = {}
+        self.element: Optional["ShapeNode"] = None
+        # 数组长度统计 (该路径上出现过数组时有效)
+        self.min_length = 0
+        self.max_length = 0
+        self.total_length = 0
+        # 实际检查过的数组元素个数 (小于 total_length 时为抽样)
+        self.sampled = 0
+
+    @property
+    def type_name(self) -> str:
+        """类型名，多种类型按出现次数排列，如 "str|NoneType\""""
+        if len(self.types) == 1:
+            return next(iter(self.types))
+        return "|".join(sorted(self.types, key=lambda name: -self.types[name]))
+
+    @property
+    def is_container(self) -> bool:
+        return "dict" in self.types or "list" in self.types
+
+    @property
+    def is_leaf(self) -> bool:
+        """该路径上出现过标量值"""
+        return any(name not in ("dict", "list") for name in self.types)
+
+
+class ShapeIndex:
+    """文档的结构索引
+
+    一次遍历记录每个路径的类型、出现次数、数组长度和值预览。数组元素合并为一个路径，
+    同一路径上最多抽样 sample_size 个元素 (至少检查每个数组实例的第一个元素)，
+    因此构建开销随不同路径的数量增长，而不是随文档大小增长。
+    """
+
+    def __init__(self, data: Any, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.root = ShapeNode()
+        self.node_count = 0
+        self._observe(self.root, data)
+
+    def _observe(self, node: ShapeNode, value: Any):
+        """记录一个值 (显式栈，深层嵌套的文档不会递归溢出)"""
+        stack = [(node, value)]
+        sample_size = self.sample_size
+        while stack:
+            node, value = stack.pop()
+            name = type_name(value)
+            node.types[name] = node.types.get(name, 0) + 1
+            node.count += 1
+            if isinstance(value, OBJECT_TYPES):
+                pending = []
+                for key, item in value.items():
+                    child = node.children.get(key)
+                    if child is None:
+                        child = node.children[key] = ShapeNode(key)
+                        self.node_count += 1
+                    pending.append((child, item))
+                stack.extend(reversed(pending))
+            elif isinstance(value, ARRAY_TYPES):
+                length = len(value)
+                if node.types["list"] == 1:
+                    node.min_length = node.max_length = length
+                else:
+                    node.min_length = min(node.min_length, length)
+                    node.max_length = max(node.max_length, length)
+                node.total_length += length
+                if not length:
+                    continue
+                if node.element is None:
+                    node.element = ShapeNode()
+                    self.node_count += 1
+                take = max(1, min(length, sample_size - node.sampled))
+                node.sampled += take
+                # 抽样元素在数组中均匀分布 (包含首尾)
+                if take >= length:
+                    picks = value
+                elif take == 1:
+                    picks = value[:1]
+                else:
+                    step = (length - 1) / (take - 1)
+                    picks = [value[round(i * step)] for i in range(take)]
+                stack.extend((node.element, item) for item in reversed(picks))
+            elif node.preview is None:
+                node.preview = preview_value(value)
+
+    def walk(self,
+             max_depth: Optional[int] = None,
+             keep: Optional[Callable[[str], bool]] = None) -> Iterator[Tuple[ShapeNode, Tuple, int]]:
+        """按文档顺序遍历所有路径
+
+        Args:
+            max_depth: 只遍历深度小于该值的路径
+            keep: 键名过滤函数，返回False的键连同其下的路径一起跳过
+
+        Yields:
+            节点, 路径段元组 (键名字符串或 None 表示数组元素), 深度 (外层容器的个数)
+        """
+        stack: List[Tuple[ShapeNode, Tuple, int]] = [(self.root, (), 0)]
+        while stack:
+            node, parts, depth = stack.pop()
+            if parts:
+                yield node, parts, depth - 1
+            if max_depth is not None and depth >= max_depth:
+                continue
+            pending = [(child, parts + (key,), depth + 1) for key, child in node.children.items()
+                       if keep is None or keep(key)]
+            if node.element is not None:
+                pending.append((node.element, parts + (None,), depth + 1))
+            stack.extend(reversed(pending))
+
+
+def format_path(parts: Tuple, element: str = "[*]") -> str:
+    """把路径段元组写成路径表达式，数组元素写作 element ([*] 或 [0])"""
+    path = ""
+    for part in parts:
+        if part is None:
+            path += element
+        else:
+            path = f"{path}.{part}" if path else part
+    return path
+
+
+def get_shape_index(data: Any) -> ShapeIndex:
+    """获取文档的结构索引，共享解析缓存中的文档只构建一次"""
+    index = _INDEX_CACHE.get(data)
+    if index is not None:
+        return index
+
+    index = ShapeIndex(data)
+    size = sys.getsizeof(index) + index.node_count * 400
+    _INDEX_CACHE.put(data, index, size)
+    return index